@@ -9,10 +9,12 @@ from flask import Flask
 
 from app.extensions import init_extensions
 from app.config import config
+from app.utils.json_provider import FastJSONProvider
 
 
 def create_app(config_name=None):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     if config_name is None:
         config_name = os.getenv('FLASK_ENV', 'development')
@@ -46,5 +48,9 @@ def create_app(config_name=None):
         # Register API blueprints
         from app.api import init_app
         init_app(app)
+    
+    # Register CLI commands
+    from app.cli import register_commands
+    register_commands(app)
 
     return app
\ No newline at end of file
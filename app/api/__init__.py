@@ -5,9 +5,19 @@ api = Blueprint('api', __name__, url_prefix='/api')
 def init_app(app):
     from app.api.auth import bp as auth_bp
     from app.api.users import bp as users_bp
+    from app.api.analytics import bp as analytics_bp
+    from app.api.recommendations import bp as recommendations_bp
+    from app.api.social_accounts import bp as social_accounts_bp
+    from app.api.exports import bp as exports_bp
+    from app.api.organizations import bp as organizations_bp
     
     api.register_blueprint(auth_bp, url_prefix='/auth')
     api.register_blueprint(users_bp, url_prefix='/users')
+    api.register_blueprint(analytics_bp, url_prefix='/analytics')
+    api.register_blueprint(recommendations_bp, url_prefix='/recommendations')
+    api.register_blueprint(social_accounts_bp, url_prefix='/social-accounts')
+    api.register_blueprint(exports_bp, url_prefix='/exports')
+    api.register_blueprint(organizations_bp, url_prefix='/organizations')
     
     app.register_blueprint(api)
     
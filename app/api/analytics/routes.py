@@ -2,26 +2,46 @@ import logging
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import User
+from app.services.data_versions import analytics_version
+from app.utils.async_clients import async_session
+from app.utils.compression import cached_response
+from app.utils.conditional import conditional
+from app.utils.db_routing import route_reads_to_replica
+from app.utils.fieldsets import parse_fieldset, select_fields
+
+OVERVIEW_FIELDS = ('period', 'summary', 'charts', 'platforms')
+SCORE_INCLUDES = ('history',)
 
 bp = Blueprint('analytics', __name__)
 logger = logging.getLogger(__name__)
+route_reads_to_replica(bp)
+
+
+async def _get_user(user_id):
+    async with async_session() as session:
+        return await session.get(User, user_id)
 
 
 @bp.route('/', methods=['GET'])
 @jwt_required()
-def get():
+@conditional(analytics_version)
+@cached_response()
+async def get():
     user_id = int(get_jwt_identity())
+    try:
+        fields = parse_fieldset('fields', OVERVIEW_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    user = User.query.get(user_id)
+    user = await _get_user(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     
-    data = request.json
  
     return jsonify({
         "success": True,
         "message": "Profile completed successfully",
-        "data": {
+        "data": select_fields({
             "period": "string (week/month/quarter/semester/year)",
             "summary": {
                 "followers": "number",
@@ -74,50 +94,59 @@ def get():
                 }
                 }
             ]
-        }
+        }, fields)
     }), 200
 
 
 @bp.route('/score', methods=['GET'])
 @jwt_required()
-def get_score():
+@conditional(analytics_version)
+@cached_response()
+async def get_score():
     user_id = int(get_jwt_identity())
+    try:
+        include = parse_fieldset('include', SCORE_INCLUDES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    user = User.query.get(user_id)
+    user = await _get_user(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     
-    data = request.json
- 
-    return jsonify({
-        "success": True,
-        "message": "Profile completed successfully",
-        "data": {
-            "overall": "number (0-100)",
-            "submetrics": {
-                "engagement": "number (0-100)",
-                "reach": "number (0-100)",
-                "growth": "number (0-100)"
-        },
-        "history": [
+    data = {
+        "overall": "number (0-100)",
+        "submetrics": {
+            "engagement": "number (0-100)",
+            "reach": "number (0-100)",
+            "growth": "number (0-100)"
+        }
+    }
+    if 'history' in include:
+        data["history"] = [
             {
             "date": "string (YYYY-MM-DD)",
             "score": "number"
             }
-        ]}
+        ]
+ 
+    return jsonify({
+        "success": True,
+        "message": "Profile completed successfully",
+        "data": data
     }), 200
 
 
 @bp.route('/demographics', methods=['GET'])
 @jwt_required()
-def get_demographics():
+@conditional(analytics_version)
+@cached_response()
+async def get_demographics():
     user_id = int(get_jwt_identity())
     
-    user = User.query.get(user_id)
+    user = await _get_user(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     
-    data = request.json
  
     return jsonify({
         "success": True,
@@ -153,14 +182,15 @@ def get_demographics():
 
 @bp.route('/content-performance', methods=['GET'])
 @jwt_required()
-def get_content_performance():
+@conditional(analytics_version)
+@cached_response()
+async def get_content_performance():
     user_id = int(get_jwt_identity())
     
-    user = User.query.get(user_id)
+    user = await _get_user(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     
-    data = request.json
  
     return jsonify({
         "success": True,
@@ -183,15 +213,16 @@ def get_content_performance():
 
 @bp.route('/best-times', methods=['GET'])
 @jwt_required()
-def get_best_times():
+@conditional(analytics_version)
+@cached_response()
+async def get_best_times():
     user_id = int(get_jwt_identity())
     logger.info(f"[get_best_times] User {user_id} requested best times analytics")
-    user = User.query.get(user_id)
+    user = await _get_user(user_id)
     if not user:
         logger.warning(f"[get_best_times] User {user_id} not found")
         return jsonify({"error": "User not found"}), 404
     
-    data = request.json
  
     return jsonify({
         "success": True,
@@ -3,10 +3,15 @@ from flask_jwt_extended import (
     jwt_required, create_access_token, get_jwt_identity, get_jwt
 )
 from app.utils.jwt_blacklist import add_token_to_blacklist
+import asyncio
 import logging
 
-from app.extensions import db
-from common.user import User, Role
+from sqlalchemy import text
+
+from app.extensions import db, oauth
+from app.utils.async_clients import async_redis, async_session
+from app.utils.rate_limiting import config_limit
+from app.models.user import User, Role
 from app.services.security_service import generate_tokens, get_user_roles
 
 logger = logging.getLogger(__name__)
@@ -24,7 +29,7 @@ def get_limiter():
 
 
 @bp.route('/register', methods=['POST'])
-@get_limiter().limit("3 per minute")
+@get_limiter().limit(config_limit('RATELIMIT_REGISTER'))
 def register():
     from app.schemas.auth import RegisterSchema
     data = request.json or {}
@@ -68,7 +73,7 @@ def register():
 
 
 @bp.route('/login', methods=['POST'])
-@get_limiter().limit("5 per minute")
+@get_limiter().limit(config_limit('RATELIMIT_LOGIN'))
 def login():
     from app.schemas.auth import LoginSchema
     data = request.json or {}
@@ -109,18 +114,32 @@ def logout():
     }), 200
 
 
+async def _check_db():
+    try:
+        async with async_session() as session:
+            await session.execute(text('SELECT 1'))
+        return "ok"
+    except Exception as e:
+        return f"error: {str(e)}"
+
+
+async def _check_redis():
+    try:
+        async with async_redis() as client:
+            await client.ping()
+        return "ok"
+    except Exception as e:
+        return f"error: {str(e)}"
+
+
 @bp.route('/status')
-def status():
+async def status():
     clients = list(oauth._registry.keys())
     
     import os
     frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:4200')
     
-    db_status = "ok"
-    try:
-        User.query.limit(1).all()
-    except Exception as e:
-        db_status = f"error: {str(e)}"
+    db_status, redis_status = await asyncio.gather(_check_db(), _check_redis())
     
     return jsonify({
         "success": True,
@@ -129,6 +148,7 @@ def status():
         "facebook_configured": 'facebook' in clients,
         "frontend_url": frontend_url,
         "db_status": db_status,
+        "redis_status": redis_status,
         "api_version": "1.0.0",
         "session_enabled": session.get('test_session', True)
     }), 200
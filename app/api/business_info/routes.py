@@ -55,7 +55,7 @@ def post_business_info():
 @bp.route('/', methods=['POST'])
 @jwt_required()
 def post_social_accounts():
-    from common.social_media import SocialPage
+    from app.models.social_media import SocialPage
     from app.extensions import db
     user_id = int(get_jwt_identity())
     data = request.json or {}
@@ -97,7 +97,7 @@ def post_social_accounts():
 @bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()
 def delete_social_account(id):
-    from common.social_media import SocialPage
+    from app.models.social_media import SocialPage
     from app.extensions import db
     user_id = int(get_jwt_identity())
     page = SocialPage.query.filter_by(id=id, user_id=user_id).first()
@@ -114,48 +114,17 @@ def delete_social_account(id):
 @bp.route('/metrics/basic', methods=['GET'])
 @jwt_required()
 def get_social_account_basic_metrics():
-    from common.social_media import SocialPage, SocialPageMetric, SocialPageScore
     user_id = int(get_jwt_identity())
-    pages = SocialPage.query.filter_by(user_id=user_id).all()
-    platforms = []
-    engagement_timeseries = []
-    social_score = {
-        "overall": 0,
-        "submetrics": {"engagement": 0, "reach": 0, "growth": 0},
-        "history": []
-    }
-    for page in pages:
-        metric = SocialPageMetric.query.filter_by(social_page_id=page.id).order_by(SocialPageMetric.date.desc()).first()
-        score = SocialPageScore.query.filter_by(social_page_id=page.id).order_by(SocialPageScore.date.desc()).first()
-        platforms.append({
-            "platform": page.platform,
-            "followers": metric.followers if metric else 0,
-            "engagement": metric.engagement if metric else 0,
-            "impressions": getattr(metric, 'impressions', 0) if metric else 0,
-            "reach": getattr(metric, 'reach', 0) if metric else 0,
-            "growth": 0
-        })
-        metrics = SocialPageMetric.query.filter_by(social_page_id=page.id).order_by(SocialPageMetric.date.asc()).all()
-        for m in metrics:
-            engagement_timeseries.append({
-                "date": m.date.isoformat(),
-                "value": m.engagement
-            })
-        if score:
-            social_score["overall"] = score.overall_score
-            social_score["submetrics"] = {
-                "engagement": score.engagement_score,
-                "reach": score.reach_score,
-                "growth": score.growth_score
-            }
-            history_scores = SocialPageScore.query.filter_by(social_page_id=page.id).order_by(SocialPageScore.date.asc()).all()
-            social_score["history"] = [
-                {"date": s.date.isoformat(), "score": s.overall_score} for s in history_scores
-            ]
+    from app.services.dashboard_service import BASIC_METRICS_FIELDS, BASIC_METRICS_INCLUDES, get_basic_metrics
+    from app.utils.fieldsets import parse_fieldset
+    try:
+        fields = parse_fieldset('fields', BASIC_METRICS_FIELDS)
+        include = parse_fieldset('include', BASIC_METRICS_INCLUDES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    metrics = get_basic_metrics(user_id, fields=fields, include=include)
     return jsonify({
         "success": True,
         "message": "Social account metrics retrieved successfully",
-        "platforms": platforms,
-        "engagementTimeseries": engagement_timeseries,
-        "socialScore": social_score
+        **metrics
     }), 200
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""
+Exports module for Analisa.ai Social Media.
+"""
+from app.api.exports.routes import bp
+
+__all__ = ['bp']
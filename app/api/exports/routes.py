@@ -0,0 +1,126 @@
+import logging
+from datetime import datetime
+from flask import Blueprint, current_app, jsonify, request, send_from_directory, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.models import User
+from app.models.social_media import SocialPagePost, SocialPagePostComment
+from app.services.export_service import enqueue_export, export_root, get_export_job, posts_query, comments_query
+from app.utils.db_routing import route_reads_to_replica
+from app.utils.streaming import STREAM_FORMATS, stream_rows
+
+bp = Blueprint('exports', __name__)
+logger = logging.getLogger(__name__)
+route_reads_to_replica(bp)
+
+
+def _stream_filters(posted_at):
+    """Validated format and posted_at window of a streaming export request."""
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    conditions = []
+    if request.args.get('since'):
+        conditions.append(posted_at >= datetime.fromisoformat(request.args['since']))
+    if request.args.get('until'):
+        conditions.append(posted_at < datetime.fromisoformat(request.args['until']))
+    return fmt, conditions
+
+
+@bp.route('/parquet', methods=['POST'])
+@jwt_required()
+def request_parquet_export():
+    user_id = int(get_jwt_identity())
+    data = request.json or {}
+    try:
+        organization_id = int(data['organization_id'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Missing or invalid field: organization_id"}), 400
+
+    user = User.query.get(user_id)
+    if not user or not any(org.id == organization_id for org in user.organizations):
+        return jsonify({"error": "Organization not found"}), 404
+
+    job_id = enqueue_export(organization_id, requested_by=user_id)
+    logger.info(f"[request_parquet_export] User {user_id} queued export {job_id} of organization {organization_id}")
+    return jsonify({
+        "success": True,
+        "message": "Export queued",
+        "job": {"id": job_id, "status": "queued"}
+    }), 202
+
+
+def _user_export_job(job_id):
+    """The export job if it was requested by the current user, else None."""
+    job = get_export_job(job_id)
+    if not job or job['requested_by'] != int(get_jwt_identity()):
+        return None
+    return job
+
+
+@bp.route('/parquet/<job_id>', methods=['GET'])
+@jwt_required()
+def get_parquet_export(job_id):
+    job = _user_export_job(job_id)
+    if not job:
+        return jsonify({"error": "Export not found"}), 404
+    job.pop('path', None)  # recorded by jobs queued before downloads existed
+    job['files'] = [
+        {"name": name, "url": url_for('.download_parquet_export', job_id=job_id, name=name)}
+        for name in job.get('files', [])
+    ]
+    return jsonify({
+        "success": True,
+        "job": job
+    }), 200
+
+
+@bp.route('/parquet/<job_id>/files/<path:name>', methods=['GET'])
+@jwt_required()
+def download_parquet_export(job_id, name):
+    job = _user_export_job(job_id)
+    if not job or job['status'] != 'done':
+        return jsonify({"error": "Export not found"}), 404
+    # send_from_directory rejects names escaping the job directory
+    return send_from_directory(
+        export_root(job['organization_id'], job_id), name,
+        as_attachment=True, mimetype='application/vnd.apache.parquet'
+    )
+
+
+@bp.route('/posts', methods=['GET'])
+@jwt_required()
+def export_posts():
+    user_id = int(get_jwt_identity())
+    try:
+        fmt, conditions = _stream_filters(SocialPagePost.posted_at)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    stmt = posts_query([user_id]).where(*conditions)
+    social_page_id = request.args.get('social_page_id', type=int)
+    if social_page_id:
+        stmt = stmt.where(SocialPagePost.social_page_id == social_page_id)
+
+    logger.info(f"[export_posts] User {user_id} streaming posts as {fmt}")
+    return stream_rows(stmt, fmt, 'posts', batch_size=current_app.config['EXPORT_STREAM_BATCH_SIZE'])
+
+
+@bp.route('/comments', methods=['GET'])
+@jwt_required()
+def export_comments():
+    user_id = int(get_jwt_identity())
+    try:
+        fmt, conditions = _stream_filters(SocialPagePostComment.posted_at)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    stmt = comments_query([user_id]).where(*conditions)
+    social_page_id = request.args.get('social_page_id', type=int)
+    if social_page_id:
+        stmt = stmt.where(SocialPagePost.social_page_id == social_page_id)
+    post_id = request.args.get('post_id', type=int)
+    if post_id:
+        stmt = stmt.where(SocialPagePostComment.post_id == post_id)
+
+    logger.info(f"[export_comments] User {user_id} streaming comments as {fmt}")
+    return stream_rows(stmt, fmt, 'comments', batch_size=current_app.config['EXPORT_STREAM_BATCH_SIZE'])
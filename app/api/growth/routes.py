@@ -10,7 +10,7 @@ logger = logging.getLogger(__name__)
 @bp.route('/', methods=['POST'])
 @jwt_required()
 def post_growth_goals():
-    from common.social_media import SocialPageGrowth
+    from app.models.social_media import SocialPageGrowth
     from app.extensions import db
     user_id = int(get_jwt_identity())
     logger.info(f"[post_growth_goals] User {user_id} requested to create growth goals")
@@ -56,7 +56,7 @@ def post_growth_goals():
 @bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()
 def delete_growth_goal(id):
-    from common.social_media import SocialPageGrowth
+    from app.models.social_media import SocialPageGrowth
     from app.extensions import db
     user_id = int(get_jwt_identity())
     goal = SocialPageGrowth.query.filter_by(id=id, user_id=user_id, is_goal=True).first()
@@ -0,0 +1,6 @@
+"""
+Organizations module for Analisa.ai Social Media.
+"""
+from app.api.organizations.routes import bp
+
+__all__ = ['bp']
@@ -0,0 +1,61 @@
+import logging
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.organization_stats_service import (
+    ORG_DASHBOARD_FIELDS, ORG_PAGES_SORTS, get_organization_dashboard, get_organization_pages, is_member
+)
+from app.utils.db_routing import route_reads_to_replica
+from app.utils.fieldsets import parse_fieldset
+
+bp = Blueprint('organizations', __name__)
+logger = logging.getLogger(__name__)
+route_reads_to_replica(bp)
+
+
+def _period_days():
+    days = request.args.get('days', current_app.config['ORG_DASHBOARD_DAYS'], type=int)
+    if not 1 <= days <= current_app.config['ORG_DASHBOARD_MAX_DAYS']:
+        raise ValueError(f"days must be between 1 and {current_app.config['ORG_DASHBOARD_MAX_DAYS']}")
+    return days
+
+
+@bp.route('/<int:organization_id>/dashboard', methods=['GET'])
+@jwt_required()
+def get_dashboard(organization_id):
+    user_id = int(get_jwt_identity())
+    if not is_member(user_id, organization_id):
+        return jsonify({"error": "Organization not found"}), 404
+    try:
+        days = _period_days()
+        fields = parse_fieldset('fields', ORG_DASHBOARD_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "success": True,
+        "data": get_organization_dashboard(organization_id, days, fields)
+    }), 200
+
+
+@bp.route('/<int:organization_id>/dashboard/pages', methods=['GET'])
+@jwt_required()
+def get_dashboard_pages(organization_id):
+    user_id = int(get_jwt_identity())
+    if not is_member(user_id, organization_id):
+        return jsonify({"error": "Organization not found"}), 404
+    try:
+        days = _period_days()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    sort = request.args.get('sort', 'followers')
+    if sort not in ORG_PAGES_SORTS:
+        return jsonify({"error": f"Unsupported sort: {sort}. Allowed: {', '.join(ORG_PAGES_SORTS)}"}), 400
+    limit = request.args.get('limit', 50, type=int)
+    if limit < 1:
+        return jsonify({"error": "limit must be at least 1"}), 400
+    limit = min(limit, 500)
+
+    return jsonify({
+        "success": True,
+        "data": get_organization_pages(organization_id, days, sort=sort, limit=limit)
+    }), 200
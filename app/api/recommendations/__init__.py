@@ -1,6 +1,6 @@
 """
 Social module for Analisa.ai Social Media.
 """
-from app.api.social.routes import bp
+from app.api.recommendations.routes import bp
 
 __all__ = ['bp']
\ No newline at end of file
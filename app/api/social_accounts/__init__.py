@@ -1,6 +1,6 @@
 """
-Social module for Analisa.ai Social Media.
+Social accounts module for Analisa.ai Social Media.
 """
-from app.api.social.routes import bp
+from app.api.social_accounts.routes import bp
 
 __all__ = ['bp']
\ No newline at end of file
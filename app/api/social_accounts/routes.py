@@ -1,12 +1,22 @@
 import logging
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import request
-from common.social_media import SocialPage
+from app.models.social_media import SocialPage
 from app.extensions import db
+from app.serializers import serialize_social_page
+from app.services.dashboard_service import BASIC_METRICS_FIELDS, BASIC_METRICS_INCLUDES, get_basic_metrics_async
+from app.services.data_versions import analytics_version
+from app.utils.compression import cached_response
+from app.utils.conditional import conditional
+from app.utils.db_routing import route_reads_to_replica
+from app.utils.fieldsets import parse_fieldset
+from app.utils.rate_limiting import config_limit
 
 bp = Blueprint('social_accounts', __name__)
 logger = logging.getLogger(__name__)
+route_reads_to_replica(bp)
+social_limit = current_app.limiter.limit(config_limit('RATELIMIT_SOCIAL'))
 
 
 @bp.route('/', methods=['GET'])
@@ -14,21 +24,7 @@ logger = logging.getLogger(__name__)
 def get_social_accounts():
     user_id = int(get_jwt_identity())
     pages = SocialPage.query.filter_by(user_id=user_id).all()
-    social_accounts = []
-    for page in pages:
-        social_accounts.append({
-            "id": page.id,
-            "platform": page.platform,
-            "username": page.username,
-            "profileUrl": page.profile_url,
-            "profilePicture": page.profile_image,
-            "followers": page.followers_count,
-            "following": page.following_count,
-            "postsCount": page.posts_count,
-            "isConnected": True,  # Ajuste conforme lógica real
-            "connectedAt": page.created_at.isoformat() if page.created_at else None,
-            "token": None  # Pode buscar em SocialToken se necessário
-        })
+    social_accounts = [dict(serialize_social_page(page), token=None) for page in pages]
     return jsonify({
         "success": True,
         "message": "Social accounts retrieved successfully",
@@ -37,6 +33,7 @@ def get_social_accounts():
 
 
 @bp.route('/', methods=['POST'])
+@social_limit
 @jwt_required()
 def post_social_accounts():
     user_id = int(get_jwt_identity())
@@ -63,23 +60,12 @@ def post_social_accounts():
     return jsonify({
         "success": True,
         "message": "Social account created successfully",
-        "social_account": {
-            "id": page.id,
-            "userId": page.user_id,
-            "platform": page.platform,
-            "username": page.username,
-            "profileUrl": page.profile_url,
-            "profilePicture": page.profile_image,
-            "followers": page.followers_count,
-            "following": page.following_count,
-            "postsCount": page.posts_count,
-            "isConnected": True,
-            "connectedAt": page.created_at.isoformat() if page.created_at else None
-        }
+        "social_account": dict(serialize_social_page(page), userId=page.user_id)
     }), 201
 
 
 @bp.route('/<int:id>', methods=['DELETE'])
+@social_limit
 @jwt_required()
 def delete_social_account(id):
     user_id = int(get_jwt_identity())
@@ -94,56 +80,35 @@ def delete_social_account(id):
     }), 200
 
 
+@bp.route('/tokens/<platform>', methods=['DELETE'])
+@social_limit
+@jwt_required()
+def disconnect_platform(platform):
+    from app.services.oauth_service import delete_token
+    user_id = int(get_jwt_identity())
+    if not delete_token(user_id, platform):
+        return jsonify({"error": "Platform not connected"}), 404
+    logger.info(f"[disconnect_platform] User {user_id} disconnected {platform}")
+    return jsonify({
+        "success": True,
+        "message": "Platform disconnected successfully"
+    }), 200
+
+
 @bp.route('/metrics/basic', methods=['GET'])
 @jwt_required()
-def get_social_account_basic_metrics():
+@conditional(analytics_version)
+@cached_response()
+async def get_social_account_basic_metrics():
     user_id = int(get_jwt_identity())
-    pages = SocialPage.query.filter_by(user_id=user_id).all()
-    platforms = []
-    engagement_timeseries = []
-    social_score = {
-        "overall": 0,
-        "submetrics": {"engagement": 0, "reach": 0, "growth": 0},
-        "history": []
-    }
-    from common.social_media import SocialPageMetric, SocialPageScore
-    for page in pages:
-        # Última métrica
-        metric = SocialPageMetric.query.filter_by(social_page_id=page.id).order_by(SocialPageMetric.date.desc()).first()
-        # Score
-        score = SocialPageScore.query.filter_by(social_page_id=page.id).order_by(SocialPageScore.date.desc()).first()
-        platforms.append({
-            "platform": page.platform,
-            "followers": metric.followers if metric else 0,
-            "engagement": metric.engagement if metric else 0,
-            "impressions": metric.impressions if metric and hasattr(metric, 'impressions') else 0,
-            "reach": metric.reach if metric and hasattr(metric, 'reach') else 0,
-            "growth": 0  # Pode ser calculado a partir de métricas históricas
-        })
-        # Timeseries de engajamento
-        metrics = SocialPageMetric.query.filter_by(social_page_id=page.id).order_by(SocialPageMetric.date.asc()).all()
-        for m in metrics:
-            engagement_timeseries.append({
-                "date": m.date.isoformat(),
-                "value": m.engagement
-            })
-        # Score
-        if score:
-            social_score["overall"] = score.overall_score
-            social_score["submetrics"] = {
-                "engagement": score.engagement_score,
-                "reach": score.reach_score,
-                "growth": score.growth_score
-            }
-            # Histórico de scores
-            history_scores = SocialPageScore.query.filter_by(social_page_id=page.id).order_by(SocialPageScore.date.asc()).all()
-            social_score["history"] = [
-                {"date": s.date.isoformat(), "score": s.overall_score} for s in history_scores
-            ]
+    try:
+        fields = parse_fieldset('fields', BASIC_METRICS_FIELDS)
+        include = parse_fieldset('include', BASIC_METRICS_INCLUDES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    metrics = await get_basic_metrics_async(user_id, fields=fields, include=include)
     return jsonify({
         "success": True,
         "message": "Social account metrics retrieved successfully",
-        "platforms": platforms,
-        "engagementTimeseries": engagement_timeseries,
-        "socialScore": social_score
+        **metrics
     }), 200
\ No newline at end of file
@@ -4,7 +4,9 @@ User-related routes.
 import logging
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from common.user import User
+from sqlalchemy.orm import selectinload
+from app.models import User
+from app.models.organization import Organization
 
 bp = Blueprint('users', __name__)
 logger = logging.getLogger(__name__)
@@ -16,17 +18,18 @@ logger = logging.getLogger(__name__)
 def get_me():
     user_id = int(get_jwt_identity())
     
-    user = User.query.get(user_id)
+    # Load organizations and their plans up front instead of once per organization
+    user = User.query.options(
+        selectinload(User.organizations).joinedload(Organization.plan)
+    ).filter_by(id=user_id).first()
     if not user:
         return jsonify({"error": "User not found"}), 404
     
-    organizations = []
-    if hasattr(user, 'organizations'):
-        organizations = [{
-            "id": org.id,
-            "name": org.name,
-            "plan": org.plan.name if hasattr(org, 'plan') and org.plan else None
-        } for org in user.organizations]
+    organizations = [{
+        "id": org.id,
+        "name": org.name,
+        "plan": org.plan.name if org.plan else None
+    } for org in user.organizations]
     
     return jsonify({
         "success": True,
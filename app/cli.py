@@ -0,0 +1,246 @@
+"""
+Custom Flask CLI commands for background jobs.
+"""
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+tokens_cli = AppGroup('tokens', help='Social platform token maintenance.')
+collect_cli = AppGroup('collect', help='Social platform data collection.')
+budgets_cli = AppGroup('budgets', help='Outbound platform API rate budgets.')
+partitions_cli = AppGroup('partitions', help='Monthly table partition maintenance.')
+queries_cli = AppGroup('queries', help='SQL query-shape auditing.')
+export_cli = AppGroup('export', help='Parquet exports for offline analytics.')
+profile_cli = AppGroup('profile', help='Sampling profiler for slow requests and jobs.')
+org_stats_cli = AppGroup('org-stats', help='Organization dashboard rollups.')
+
+
+@tokens_cli.command('refresh')
+@click.option('--loop', is_flag=True, help='Keep running, refreshing on a fixed interval.')
+@click.option('--interval', type=int, default=None, help='Seconds between runs when looping.')
+def refresh_tokens(loop, interval):
+    """Refresh tokens that are about to expire."""
+    from app.services.token_refresh_service import (
+        refresh_expiring_tokens, run_token_refresh_scheduler
+    )
+
+    if loop:
+        run_token_refresh_scheduler(current_app._get_current_object(), interval=interval)
+    else:
+        stats = refresh_expiring_tokens()
+        click.echo(f"Refreshed {stats['refreshed']} tokens, {stats['failed']} failed")
+
+
+@collect_cli.command('run')
+@click.option('--platform', 'platforms', multiple=True,
+              type=click.Choice(['facebook', 'instagram', 'tiktok']), help='Limit to these platforms.')
+@click.option('--batch-size', type=int, default=None, help='Accounts per DB write batch.')
+@click.option('--concurrency', type=int, default=None, help='Accounts fetched concurrently.')
+@click.option('--max-pages', type=int, default=None, help='Result pages followed per post listing.')
+@click.option('--no-comments', is_flag=True, help='Skip fetching post comments.')
+@click.option('--no-org-stats', is_flag=True, help='Skip refreshing organization rollups afterwards.')
+def run_collection(platforms, batch_size, concurrency, max_pages, no_comments, no_org_stats):
+    """Collect profiles, insights, posts and comments for all connected accounts."""
+    from app.collectors import collect_all
+    from app.utils.profiling import profile_block
+
+    with profile_block('collect.run'):
+        stats = collect_all(
+            platforms=list(platforms) or None,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            with_comments=not no_comments,
+            max_pages=max_pages,
+        )
+    click.echo(f"Collected {stats['collected']} accounts ({stats['failed']} failed): "
+               f"{stats['pages']} pages, {stats['posts']} posts, {stats['comments']} comments, "
+               f"{stats['api_calls']} API calls in {stats['seconds']}s")
+
+    if not no_org_stats:
+        from app.services.organization_stats_service import refresh_all_organizations
+        _echo_org_stats(refresh_all_organizations())
+
+
+@budgets_cli.command('show')
+def show_budgets():
+    """Show rate budget counters and reported usage per platform."""
+    from app.services.rate_budget import get_rate_budget
+
+    for platform, metrics in get_rate_budget().get_metrics().items():
+        usage = f"{metrics['usage']:.0f}%" if metrics['usage'] is not None else 'n/a'
+        click.echo(f"{platform}: granted={metrics['granted']} throttled={metrics['throttled']} "
+                   f"wait_ms={metrics['wait_ms']} pauses={metrics['pauses']} usage={usage}")
+
+
+@partitions_cli.command('maintain')
+@click.option('--months-ahead', type=int, default=None, help='Months of partitions to create ahead.')
+@click.option('--dry-run', is_flag=True, help='Only list the partitions that would be archived.')
+def maintain_partitions(months_ahead, dry_run):
+    """Create upcoming monthly partitions and archive expired ones."""
+    from app.services.partition_service import maintain_partitions
+
+    result = maintain_partitions(months_ahead=months_ahead, dry_run=dry_run)
+    click.echo(f"Created {len(result['created'])} partitions")
+    verb = 'Would archive' if dry_run else 'Archived'
+    click.echo(f"{verb} {len(result['archived'])} partitions: {', '.join(result['archived']) or '-'}")
+
+
+@partitions_cli.command('list')
+def list_partitions():
+    """List the monthly partitions of each partitioned table."""
+    from app.services.partition_service import PARTITIONED_TABLES, list_partitions
+
+    for table in PARTITIONED_TABLES:
+        partitions = list_partitions(table)
+        span = f"{partitions[0][1]:%Y-%m} .. {partitions[-1][1]:%Y-%m}" if partitions else 'none'
+        click.echo(f"{table}: {len(partitions)} partitions ({span})")
+
+
+@queries_cli.command('audit')
+@click.argument('paths', nargs=-1, required=True)
+@click.option('--user-id', type=int, required=True, help='User the requests are authenticated as.')
+@click.option('--explain', is_flag=True, help='Print the query plan of each SELECT shape.')
+def audit_queries(paths, user_id, explain):
+    """Replay GET endpoints and report the SQL query shapes they execute."""
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.utils.query_audit import capture_queries
+
+    app = current_app._get_current_object()
+    headers = {'Authorization': f"Bearer {create_access_token(identity=str(user_id))}"}
+    client = app.test_client()
+
+    for path in paths:
+        with capture_queries() as audit:
+            response = client.get(path, headers=headers)
+        click.echo(f"GET {path} -> {response.status_code}: {audit.count} queries, {len(audit.shapes)} shapes")
+        plans = audit.explain(db.engine) if explain else {}
+        for entry in audit.report():
+            click.echo(f"  {entry['count']:>4}x {entry['total_ms']:8.1f}ms  {entry['shape']}")
+            for line in plans.get(entry['shape'], []):
+                click.echo(f"             {line}")
+
+
+@export_cli.command('parquet')
+@click.option('--organization-id', type=int, required=True, help='Organization to export.')
+@click.option('--dataset', 'datasets', multiple=True,
+              type=click.Choice(['metrics', 'posts', 'comments']), help='Limit to these datasets.')
+@click.option('--chunk-size', type=int, default=None, help='Rows per fetched and written chunk.')
+@click.option('--enqueue', is_flag=True, help='Queue the export for the worker instead of running it here.')
+def export_parquet(organization_id, datasets, chunk_size, enqueue):
+    """Export an organization's metrics, posts and comments to Parquet."""
+    from app.services.export_service import EXPORT_DATASETS, enqueue_export, export_organization
+
+    if enqueue:
+        click.echo(f"Queued export job {enqueue_export(organization_id, requested_by=0)}")
+        return
+
+    result = export_organization(organization_id, datasets=list(datasets) or EXPORT_DATASETS, chunk_size=chunk_size)
+    rows = ', '.join(f"{count} {dataset}" for dataset, count in result['rows'].items())
+    click.echo(f"Exported {rows} to {result['path']}")
+
+
+@export_cli.command('worker')
+@click.option('--max-jobs', type=int, default=None, help='Exit after this many jobs.')
+def export_worker(max_jobs):
+    """Run queued export jobs."""
+    from app.services.export_service import run_export_worker
+
+    run_export_worker(current_app._get_current_object(), max_jobs=max_jobs)
+
+
+@export_cli.command('cleanup')
+def export_cleanup():
+    """Delete the files of expired export jobs."""
+    from app.services.export_service import cleanup_exports
+
+    click.echo(f"Deleted {cleanup_exports()} expired export(s)")
+
+
+@profile_cli.command('enable')
+@click.option('--sample-rate', type=float, default=None, help='Fraction of requests profiled regardless of latency.')
+@click.option('--slow-ms', type=int, default=None, help='Requests slower than this are always kept.')
+@click.option('--interval-ms', type=int, default=None, help='Milliseconds between stack samples.')
+@click.option('--output', default=None, help="'redis' or a directory for .folded files.")
+@click.option('--duration', type=int, default=3600, help='Seconds until profiling switches itself off.')
+def enable_profiling(sample_rate, slow_ms, interval_ms, output, duration):
+    """Turn profiling on in all running processes."""
+    from app.utils.profiling import SETTINGS_KEY
+
+    settings = {'enabled': 1}
+    for key, value in (('sample_rate', sample_rate), ('slow_ms', slow_ms),
+                       ('interval_ms', interval_ms), ('output', output)):
+        if value is not None:
+            settings[key] = value
+    pipeline = current_app.redis.pipeline()
+    pipeline.delete(SETTINGS_KEY)
+    pipeline.hset(SETTINGS_KEY, mapping=settings)
+    pipeline.expire(SETTINGS_KEY, duration)
+    pipeline.execute()
+    click.echo(f"Profiling enabled for {duration}s: {settings}")
+
+
+@profile_cli.command('disable')
+@click.option('--duration', type=int, default=3600,
+              help='Seconds until the config (PROFILE_ENABLED) applies again.')
+def disable_profiling(duration):
+    """Turn profiling off in all running processes."""
+    from app.utils.profiling import SETTINGS_KEY
+
+    pipeline = current_app.redis.pipeline()
+    pipeline.delete(SETTINGS_KEY)
+    pipeline.hset(SETTINGS_KEY, 'enabled', 0)
+    pipeline.expire(SETTINGS_KEY, duration)
+    pipeline.execute()
+    click.echo(f"Profiling disabled for {duration}s")
+
+
+@profile_cli.command('show')
+@click.argument('name')
+@click.option('--limit', type=int, default=20, help='Stacks shown; 0 prints all in folded format.')
+def show_profile(name, limit):
+    """Print the most sampled stacks of an endpoint or job."""
+    from app.utils.profiling import load_stacks
+
+    stacks = load_stacks(name)
+    if not limit:
+        for stack, count in stacks:
+            click.echo(f"{stack} {count}")
+        return
+    total = sum(count for _, count in stacks) or 1
+    click.echo(f"{name}: {sum(count for _, count in stacks)} samples")
+    for stack, count in stacks[:limit]:
+        click.echo(f"  {count / total:6.1%}  ...;{';'.join(stack.split(';')[-4:])}")
+
+
+def _echo_org_stats(stats):
+    click.echo(f"Organization rollups: {stats['rebuilt']} rebuilt, {stats['refreshed']} refreshed, "
+               f"{stats['unchanged']} unchanged, {stats['failed']} failed")
+
+
+@org_stats_cli.command('refresh')
+@click.option('--organization-id', type=int, default=None, help='Refresh only this organization.')
+@click.option('--full', is_flag=True, help='Rebuild every day instead of only the changed ones.')
+def refresh_org_stats(organization_id, full):
+    """Refresh the daily stats rollups behind organization dashboards."""
+    from app.extensions import db
+    from app.services.organization_stats_service import refresh_all_organizations, refresh_organization_stats
+
+    if organization_id is None:
+        _echo_org_stats(refresh_all_organizations(full=full))
+        return
+    outcome = refresh_organization_stats(organization_id, full=full)
+    db.session.commit()
+    click.echo(f"Organization {organization_id}: {outcome}")
+
+
+def register_commands(app):
+    """Register custom CLI commands with the Flask app."""
+    app.cli.add_command(tokens_cli)
+    app.cli.add_command(collect_cli)
+    app.cli.add_command(budgets_cli)
+    app.cli.add_command(partitions_cli)
+    app.cli.add_command(queries_cli)
+    app.cli.add_command(export_cli)
+    app.cli.add_command(profile_cli)
+    app.cli.add_command(org_stats_cli)
@@ -0,0 +1,6 @@
+"""
+Asynchronous data collectors for social media platforms.
+"""
+from app.collectors.runner import collect_all
+
+__all__ = ['collect_all']
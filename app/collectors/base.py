@@ -0,0 +1,212 @@
+"""
+Async HTTP plumbing shared by the platform collectors.
+"""
+import asyncio
+import copy
+import hashlib
+import logging
+from datetime import datetime
+
+import aiohttp
+
+from app.services.platform_http import PLATFORM_BASE_URLS, RETRY_STATUS_CODES
+
+logger = logging.getLogger(__name__)
+
+# Graph API error codes meaning "throttled", returned with HTTP 400/403
+GRAPH_THROTTLE_CODES = {4, 17, 32, 613}
+
+# Fields whose change makes a stored row stale
+POST_HASH_FIELDS = ('content', 'post_url', 'media_url', 'content_type',
+                    'likes_count', 'comments_count', 'shares_count', 'views_count')
+COMMENT_HASH_FIELDS = ('content', 'author_display_name', 'likes_count')
+
+# Sync state of a page never collected before: fetch everything
+FULL_SYNC = {'cutoff': None, 'post_hashes': {}, 'last_comment_at': None, 'fetch_insights': True}
+
+
+class PlatformAPIError(Exception):
+    """Raised when a platform API call fails after retries."""
+
+    def __init__(self, platform, status, message):
+        super().__init__(f"{platform} API error {status}: {message}")
+        self.platform = platform
+        self.status = status
+
+
+class AsyncPlatformSession:
+    """
+    aiohttp session for one platform with a concurrency cap, the shared
+    Redis rate budget and retry/backoff on throttling and server errors.
+    """
+
+    def __init__(self, platform, session, budget, concurrency, retries=3, backoff_factor=0.5):
+        self.platform = platform
+        self.base_url = PLATFORM_BASE_URLS[platform]
+        self.session = session
+        self.budget = budget
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.user_key = None
+        self.counters = {'calls': 0}
+
+    @property
+    def calls(self):
+        return self.counters['calls']
+
+    def bind(self, user_key):
+        """Return a view of this session that also charges `user_key`'s budget."""
+        bound = copy.copy(self)
+        bound.user_key = user_key
+        return bound
+
+    def url_for(self, path):
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def request_json(self, method, path, **kwargs):
+        """
+        Call the platform API and decode the JSON body.
+
+        Raises:
+            PlatformAPIError: On a non-retryable error or when retries run out
+        """
+        url = self.url_for(path)
+        attempt = 0
+
+        while True:
+            await self.budget.acquire_async(self.platform, user_key=self.user_key)
+            async with self.semaphore:
+                self.counters['calls'] += 1
+                async with self.session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    headers = response.headers
+                    retry_after = headers.get('Retry-After')
+                    try:
+                        body = await response.json(content_type=None)
+                    except (aiohttp.ContentTypeError, ValueError):
+                        body = {}
+            await asyncio.to_thread(self.budget.record_response, self.platform, status, headers)
+
+            if status < 400:
+                return body
+
+            error = (body or {}).get('error') or {}
+            throttled = status in RETRY_STATUS_CODES or (
+                isinstance(error, dict) and error.get('code') in GRAPH_THROTTLE_CODES
+            )
+            message = error.get('message') if isinstance(error, dict) else str(error)
+
+            if not throttled or attempt >= self.retries:
+                raise PlatformAPIError(self.platform, status, message or 'request failed')
+
+            delay = self.backoff_factor * (2 ** attempt)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            logger.info(f"{self.platform} API throttled ({status}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get_json(self, path, **kwargs):
+        return await self.request_json('GET', path, **kwargs)
+
+    async def post_json(self, path, **kwargs):
+        return await self.request_json('POST', path, **kwargs)
+
+    async def iter_graph_pages(self, path, params, max_pages=None, newer_than=None, time_field=None):
+        """
+        Follow Graph API cursor pagination (`paging.next`).
+
+        Args:
+            path: Edge path
+            params: Query parameters of the first request
+            max_pages: Stop after this many result pages
+            newer_than: For reverse-chronological edges, stop once a whole
+                result page is older than this datetime
+            time_field: Item field holding the timestamp compared to `newer_than`
+
+        Yields:
+            list: The `data` items of each page
+        """
+        url, page_params, pages = path, params, 0
+        while url:
+            body = await self.get_json(url, params=page_params)
+            items = body.get('data', [])
+            yield items
+            pages += 1
+            if max_pages and pages >= max_pages:
+                break
+            if newer_than and items and all(
+                (parse_timestamp(item.get(time_field)) or newer_than) < newer_than for item in items
+            ):
+                break
+            # `next` already carries every query parameter, including the cursor
+            url = (body.get('paging') or {}).get('next')
+            page_params = None
+
+
+def parse_timestamp(value):
+    """Parse Graph API (ISO 8601) or TikTok (epoch seconds) timestamps to naive UTC."""
+    if value in (None, ''):
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.utcfromtimestamp(value)
+    value = value.replace('Z', '+00:00')
+    # Graph API uses +0000 without a colon
+    if len(value) > 5 and value[-5] in '+-' and value[-3] != ':':
+        value = f"{value[:-2]}:{value[-2:]}"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo:
+        parsed = parsed.replace(tzinfo=None) - parsed.utcoffset()
+    return parsed
+
+
+def latest_insight_values(insights):
+    """Map each insight metric name to its most recent daily value."""
+    values = {}
+    for metric in insights or []:
+        points = metric.get('values') or []
+        if points:
+            values[metric.get('name')] = points[-1].get('value') or 0
+    return values
+
+
+def content_hash(row, fields):
+    """Stable hash of the fields of a collected row that matter for storage."""
+    payload = '\x1f'.join('' if row.get(field) is None else str(row.get(field)) for field in fields)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def hashed(row, fields):
+    """Set `content_hash` on a collected row and return it."""
+    row['content_hash'] = content_hash(row, fields)
+    return row
+
+
+def page_state(account, username):
+    """Incremental sync state of one of the account's pages."""
+    return (account.get('sync_state') or {}).get(username) or FULL_SYNC
+
+
+def recent_posts(posts, state):
+    """Drop posts older than the page's incremental cutoff."""
+    cutoff = state['cutoff']
+    if cutoff is None:
+        return posts
+    return [post for post in posts if post['posted_at'] and post['posted_at'] >= cutoff]
+
+
+def changed_posts(posts, state):
+    """Posts that are new or whose content hash differs from the stored one."""
+    known = state['post_hashes']
+    return [post for post in posts if known.get(post['post_id']) != post['content_hash']]
+
+
+def new_comments(comments, state):
+    """Comments posted after the page's comment high-water mark."""
+    last_comment_at = state['last_comment_at']
+    if last_comment_at is None:
+        return comments
+    return [comment for comment in comments if not comment['posted_at'] or comment['posted_at'] >= last_comment_at]
@@ -0,0 +1,237 @@
+"""
+Concurrent collection run over every connected SocialToken.
+
+Accounts are fetched concurrently on one asyncio event loop, charged to the
+shared per-platform rate budgets and capped per platform. Results are
+written in batches from a worker thread while the next batch is being
+fetched.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+import aiohttp
+from flask import current_app
+
+from app.collectors import facebook, instagram, tiktok
+from app.collectors.base import AsyncPlatformSession, PlatformAPIError
+from app.services.rate_budget import get_rate_budget, RateBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+COLLECTORS = {
+    'facebook': facebook.collect,
+    'instagram': instagram.collect,
+    'tiktok': tiktok.collect,
+}
+
+
+def load_accounts(platforms=None):
+    """
+    Load decrypted, unexpired tokens for every connected account.
+
+    Expired tokens are skipped; the token refresh scheduler renews them
+    ahead of time, so collection never blocks on a refresh.
+
+    Returns:
+        list: dicts with user_id, platform and access_token
+    """
+    from app.models.social_media import SocialToken
+    from app.services.security_service import decrypt_token
+
+    query = SocialToken.query.filter(SocialToken.platform.in_(platforms or list(COLLECTORS)))
+    accounts = []
+    now = datetime.utcnow()
+    for token in query.order_by(SocialToken.id).yield_per(1000):
+        if token.expires_at and token.expires_at <= now:
+            continue
+        accounts.append({
+            'user_id': token.user_id,
+            'platform': token.platform,
+            'access_token': decrypt_token(token.access_token),
+        })
+    return accounts
+
+
+def load_sync_states(accounts, refresh_window):
+    """
+    Build the incremental sync state of every known page of the given accounts.
+
+    A page's cutoff is the older of its newest stored post and the start of
+    the refresh window: new posts are fetched along with recent ones whose
+    counts may still change. Content hashes of the posts past the cutoff are
+    loaded so unchanged posts can be skipped before they reach the database.
+
+    Returns:
+        dict: (user_id, platform) -> {username: state}
+    """
+    from app.extensions import db
+    from app.models.social_media import SocialPage, SocialPagePost, SocialPageSyncState
+
+    user_ids = list({account['user_id'] for account in accounts})
+    if not user_ids:
+        return {}
+
+    rows = db.session.query(
+        SocialPage.id, SocialPage.user_id, SocialPage.platform, SocialPage.username,
+        SocialPageSyncState.last_posted_at, SocialPageSyncState.last_comment_at,
+        SocialPageSyncState.last_metrics_date
+    ).join(
+        SocialPageSyncState, SocialPageSyncState.social_page_id == SocialPage.id
+    ).filter(SocialPage.user_id.in_(user_ids)).all()
+
+    window_start = datetime.utcnow() - refresh_window
+    today = datetime.utcnow().date()
+    states, by_page_id = {}, {}
+    for row in rows:
+        cutoff = min(row.last_posted_at, window_start) if row.last_posted_at else None
+        state = {
+            'cutoff': cutoff,
+            'post_hashes': {},
+            'last_comment_at': row.last_comment_at,
+            'fetch_insights': row.last_metrics_date != today,
+        }
+        states.setdefault((row.user_id, row.platform), {})[row.username] = state
+        by_page_id[row.id] = state
+
+    cutoffs = [state['cutoff'] for state in by_page_id.values() if state['cutoff']]
+    if cutoffs:
+        hash_rows = db.session.query(
+            SocialPagePost.social_page_id, SocialPagePost.post_id, SocialPagePost.content_hash
+        ).filter(
+            SocialPagePost.social_page_id.in_(list(by_page_id)),
+            SocialPagePost.posted_at >= min(cutoffs)
+        )
+        for row in hash_rows:
+            by_page_id[row.social_page_id]['post_hashes'][row.post_id] = row.content_hash
+    return states
+
+
+def _attach_sync_states(app, accounts):
+    from app.extensions import db
+
+    with app.app_context():
+        try:
+            states = load_sync_states(
+                accounts, timedelta(days=app.config['COLLECTOR_REFRESH_WINDOW_DAYS'])
+            )
+        finally:
+            db.session.remove()
+    for account in accounts:
+        account['sync_state'] = states.get((account['user_id'], account['platform']), {})
+
+
+def _write_batch(app, bundles):
+    from app.collectors.storage import write_bundles
+    from app.extensions import db
+
+    with app.app_context():
+        try:
+            return write_bundles(bundles)
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
+
+
+async def _collect_account(sessions, account, options, stats):
+    api = sessions[account['platform']].bind(account['user_id'])
+    try:
+        bundles = await COLLECTORS[account['platform']](api, account, options)
+    except (PlatformAPIError, RateBudgetExceeded, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        stats['failed'] += 1
+        logger.warning(f"Collection failed for user {account['user_id']} on {account['platform']}: {str(e)}")
+        return []
+    except Exception as e:
+        stats['failed'] += 1
+        logger.error(f"Unexpected collection error for user {account['user_id']} on {account['platform']}: {str(e)}", exc_info=True)
+        return []
+    stats['collected'] += 1
+    return [(account['user_id'], bundle) for bundle in bundles]
+
+
+async def _collect(app, accounts, options):
+    config = app.config
+    stats = {'collected': 0, 'failed': 0, 'pages': 0, 'posts': 0, 'comments': 0}
+    timeout = aiohttp.ClientTimeout(
+        total=None,
+        sock_connect=config['PLATFORM_HTTP_CONNECT_TIMEOUT'],
+        sock_read=config['PLATFORM_HTTP_READ_TIMEOUT'],
+    )
+    budget = get_rate_budget(app)
+    connector = aiohttp.TCPConnector(limit=config['COLLECTOR_MAX_CONNECTIONS'], ttl_dns_cache=300)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        sessions = {
+            platform: AsyncPlatformSession(
+                platform, session,
+                budget=budget,
+                concurrency=config['PLATFORM_HTTP_CONCURRENCY'][platform],
+                retries=config['PLATFORM_HTTP_RETRIES'],
+                backoff_factor=config['PLATFORM_HTTP_BACKOFF_FACTOR'],
+            )
+            for platform in COLLECTORS
+        }
+        # Caps accounts in flight, independently of per-platform call limits
+        in_flight = asyncio.Semaphore(options['concurrency'])
+
+        async def collect_one(account):
+            async with in_flight:
+                return await _collect_account(sessions, account, options, stats)
+
+        batch_size = options['batch_size']
+        pending_write = None
+        for start in range(0, len(accounts), batch_size):
+            batch = accounts[start:start + batch_size]
+            await asyncio.to_thread(_attach_sync_states, app, batch)
+            results = await asyncio.gather(*[collect_one(account) for account in batch])
+            bundles = [item for result in results for item in result]
+
+            if pending_write:
+                _merge_counts(stats, await pending_write)
+            pending_write = asyncio.ensure_future(asyncio.to_thread(_write_batch, app, bundles)) if bundles else None
+
+        if pending_write:
+            _merge_counts(stats, await pending_write)
+
+        stats['api_calls'] = sum(api.calls for api in sessions.values())
+    return stats
+
+
+def _merge_counts(stats, written):
+    for key in ('pages', 'posts', 'comments'):
+        stats[key] += written[key]
+
+
+def collect_all(platforms=None, batch_size=None, concurrency=None, with_comments=True, max_pages=None):
+    """
+    Collect profiles, insights, posts and comments for every connected account.
+
+    Must be called inside an application context.
+
+    Args:
+        platforms: Platforms to collect (defaults to all supported)
+        batch_size: Accounts per DB write batch (defaults to COLLECTOR_BATCH_SIZE)
+        concurrency: Accounts fetched concurrently (defaults to COLLECTOR_CONCURRENCY)
+        with_comments: Whether to fetch post comments
+        max_pages: Cap on result pages followed per post listing
+
+    Returns:
+        dict: Collection statistics
+    """
+    app = current_app._get_current_object()
+    accounts = load_accounts(platforms)
+    options = {
+        'batch_size': batch_size or app.config['COLLECTOR_BATCH_SIZE'],
+        'concurrency': concurrency or app.config['COLLECTOR_CONCURRENCY'],
+        'with_comments': with_comments,
+        'max_pages': max_pages or app.config['COLLECTOR_MAX_PAGES'],
+        'max_comment_pages': app.config['COLLECTOR_MAX_COMMENT_PAGES'],
+    }
+
+    started = datetime.utcnow()
+    stats = asyncio.run(_collect(app, accounts, options))
+    stats['seconds'] = round((datetime.utcnow() - started).total_seconds(), 2)
+    logger.info(f"Collection finished: {stats}")
+    return stats
@@ -0,0 +1,314 @@
+"""
+Batched, set-based persistence of collected bundles.
+
+A whole batch of accounts is written with a handful of multi-row
+INSERT ... ON CONFLICT statements instead of one ORM round trip per row.
+Rows whose content hash did not change are left untouched, so re-collected
+but unchanged posts and comments cost no writes.
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import func, select, literal
+from sqlalchemy.dialects.postgresql import insert
+
+from app.extensions import db
+from app.models.social_media import (
+    SocialPage, SocialPageMetric, SocialPageReach, SocialPagePost, SocialPagePostComment,
+    SocialPageSyncState
+)
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+
+
+def _chunks(rows, size=CHUNK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _dedupe(rows, *keys):
+    # ON CONFLICT cannot touch the same row twice within one statement
+    unique = {}
+    for row in rows:
+        unique[tuple(row[key] for key in keys)] = row
+    return list(unique.values())
+
+
+def _engagement_rate(post, followers):
+    if not followers:
+        return 0.0
+    interactions = (post['likes_count'] or 0) + (post['comments_count'] or 0) + (post['shares_count'] or 0)
+    return round(interactions / followers * 100, 4)
+
+
+def upsert_pages(page_rows):
+    """
+    Insert or update SocialPage rows.
+
+    A page keeps the user who connected it first: when another user's token
+    collects the same page its profile is refreshed, but the ownership is
+    not moved, and the conflict is logged.
+
+    Returns:
+        dict: (platform, username) -> social_page.id
+    """
+    page_ids = {}
+    now = datetime.utcnow()
+    for chunk in _chunks(_dedupe(page_rows, 'platform', 'username')):
+        stmt = insert(SocialPage).values([dict(row, created_at=now, updated_at=now) for row in chunk])
+        stmt = stmt.on_conflict_do_update(
+            constraint='uix_social_page_username_platform',
+            set_={
+                'user_id': func.coalesce(SocialPage.user_id, stmt.excluded.user_id),
+                'full_name': stmt.excluded.full_name,
+                'profile_url': stmt.excluded.profile_url,
+                'profile_image': stmt.excluded.profile_image,
+                'bio': stmt.excluded.bio,
+                'followers_count': stmt.excluded.followers_count,
+                'following_count': stmt.excluded.following_count,
+                'posts_count': func.coalesce(stmt.excluded.posts_count, SocialPage.posts_count),
+                'updated_at': now,
+            }
+        ).returning(SocialPage.id, SocialPage.platform, SocialPage.username, SocialPage.user_id)
+        collected_by = {(row['platform'], row['username']): row['user_id'] for row in chunk}
+        for row in db.session.execute(stmt):
+            page_ids[(row.platform, row.username)] = row.id
+            user_id = collected_by[(row.platform, row.username)]
+            if user_id != row.user_id:
+                logger.warning(f"{row.platform} page {row.username} is owned by user {row.user_id}, "
+                               f"not moved to user {user_id} who also connected it")
+    return page_ids
+
+
+def upsert_posts(post_rows):
+    """
+    Insert or update SocialPagePost rows whose content hash changed.
+
+    Returns:
+        dict: external post_id -> social_page_post.id of the rows written
+    """
+    post_ids = {}
+    now = datetime.utcnow()
+    for chunk in _chunks(_dedupe(post_rows, 'post_id')):
+        stmt = insert(SocialPagePost).values([dict(row, created_at=now, updated_at=now) for row in chunk])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SocialPagePost.post_id],
+            set_={
+                'content': stmt.excluded.content,
+                'post_url': stmt.excluded.post_url,
+                'media_url': stmt.excluded.media_url,
+                'likes_count': stmt.excluded.likes_count,
+                'comments_count': stmt.excluded.comments_count,
+                'shares_count': stmt.excluded.shares_count,
+                'views_count': stmt.excluded.views_count,
+                'engagement_rate': stmt.excluded.engagement_rate,
+                'content_hash': stmt.excluded.content_hash,
+                'updated_at': now,
+            },
+            where=SocialPagePost.content_hash.is_distinct_from(stmt.excluded.content_hash)
+        ).returning(SocialPagePost.id, SocialPagePost.post_id)
+        for row in db.session.execute(stmt):
+            post_ids[row.post_id] = row.id
+    return post_ids
+
+
+def resolve_post_ids(external_ids):
+    """Map external post ids to social_page_post ids for already stored posts."""
+    if not external_ids:
+        return {}
+    rows = db.session.execute(
+        select(SocialPagePost.id, SocialPagePost.post_id).where(SocialPagePost.post_id.in_(external_ids))
+    )
+    return {row.post_id: row.id for row in rows}
+
+
+def upsert_comments(comment_rows):
+    """Insert or update SocialPagePostComment rows whose content hash changed."""
+    now = datetime.utcnow()
+    for chunk in _chunks(_dedupe(comment_rows, 'comment_id')):
+        stmt = insert(SocialPagePostComment).values([dict(row, created_at=now, updated_at=now) for row in chunk])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SocialPagePostComment.comment_id, SocialPagePostComment.posted_at],
+            set_={
+                'content': stmt.excluded.content,
+                'author_display_name': stmt.excluded.author_display_name,
+                'likes_count': stmt.excluded.likes_count,
+                'content_hash': stmt.excluded.content_hash,
+                'updated_at': now,
+            },
+            where=SocialPagePostComment.content_hash.is_distinct_from(stmt.excluded.content_hash)
+        )
+        db.session.execute(stmt)
+
+
+def upsert_daily_metrics(page_ids, day):
+    """
+    Snapshot each page's daily metrics from its stored posts in one statement.
+
+    Args:
+        page_ids: social_page ids to snapshot
+        day: Metric date
+    """
+    if not page_ids:
+        return
+    now = datetime.utcnow()
+    totals = select(
+        SocialPage.id,
+        literal(day),
+        SocialPage.followers_count,
+        func.coalesce(func.avg(SocialPagePost.engagement_rate), 0.0),
+        func.count(SocialPagePost.id),
+        func.coalesce(func.sum(SocialPagePost.likes_count), 0),
+        func.coalesce(func.sum(SocialPagePost.comments_count), 0),
+        func.coalesce(func.sum(SocialPagePost.shares_count), 0),
+        func.coalesce(func.sum(SocialPagePost.views_count), 0),
+        literal(now),
+    ).select_from(SocialPage).outerjoin(
+        SocialPagePost, SocialPagePost.social_page_id == SocialPage.id
+    ).where(SocialPage.id.in_(page_ids)).group_by(SocialPage.id, SocialPage.followers_count)
+
+    stmt = insert(SocialPageMetric).from_select(
+        ['social_page_id', 'date', 'followers', 'engagement', 'posts',
+         'likes', 'comments', 'shares', 'views', 'created_at'],
+        totals
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint='uix_social_page_metric_page_date',
+        set_={
+            'followers': stmt.excluded.followers,
+            'engagement': stmt.excluded.engagement,
+            'posts': stmt.excluded.posts,
+            'likes': stmt.excluded.likes,
+            'comments': stmt.excluded.comments,
+            'shares': stmt.excluded.shares,
+            'views': stmt.excluded.views,
+        }
+    )
+    db.session.execute(stmt)
+
+
+def upsert_reach(reach_rows):
+    """Insert or update today's SocialPageReach rows."""
+    now = datetime.utcnow()
+    for chunk in _chunks(_dedupe(reach_rows, 'social_page_id', 'date')):
+        stmt = insert(SocialPageReach).values([
+            dict(row, timestamp=now, created_at=now, updated_at=now) for row in chunk
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint='uix_social_page_reach_page_date',
+            set_={
+                'impressions': stmt.excluded.impressions,
+                'reach': stmt.excluded.reach,
+                'profile_views': stmt.excluded.profile_views,
+                'timestamp': now,
+                'updated_at': now,
+            }
+        )
+        db.session.execute(stmt)
+
+
+def pages_with_metrics_for(page_ids, day):
+    """social_page ids whose daily snapshot for `day` is already recorded."""
+    if not page_ids:
+        return set()
+    rows = db.session.execute(
+        select(SocialPageSyncState.social_page_id).where(
+            SocialPageSyncState.social_page_id.in_(page_ids),
+            SocialPageSyncState.last_metrics_date == day
+        )
+    )
+    return {row.social_page_id for row in rows}
+
+
+def upsert_sync_states(state_rows):
+    """Advance per-page high-water marks; marks never move backwards."""
+    now = datetime.utcnow()
+    for chunk in _chunks(_dedupe(state_rows, 'social_page_id')):
+        stmt = insert(SocialPageSyncState).values([
+            dict(row, last_synced_at=now, created_at=now, updated_at=now) for row in chunk
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SocialPageSyncState.social_page_id],
+            set_={
+                'last_posted_at': func.greatest(SocialPageSyncState.last_posted_at, stmt.excluded.last_posted_at),
+                'last_comment_at': func.greatest(SocialPageSyncState.last_comment_at, stmt.excluded.last_comment_at),
+                'last_metrics_date': func.coalesce(stmt.excluded.last_metrics_date, SocialPageSyncState.last_metrics_date),
+                'last_synced_at': now,
+                'updated_at': now,
+            }
+        )
+        db.session.execute(stmt)
+
+
+def _latest(rows):
+    values = [row['posted_at'] for row in rows if row.get('posted_at')]
+    return max(values) if values else None
+
+
+def write_bundles(bundles, day=None):
+    """
+    Persist a batch of collected bundles in a single transaction.
+
+    Args:
+        bundles: list of (user_id, bundle) tuples
+        day: Date the daily snapshots are recorded for (defaults to today, UTC)
+
+    Returns:
+        dict: Row counts sent for writing (unchanged rows are skipped by the database)
+    """
+    day = day or datetime.utcnow().date()
+
+    page_ids = upsert_pages([dict(bundle['page'], user_id=user_id) for user_id, bundle in bundles])
+
+    post_rows, reach_rows, comments, state_rows = [], [], [], []
+    due_page_ids = set()
+    for _, bundle in bundles:
+        page = bundle['page']
+        page_id = page_ids[(page['platform'], page['username'])]
+        for post in bundle['posts']:
+            post_rows.append(dict(
+                post,
+                social_page_id=page_id,
+                engagement_rate=_engagement_rate(post, page['followers_count'])
+            ))
+        if bundle.get('reach'):
+            reach_rows.append(dict(bundle['reach'], social_page_id=page_id, date=day))
+        if bundle['posts'] or bundle.get('reach'):
+            due_page_ids.add(page_id)
+        comments.extend(bundle['comments'])
+        state_rows.append({
+            'social_page_id': page_id,
+            'last_posted_at': _latest(bundle['posts']),
+            'last_comment_at': _latest(bundle['comments']),
+        })
+
+    post_ids = upsert_posts(post_rows)
+    missing = {comment['post_id'] for comment in comments} - set(post_ids)
+    post_ids.update(resolve_post_ids(list(missing)))
+
+    comment_rows = []
+    for comment in comments:
+        post_pk = post_ids.get(comment['post_id'])
+        # posted_at is the partition key; an undated comment has no partition
+        if post_pk and comment['posted_at']:
+            comment_rows.append(dict(comment, post_id=post_pk))
+    upsert_comments(comment_rows)
+
+    upsert_reach(reach_rows)
+
+    # Snapshot pages whose posts changed, plus any page not snapshotted today
+    all_page_ids = set(page_ids.values())
+    due_page_ids |= all_page_ids - pages_with_metrics_for(list(all_page_ids), day)
+    upsert_daily_metrics(list(due_page_ids), day)
+    for row in state_rows:
+        row['last_metrics_date'] = day if row['social_page_id'] in due_page_ids else None
+    upsert_sync_states(state_rows)
+
+    db.session.commit()
+    return {
+        'pages': len(page_ids),
+        'posts': len(post_rows),
+        'comments': len(comment_rows),
+    }
@@ -0,0 +1,92 @@
+"""
+TikTok collector (TikTok API v2, Display API scopes).
+"""
+from app.collectors.base import (
+    parse_timestamp, hashed, page_state, recent_posts, changed_posts, POST_HASH_FIELDS
+)
+
+USER_FIELDS = ('open_id,avatar_url,display_name,bio_description,profile_deep_link,'
+               'follower_count,following_count,likes_count,video_count,username')
+VIDEO_FIELDS = ('id,title,video_description,create_time,cover_image_url,share_url,'
+                'like_count,comment_count,share_count,view_count')
+MAX_COUNT = 20  # Largest page size accepted by /v2/video/list/
+
+
+async def collect(api, account, options):
+    """
+    Collect the token holder's TikTok profile and videos.
+
+    Videos are listed newest first and listing stops at the account's
+    incremental cutoff. Comments are not exposed to Display API scopes
+    (`video.list`), so TikTok bundles never carry comments.
+
+    Args:
+        api: AsyncPlatformSession for tiktok
+        account: dict with user_id, access_token and sync_state
+        options: Collection options (max_pages)
+
+    Returns:
+        list: A single bundle for the account
+    """
+    headers = {'Authorization': f"Bearer {account['access_token']}"}
+
+    body = await api.get_json('/v2/user/info/', params={'fields': USER_FIELDS}, headers=headers)
+    user = (body.get('data') or {}).get('user') or {}
+    username = user.get('username') or user.get('open_id')
+    state = page_state(account, username)
+
+    posts = []
+    cursor, pages = None, 0
+    while True:
+        payload = {'max_count': MAX_COUNT}
+        if cursor:
+            payload['cursor'] = cursor
+        body = await api.post_json(
+            '/v2/video/list/', params={'fields': VIDEO_FIELDS}, json=payload, headers=headers
+        )
+        data = body.get('data') or {}
+        videos = [hashed(_normalize_video(item), POST_HASH_FIELDS) for item in data.get('videos') or []]
+        posts.extend(videos)
+
+        pages += 1
+        if not data.get('has_more') or (options.get('max_pages') and pages >= options['max_pages']):
+            break
+        if state['cutoff'] and videos and all(
+            video['posted_at'] and video['posted_at'] < state['cutoff'] for video in videos
+        ):
+            break
+        cursor = data.get('cursor')
+
+    posts = changed_posts(recent_posts(posts, state), state)
+    return [{
+        'page': {
+            'platform': 'tiktok',
+            'username': username,
+            'full_name': user.get('display_name'),
+            'profile_url': user.get('profile_deep_link'),
+            'profile_image': user.get('avatar_url'),
+            'bio': user.get('bio_description'),
+            'followers_count': user.get('follower_count') or 0,
+            'following_count': user.get('following_count') or 0,
+            'posts_count': user.get('video_count'),
+        },
+        'reach': None,
+        'posts': posts,
+        'comments': [],
+    }]
+
+
+def _normalize_video(item):
+    return {
+        'post_id': item['id'],
+        'platform': 'tiktok',
+        'content': item.get('video_description') or item.get('title'),
+        'post_url': item.get('share_url'),
+        'media_url': item.get('cover_image_url'),
+        'posted_at': parse_timestamp(item.get('create_time')),
+        'content_type': 'video',
+        'likes_count': item.get('like_count') or 0,
+        'comments_count': item.get('comment_count') or 0,
+        'shares_count': item.get('share_count') or 0,
+        'views_count': item.get('view_count') or 0,
+    }
@@ -4,9 +4,10 @@ from flask_cors import CORS
 from flask_migrate import Migrate
 from authlib.integrations.flask_client import OAuth
 from flask_caching import Cache
+from app.utils.db_routing import RoutingSession
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 migrate = Migrate()
 oauth = OAuth()
@@ -14,9 +15,10 @@ cache = Cache()
 
 def init_extensions(app):
     """Initialize all extensions with the app."""
-    # Swagger/OpenAPI (Flasgger)
-    from flasgger import Swagger
-    Swagger(app)
+    # Swagger/OpenAPI (Flasgger); off by default in production to keep startup lean
+    if app.config.get('SWAGGER_ENABLED', True):
+        from flasgger import Swagger
+        Swagger(app)
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
@@ -36,24 +38,55 @@ def init_extensions(app):
     app.config.from_mapping(cache_config)
     cache.init_app(app)
 
+    # Compress large responses
+    from app.utils.compression import init_compression
+    init_compression(app)
+
     # Initialize Redis for JWT blacklist
-    from redis import Redis
-    app.redis = Redis.from_url(app.config.get('REDIS_URL', 'redis://localhost:6379/0'))
-
-    # Initialize Flask-Limiter for rate limiting
-    from flask_limiter import Limiter
-    from flask_limiter.util import get_remote_address
-    limiter = Limiter(
-        get_remote_address,
-        app=app,
-        storage_uri=app.config.get('REDIS_URL', 'redis://localhost:6379/0'),
-        default_limits=["100 per minute"]
-    )
-    app.limiter = limiter
+    from app.utils.instrumentation import InstrumentedRedis
+    app.redis = InstrumentedRedis.from_url(app.config.get('REDIS_URL', 'redis://localhost:6379/0'))
+
+    # Initialize Flask-Limiter for rate limiting (per user, plan-based, with a local fast path)
+    from app.utils.rate_limiting import init_rate_limiting
+    init_rate_limiting(app)
+
+    # Request latency, SQL, cache and Redis metrics on /metrics
+    from app.utils.instrumentation import init_instrumentation
+    init_instrumentation(app, cache)
+
+    # Opt-in N+1 query detection
+    from app.utils.nplusone import init_nplusone
+    init_nplusone(app)
+
+    # Async views on one event loop per process, with pooled async clients
+    from app.utils.async_clients import init_async_views
+    init_async_views(app)
+
+    # Sampling profiler for slow requests
+    from app.utils.profiling import init_profiling
+    init_profiling(app)
 
     # Configure OAuth
     oauth.init_app(app)
     
     # Configure OAuth clients
     from app.services.oauth_service import config_oauth
-    config_oauth(app)
\ No newline at end of file
+    config_oauth(app)
+
+def reset_connections(app):
+    """
+    Drop connections inherited from a parent process.
+
+    Call once in every forked worker (e.g. gunicorn's post_fork with
+    preload_app) so workers never share sockets with the master or with
+    each other.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            # close=False leaves the parent's connections open for the parent
+            engine.dispose(close=False)
+
+    app.redis.connection_pool.reset()
+
+    from app.services.platform_http import reset_platform_clients
+    reset_platform_clients()
@@ -46,4 +46,47 @@ class PlanFeature(db.Model):
     value = db.Column(db.String(100))
     
     def __repr__(self):
-        return f'<PlanFeature {self.feature}>'
\ No newline at end of file
+        return f'<PlanFeature {self.feature}>'
+
+class OrganizationDailyStats(db.Model):
+    """
+    Rollup of social_page_daily_stats over all pages of an organization's members.
+
+    One row per organization, day and platform, kept current by
+    `refresh_organization_stats`, so an organization dashboard reads a few
+    hundred rows no matter how many pages its members manage.
+    """
+    __tablename__ = 'organization_daily_stats'
+    organization_id = db.Column(db.Integer, db.ForeignKey('organization.id', ondelete='CASCADE'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    platform = db.Column(db.String(20), primary_key=True)
+    pages = db.Column(db.Integer, nullable=False)  # Pages with a row on this day
+    followers = db.Column(db.BigInteger)
+    engagement = db.Column(db.Float)  # Average over the pages that reported
+    posts = db.Column(db.BigInteger)
+    likes = db.Column(db.BigInteger)
+    comments = db.Column(db.BigInteger)
+    shares = db.Column(db.BigInteger)
+    views = db.Column(db.BigInteger)
+    impressions = db.Column(db.BigInteger)
+    reach = db.Column(db.BigInteger)
+    engagement_rate = db.Column(db.Float)  # Averages over the pages that reported
+    overall_score = db.Column(db.Float)
+    engagement_score = db.Column(db.Float)
+    reach_score = db.Column(db.Float)
+    growth_score = db.Column(db.Float)
+    
+    def __repr__(self):
+        return f'<OrganizationDailyStats {self.organization_id} {self.platform} on {self.date}>'
+
+
+class OrganizationStatsState(db.Model):
+    """Refresh bookkeeping of an organization's daily stats rollup."""
+    organization_id = db.Column(db.Integer, db.ForeignKey('organization.id', ondelete='CASCADE'), primary_key=True)
+    member_pages = db.Column(db.String(32))  # md5 of the sorted member page ids
+    page_count = db.Column(db.Integer, default=0)
+    stats_through = db.Column(db.DateTime)  # Newest social_page_daily_stats.updated_at rolled up
+    refreshed_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<OrganizationStatsState {self.organization_id} refreshed {self.refreshed_at}>'
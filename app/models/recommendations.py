@@ -4,13 +4,14 @@ from app.extensions import db
 class CalendarPost(db.Model):
     __tablename__ = 'calendar_post'
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'))
     platform = db.Column(db.String(20), nullable=False)
     content_title = db.Column(db.String(255), nullable=False)
     content_type = db.Column(db.String(50))
     date = db.Column(db.Date, nullable=False)
     status = db.Column(db.String(20), default='scheduled')  # scheduled, draft, posted
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.Index('idx_calendar_post_user_date', 'user_id', 'date'),)
 
 class OptimizationTip(db.Model):
     __tablename__ = 'optimization_tip'
@@ -47,7 +48,7 @@ class ContentIdea(db.Model):
 class SavedContentIdea(db.Model):
     __tablename__ = 'saved_content_idea'
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'))
     idea_id = db.Column(db.Integer, db.ForeignKey('content_idea.id', ondelete='CASCADE'), index=True)
     saved_at = db.Column(db.DateTime, default=datetime.utcnow)
     __table_args__ = (db.UniqueConstraint('user_id', 'idea_id', name='uix_user_idea'),)
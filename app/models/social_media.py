@@ -13,7 +13,7 @@ social_page_categories = db.Table('social_page_categories',
 
 class SocialToken(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'))  # Leading column of uix_social_token_user_platform
     platform = db.Column(db.String(20), nullable=False, index=True)
     access_token = db.Column(db.Text, nullable=False)
     refresh_token = db.Column(db.Text)
@@ -38,8 +38,8 @@ class SocialToken(db.Model):
 
 class SocialPage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), nullable=False, index=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), index=True)
+    username = db.Column(db.String(80), nullable=False)  # Leading column of uix_social_page_username_platform
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'))  # Leading column of idx_social_page_user_platform
     full_name = db.Column(db.String(100))
     platform = db.Column(db.String(20), nullable=False, index=True)
     profile_url = db.Column(db.String(1024))
@@ -66,10 +66,14 @@ class SocialPage(db.Model):
                              cascade="all, delete-orphan")
     reachs = db.relationship('SocialPageReach', backref='social_page', lazy='dynamic',
                             cascade="all, delete-orphan")
+    daily_stats = db.relationship('SocialPageDailyStats', backref='social_page', lazy='dynamic',
+                                  passive_deletes=True)
     scores = db.relationship('SocialPageScore', backref='social_page', lazy='dynamic',
                             cascade="all, delete-orphan")
     posts = db.relationship('SocialPagePost', backref='social_page', lazy='dynamic',
                            cascade="all, delete-orphan")
+    sync_state = db.relationship('SocialPageSyncState', backref='social_page', uselist=False,
+                                 cascade="all, delete-orphan")
     
     __table_args__ = (
         UniqueConstraint('username', 'platform', name='uix_social_page_username_platform'),
@@ -80,10 +84,10 @@ class SocialPage(db.Model):
 
 
 class SocialPageMetric(db.Model):
-    """Model for storing historical metrics about social pages."""
-    id = db.Column(db.Integer, primary_key=True)
-    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), index=True)
-    date = db.Column(db.Date, nullable=False, index=True)
+    """Model for storing historical metrics about social pages (partitioned by month on date)."""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'))
+    date = db.Column(db.Date, primary_key=True, index=True)  # Partition key
     followers = db.Column(db.Integer)
     engagement = db.Column(db.Float)
     posts = db.Column(db.Integer)
@@ -95,6 +99,7 @@ class SocialPageMetric(db.Model):
     
     __table_args__ = (
         UniqueConstraint('social_page_id', 'date', name='uix_social_page_metric_page_date'),
+        {'postgresql_partition_by': 'RANGE (date)'},
     )
     
     def __repr__(self):
@@ -102,9 +107,10 @@ class SocialPageMetric(db.Model):
 
 
 class SocialPageEngagement(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), index=True)
-    date = db.Column(db.Date, nullable=False, index=True)
+    """Daily engagement aggregates (partitioned by month on date)."""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'))
+    date = db.Column(db.Date, primary_key=True, index=True)  # Partition key
     posts_count = db.Column(db.Integer, default=0)
     avg_likes_per_post = db.Column(db.Float, default=0.0)
     avg_comments_per_post = db.Column(db.Float, default=0.0)
@@ -122,6 +128,7 @@ class SocialPageEngagement(db.Model):
     
     __table_args__ = (
         UniqueConstraint('social_page_id', 'date', name='uix_social_page_engagement_page_date'),
+        {'postgresql_partition_by': 'RANGE (date)'},
     )
     
     def __repr__(self):
@@ -137,9 +144,9 @@ class SocialPageGrowth(db.Model):
     followers_goal = db.Column(db.Integer, nullable=True)  # Meta de seguidores
     engagement_goal = db.Column(db.Float, nullable=True)   # Meta de engajamento
     deadline = db.Column(db.Date, nullable=True)           # Prazo da meta
-    is_goal = db.Column(db.Boolean, default=False, index=True)  # True: registro de meta, False: histórico
+    is_goal = db.Column(db.Boolean, default=False)  # True: registro de meta, False: histórico
     # --- Para histórico de crescimento ---
-    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), index=True, nullable=True)
+    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), nullable=True)
     date = db.Column(db.Date, nullable=True, index=True)
     followers_count = db.Column(db.Integer, default=0)  # Total followers on this date
     new_followers_daily = db.Column(db.Integer, default=0)  # New followers in the last day
@@ -166,10 +173,10 @@ class SocialPageGrowth(db.Model):
 
 
 class SocialPageReach(db.Model):
-    """Model for tracking reach metrics such as impressions and story views."""
-    id = db.Column(db.Integer, primary_key=True)
-    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), index=True)
-    date = db.Column(db.Date, nullable=False, index=True)
+    """Model for tracking reach metrics such as impressions and story views (partitioned by month on date)."""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'))
+    date = db.Column(db.Date, primary_key=True, index=True)  # Partition key
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     impressions = db.Column(db.Integer, default=0)  # Number of times content was displayed
     reach = db.Column(db.Integer, default=0)  # Number of unique accounts that saw the content
@@ -186,6 +193,7 @@ class SocialPageReach(db.Model):
     
     __table_args__ = (
         UniqueConstraint('social_page_id', 'date', name='uix_social_page_reach_page_date'),
+        {'postgresql_partition_by': 'RANGE (date)'},
     )
     
     def __repr__(self):
@@ -194,7 +202,7 @@ class SocialPageReach(db.Model):
 
 class SocialPageScore(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), index=True)
+    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'))
     date = db.Column(db.Date, nullable=False, index=True)
     overall_score = db.Column(db.Float, default=0.0)
     engagement_score = db.Column(db.Float, default=0.0)  # Based on engagement metrics
@@ -222,7 +230,7 @@ class SocialPagePost(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     platform = db.Column(db.String(20), nullable=False, index=True)
     post_id = db.Column(db.String(100), nullable=False, unique=True, index=True)
-    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), index=True)
+    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'))
     content = db.Column(db.Text)
     post_url = db.Column(db.Text)
     media_url = db.Column(db.Text)
@@ -234,6 +242,7 @@ class SocialPagePost(db.Model):
     shares_count = db.Column(db.Integer, default=0)
     views_count = db.Column(db.Integer, default=0)
     engagement_rate = db.Column(db.Float, default=0.0)  # Calculated engagement rate
+    content_hash = db.Column(db.String(40))  # Hash of collected fields, skips unchanged rewrites
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -264,31 +273,94 @@ class SocialPagePost(db.Model):
 
 
 class SocialPagePostComment(db.Model):
-    """Model for storing comments on social media posts."""
-    id = db.Column(db.Integer, primary_key=True)
+    """Model for storing comments on social media posts (partitioned by month on posted_at)."""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     post_id = db.Column(db.Integer, db.ForeignKey('social_page_post.id', ondelete='CASCADE'), nullable=False, index=True)
     platform = db.Column(db.String(20), nullable=False, index=True)
-    comment_id = db.Column(db.String(100), nullable=False, unique=True, index=True)
+    comment_id = db.Column(db.String(100), nullable=False, index=True)
     author_username = db.Column(db.String(100), index=True)
     author_display_name = db.Column(db.String(100))
     author_picture = db.Column(db.String(255))
     content = db.Column(db.Text, nullable=False)
-    posted_at = db.Column(db.DateTime, index=True)
+    posted_at = db.Column(db.DateTime, primary_key=True, index=True)  # Partition key
     likes_count = db.Column(db.Integer, default=0)
     replied_to_id = db.Column(db.String(100), index=True)  # ID of parent comment if this is a reply
     
     # Sentiment analysis data
     sentiment = db.Column(db.String(10), index=True)  # positive, neutral, negative
     sentiment_score = db.Column(db.Float)  # -1.0 to 1.0
-    is_critical = db.Column(db.Boolean, default=False, index=True)  # Flag for critical comments
+    is_critical = db.Column(db.Boolean, default=False)  # Flag for critical comments
     
+    content_hash = db.Column(db.String(40))  # Hash of collected fields, skips unchanged rewrites
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Unique constraints on a partitioned table must include the partition key
+        UniqueConstraint('comment_id', 'posted_at', name='uix_social_page_post_comment_comment_posted'),
+        {'postgresql_partition_by': 'RANGE (posted_at)'},
+    )
+    
     def __repr__(self):
         return f'<SocialPagePostComment {self.platform}:{self.comment_id}>'
     
 
+class SocialPageDailyStats(db.Model):
+    """
+    One wide row per page and day with every dashboard column.
+
+    Maintained by database triggers on social_page_metric, social_page_engagement,
+    social_page_reach and social_page_score, so a period query is a single
+    range scan of the (social_page_id, date) primary key. Partitioned by month on date.
+    """
+    __tablename__ = 'social_page_daily_stats'
+    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)  # Partition key
+    # From social_page_metric
+    followers = db.Column(db.Integer)
+    engagement = db.Column(db.Float)
+    posts = db.Column(db.Integer)
+    likes = db.Column(db.Integer)
+    comments = db.Column(db.Integer)
+    shares = db.Column(db.Integer)
+    views = db.Column(db.Integer)
+    # From social_page_engagement
+    engagement_rate = db.Column(db.Float)
+    growth_rate = db.Column(db.Float)
+    # From social_page_reach
+    impressions = db.Column(db.Integer)
+    reach = db.Column(db.Integer)
+    profile_views = db.Column(db.Integer)
+    # From social_page_score
+    overall_score = db.Column(db.Float)
+    engagement_score = db.Column(db.Float)
+    reach_score = db.Column(db.Float)
+    growth_score = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        {'postgresql_partition_by': 'RANGE (date)'},
+    )
+    
+    def __repr__(self):
+        return f'<SocialPageDailyStats {self.social_page_id} on {self.date}>'
+
+
+class SocialPageSyncState(db.Model):
+    """High-water marks for incremental collection of a social page."""
+    id = db.Column(db.Integer, primary_key=True)
+    social_page_id = db.Column(db.Integer, db.ForeignKey('social_page.id', ondelete='CASCADE'), nullable=False, unique=True)
+    last_posted_at = db.Column(db.DateTime)  # Newest post seen
+    last_comment_at = db.Column(db.DateTime)  # Newest comment seen, time cursor for comment fetches
+    last_metrics_date = db.Column(db.Date)  # Last day insights were collected
+    last_synced_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SocialPageSyncState {self.social_page_id} synced {self.last_synced_at}>'
+
+
 class SocialPageCategory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False, unique=True, index=True)
@@ -298,7 +370,11 @@ class SocialPageCategory(db.Model):
         return f'<SocialPageCategory {self.name}>'
 
 # Create indexes for common queries
-Index('idx_social_token_user_platform', SocialToken.user_id, SocialToken.platform)
 Index('idx_social_page_user_platform', SocialPage.user_id, SocialPage.platform)
-Index('idx_social_page_metrics_date', SocialPageMetric.social_page_id, SocialPageMetric.date)
-Index('idx_social_page_post_page_date', SocialPagePost.social_page_id, SocialPagePost.posted_at)
+# Latest posts of a page, and per-page totals answered from the index alone
+Index('idx_social_page_post_page_date_covering', SocialPagePost.social_page_id, SocialPagePost.posted_at.desc(),
+      postgresql_include=['likes_count', 'comments_count', 'shares_count', 'views_count', 'engagement_rate'])
+Index('idx_social_page_growth_user_goals', SocialPageGrowth.user_id,
+      postgresql_where=SocialPageGrowth.is_goal)
+Index('idx_social_page_post_comment_critical', SocialPagePostComment.post_id, SocialPagePostComment.posted_at.desc(),
+      postgresql_where=SocialPagePostComment.is_critical)
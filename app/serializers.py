@@ -0,0 +1,84 @@
+"""
+Shared response serializers for API models.
+
+Serializers return plain dicts and leave dates as date/datetime objects:
+the app's JSON provider writes them as ISO 8601 in the same pass that
+encodes the rest of the response.
+"""
+
+
+def _split(value, separator=','):
+    return value.split(separator) if value else []
+
+
+def serialize_pagination(pagination, page, per_page):
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": pagination.total,
+        "total_pages": pagination.pages
+    }
+
+
+def serialize_social_page(page):
+    return {
+        "id": page.id,
+        "platform": page.platform,
+        "username": page.username,
+        "profileUrl": page.profile_url,
+        "profilePicture": page.profile_image,
+        "followers": page.followers_count,
+        "following": page.following_count,
+        "postsCount": page.posts_count,
+        "isConnected": True,
+        "connectedAt": page.created_at
+    }
+
+
+def serialize_content_idea(idea, is_saved=False):
+    return {
+        "id": idea.id,
+        "title": idea.title,
+        "description": idea.description,
+        "platforms": _split(idea.platforms),
+        "contentType": idea.content_type,
+        "tags": _split(idea.tags),
+        "estimatedEngagement": idea.estimated_engagement,
+        "createdAt": idea.created_at,
+        "isSaved": is_saved
+    }
+
+
+def serialize_calendar_post(post):
+    return {
+        "id": post.id,
+        "date": post.date,
+        "platform": post.platform,
+        "contentTitle": post.content_title,
+        "contentType": post.content_type,
+        "status": post.status
+    }
+
+
+def serialize_optimization_tip(tip):
+    return {
+        "id": tip.id,
+        "platform": tip.platform,
+        "title": tip.title,
+        "description": tip.description,
+        "impact": tip.impact,
+        "bestPractices": _split(tip.best_practices, ';')
+    }
+
+
+def serialize_trend(trend):
+    return {
+        "id": trend.id,
+        "title": trend.title,
+        "description": trend.description,
+        "popularity": trend.popularity,
+        "platforms": _split(trend.platforms),
+        "hashtags": _split(trend.hashtags),
+        "relatedTopics": _split(trend.related_topics),
+        "createdAt": trend.created_at
+    }
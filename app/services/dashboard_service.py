@@ -0,0 +1,183 @@
+"""
+Dashboard aggregates read from the consolidated daily stats table.
+"""
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.social_media import SocialPage, SocialPageDailyStats
+
+BASIC_METRICS_FIELDS = ('platforms', 'engagementTimeseries', 'socialScore')
+BASIC_METRICS_INCLUDES = ('scoreHistory',)
+LATEST_COLUMNS = ('followers', 'reach', 'overall_score')
+
+
+def _latest(rows, column):
+    """Most recent row of a page with `column` recorded."""
+    for row in reversed(rows):
+        if getattr(row, column) is not None:
+            return row
+    return None
+
+
+def _pages_stmt(user_id):
+    return select(SocialPage).where(SocialPage.user_id == user_id)
+
+
+def _user_stats(user_id):
+    return select(SocialPageDailyStats).join(
+        SocialPage, SocialPage.id == SocialPageDailyStats.social_page_id
+    ).where(SocialPage.user_id == user_id)
+
+
+def _history_stmt(user_id):
+    """All daily rows of a user's pages, one range scan of the primary key per page."""
+    return _user_stats(user_id).order_by(SocialPageDailyStats.social_page_id, SocialPageDailyStats.date)
+
+
+def _latest_stmt(user_id, column):
+    """Most recent row with `column` recorded for each page, via DISTINCT ON over the primary key."""
+    return _user_stats(user_id).where(
+        getattr(SocialPageDailyStats, column).isnot(None)
+    ).distinct(SocialPageDailyStats.social_page_id).order_by(
+        SocialPageDailyStats.social_page_id, SocialPageDailyStats.date.desc()
+    )
+
+
+def _plan(fields, include):
+    """Which queries a request needs: (with_history, read_history, latest_columns)."""
+    with_history = 'socialScore' in fields and 'scoreHistory' in include
+    read_history = 'engagementTimeseries' in fields or with_history
+    columns = []
+    if not read_history:
+        if 'platforms' in fields:
+            columns.extend(['followers', 'reach'])
+        if 'socialScore' in fields:
+            columns.append('overall_score')
+    return with_history, read_history, columns
+
+
+def _assemble(pages, history, latest_rows, fields, with_history):
+    """Build the response blocks from pages, history rows and/or latest rows per column."""
+    stats = defaultdict(list)
+    for row in history:
+        stats[row.social_page_id].append(row)
+    if history:
+        latest = {
+            column: {page.id: _latest(stats[page.id], column) for page in pages}
+            for column in LATEST_COLUMNS
+        }
+    else:
+        latest = {
+            column: {row.social_page_id: row for row in rows}
+            for column, rows in latest_rows.items()
+        }
+
+    result = {}
+    if 'platforms' in fields:
+        result['platforms'] = []
+        for page in pages:
+            metric = latest.get('followers', {}).get(page.id)
+            reach = latest.get('reach', {}).get(page.id)
+            result['platforms'].append({
+                "platform": page.platform,
+                "followers": metric.followers if metric else 0,
+                "engagement": metric.engagement if metric else 0,
+                "impressions": reach.impressions if reach else 0,
+                "reach": reach.reach if reach else 0,
+                "growth": 0
+            })
+
+    if 'engagementTimeseries' in fields:
+        result['engagementTimeseries'] = [
+            {"date": row.date, "value": row.engagement}
+            for page in pages for row in stats[page.id] if row.followers is not None
+        ]
+
+    if 'socialScore' in fields:
+        social_score = {
+            "overall": 0,
+            "submetrics": {"engagement": 0, "reach": 0, "growth": 0},
+        }
+        if with_history:
+            social_score["history"] = []
+        for page in pages:
+            score = latest.get('overall_score', {}).get(page.id)
+            if score:
+                social_score["overall"] = score.overall_score
+                social_score["submetrics"] = {
+                    "engagement": score.engagement_score,
+                    "reach": score.reach_score,
+                    "growth": score.growth_score
+                }
+                if with_history:
+                    social_score["history"] = [
+                        {"date": row.date, "score": row.overall_score}
+                        for row in stats[page.id] if row.overall_score is not None
+                    ]
+        result['socialScore'] = social_score
+
+    return result
+
+
+def get_basic_metrics(user_id, fields=BASIC_METRICS_FIELDS, include=BASIC_METRICS_INCLUDES):
+    """
+    Latest per-platform metrics, engagement timeseries and social score of a user's pages.
+
+    All daily rows of the user's pages are read in one range scan of the
+    social_page_daily_stats primary key, instead of separate latest/history
+    queries against the metric and score tables for every page. When
+    neither the timeseries nor the score history is requested, only the
+    latest row per page is read.
+
+    Args:
+        user_id: Owner of the pages
+        fields: Blocks to build, out of BASIC_METRICS_FIELDS
+        include: Optional parts, out of BASIC_METRICS_INCLUDES
+
+    Returns:
+        dict: The requested blocks, keyed by field name
+    """
+    if not fields:
+        return {}
+    with_history, read_history, columns = _plan(fields, include)
+    pages = db.session.execute(_pages_stmt(user_id)).scalars().all()
+    history, latest_rows = [], {}
+    if pages and read_history:
+        history = db.session.execute(_history_stmt(user_id)).scalars().all()
+    elif pages:
+        latest_rows = {
+            column: db.session.execute(_latest_stmt(user_id, column)).scalars().all()
+            for column in columns
+        }
+    return _assemble(pages, history, latest_rows, fields, with_history)
+
+
+async def get_basic_metrics_async(user_id, fields=BASIC_METRICS_FIELDS, include=BASIC_METRICS_INCLUDES):
+    """
+    Async variant of `get_basic_metrics` for async views.
+
+    The pages, history and latest-per-column queries are independent (each
+    joins on the page owner), so they run concurrently on separate
+    connections.
+    """
+    from app.utils.async_clients import gather_queries
+
+    if not fields:
+        return {}
+    with_history, read_history, columns = _plan(fields, include)
+
+    def scalars(stmt):
+        async def query(session):
+            return (await session.execute(stmt)).scalars().all()
+        return query
+
+    queries = [scalars(_pages_stmt(user_id))]
+    if read_history:
+        queries.append(scalars(_history_stmt(user_id)))
+    queries.extend(scalars(_latest_stmt(user_id, column)) for column in columns)
+
+    pages, *rest = await gather_queries(*queries)
+    history = rest.pop(0) if read_history else []
+    return _assemble(pages, history, dict(zip(columns, rest)), fields, with_history)
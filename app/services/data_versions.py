@@ -0,0 +1,62 @@
+"""
+Cheap data versions backing the ETags of polled endpoints.
+
+Each function answers "has anything behind this response changed?" with
+indexed MAX/COUNT lookups and table version counters, at a fraction of the
+cost of running the endpoint's own queries.
+"""
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models.recommendations import CalendarPost, ContentIdea, OptimizationTip, SavedContentIdea, Trend
+from app.models.social_media import SocialPage, SocialPageDailyStats
+from app.utils.async_clients import gather_queries
+from app.utils.conditional import table_version
+
+
+def content_ideas_version(user_id):
+    """Catalog of ideas plus the user's saved ideas."""
+    ideas = db.session.query(func.max(ContentIdea.id), func.count(ContentIdea.id)).one()
+    saved = db.session.query(func.max(SavedContentIdea.id), func.count(SavedContentIdea.id)).filter(
+        SavedContentIdea.user_id == user_id
+    ).one()
+    return (table_version('content_idea'), *ideas, *saved)
+
+
+def calendar_version(user_id):
+    return tuple(db.session.query(func.max(CalendarPost.id), func.count(CalendarPost.id)).filter(
+        CalendarPost.user_id == user_id
+    ).one())
+
+
+def optimization_tips_version(user_id):
+    tips = db.session.query(func.max(OptimizationTip.id), func.count(OptimizationTip.id)).one()
+    return (table_version('optimization_tip'), *tips)
+
+
+def trends_version(user_id):
+    trends = db.session.query(func.max(Trend.id), func.count(Trend.id)).one()
+    return (table_version('trend'), *trends)
+
+
+async def analytics_version(user_id):
+    """
+    Latest daily stats write and latest page change of the user's pages.
+
+    Async, for the async analytics views: both lookups run concurrently on
+    the async pool.
+    """
+    async def pages(session):
+        return tuple((await session.execute(
+            select(func.max(SocialPage.updated_at), func.count(SocialPage.id)).where(SocialPage.user_id == user_id)
+        )).one())
+
+    async def stats_updated_at(session):
+        return (await session.execute(
+            select(func.max(SocialPageDailyStats.updated_at)).join(
+                SocialPage, SocialPage.id == SocialPageDailyStats.social_page_id
+            ).where(SocialPage.user_id == user_id)
+        )).scalar()
+
+    page_version, stats_version = await gather_queries(pages, stats_updated_at)
+    return (*page_version, stats_version)
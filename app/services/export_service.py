@@ -0,0 +1,323 @@
+"""
+Columnar (Parquet) export of organization page history for offline analytics.
+
+Each dataset is streamed from the database in chunks and written as a
+Hive-partitioned Parquet dataset:
+
+    <EXPORT_DIR>/organization_<id>/<job_id>/<dataset>/month=YYYY-MM/part-*.parquet
+
+so readers such as pyarrow.dataset, pandas, DuckDB or Spark prune whole
+months from a `month` filter and skip row groups by column statistics.
+
+Exports run outside the request cycle: the API enqueues a job in Redis and
+`flask export worker` executes it. A finished job lists its files relative
+to its root; clients download them through the API, never by server path.
+
+A job's files are kept as long as its status, EXPORT_JOB_TTL seconds from
+enqueueing: `cleanup_exports` deletes job directories whose job has
+expired and that are older than the TTL (so exports run directly with
+`flask export parquet`, which have no job, are kept as long). The worker
+sweeps every EXPORT_CLEANUP_INTERVAL seconds; `flask export cleanup` runs
+one sweep.
+"""
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, func, select
+
+from app.extensions import db
+from app.models.organization import Organization
+from app.models.social_media import SocialPage, SocialPageMetric, SocialPagePost, SocialPagePostComment
+from app.utils.db_routing import REPLICA_BIND, replica_available
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DATASETS = ('metrics', 'posts', 'comments')
+EXPORT_QUEUE = 'export:queue'
+
+
+def _job_key(job_id):
+    return f"export:job:{job_id}"
+
+
+def export_root(organization_id, job_id):
+    """Directory an export job writes to."""
+    return os.path.join(os.path.abspath(current_app.config['EXPORT_DIR']), f"organization_{organization_id}", job_id)
+
+
+def _list_files(root):
+    return sorted(
+        os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/')
+        for directory, _, names in os.walk(root) for name in names
+    )
+
+
+def cleanup_exports():
+    """
+    Delete the directories of expired export jobs.
+
+    Returns:
+        int: Job directories deleted
+    """
+    base = os.path.abspath(current_app.config['EXPORT_DIR'])
+    if not os.path.isdir(base):
+        return 0
+
+    redis = current_app.redis
+    expired_before = time.time() - current_app.config['EXPORT_JOB_TTL']
+    deleted = 0
+    for organization_dir in os.scandir(base):
+        if not organization_dir.is_dir() or not organization_dir.name.startswith('organization_'):
+            continue
+        for job_dir in os.scandir(organization_dir.path):
+            if not job_dir.is_dir() or redis.exists(_job_key(job_dir.name)):
+                continue
+            if job_dir.stat().st_mtime >= expired_before:
+                continue
+            shutil.rmtree(job_dir.path, ignore_errors=True)
+            deleted += 1
+            logger.info(f"Deleted expired export {job_dir.path}")
+        if not os.listdir(organization_dir.path):
+            os.rmdir(organization_dir.path)
+    return deleted
+
+
+def _month(column):
+    return func.coalesce(func.to_char(column, 'YYYY-MM'), 'unknown').label('month')
+
+
+def posts_query(user_ids):
+    """SELECT of the exported post columns of the pages of `user_ids`, oldest first."""
+    return select(
+        SocialPagePost.id, SocialPagePost.post_id, SocialPagePost.social_page_id,
+        SocialPage.username, SocialPagePost.platform, SocialPagePost.content,
+        SocialPagePost.post_url, SocialPagePost.posted_at, SocialPagePost.content_type,
+        SocialPagePost.category, SocialPagePost.likes_count, SocialPagePost.comments_count,
+        SocialPagePost.shares_count, SocialPagePost.views_count, SocialPagePost.engagement_rate
+    ).join(SocialPage, SocialPage.id == SocialPagePost.social_page_id).where(
+        SocialPage.user_id.in_(user_ids)
+    ).order_by(SocialPagePost.posted_at)
+
+
+def comments_query(user_ids):
+    """SELECT of the exported comment columns on posts of the pages of `user_ids`, oldest first."""
+    return select(
+        SocialPagePostComment.id, SocialPagePostComment.comment_id,
+        SocialPagePostComment.post_id, SocialPagePost.social_page_id,
+        SocialPagePostComment.platform, SocialPagePostComment.author_username,
+        SocialPagePostComment.content, SocialPagePostComment.posted_at,
+        SocialPagePostComment.likes_count, SocialPagePostComment.replied_to_id,
+        SocialPagePostComment.sentiment, SocialPagePostComment.sentiment_score,
+        SocialPagePostComment.is_critical
+    ).join(SocialPagePost, SocialPagePost.id == SocialPagePostComment.post_id).join(
+        SocialPage, SocialPage.id == SocialPagePost.social_page_id
+    ).where(SocialPage.user_id.in_(user_ids)).order_by(SocialPagePostComment.posted_at)
+
+
+def dataset_query(dataset, user_ids):
+    """
+    SELECT for one export dataset, restricted to the pages of `user_ids`.
+
+    Every query carries a `month` column used as the partition key.
+    """
+    if dataset == 'metrics':
+        return select(
+            SocialPageMetric.social_page_id, SocialPage.platform, SocialPage.username,
+            SocialPageMetric.date, SocialPageMetric.followers, SocialPageMetric.engagement,
+            SocialPageMetric.posts, SocialPageMetric.likes, SocialPageMetric.comments,
+            SocialPageMetric.shares, SocialPageMetric.views, _month(SocialPageMetric.date)
+        ).join(SocialPage, SocialPage.id == SocialPageMetric.social_page_id).where(
+            SocialPage.user_id.in_(user_ids)
+        ).order_by(SocialPageMetric.date)
+
+    if dataset == 'posts':
+        return posts_query(user_ids).add_columns(_month(SocialPagePost.posted_at))
+
+    if dataset == 'comments':
+        return comments_query(user_ids).add_columns(_month(SocialPagePostComment.posted_at))
+
+    raise ValueError(f"Unknown export dataset: {dataset}")
+
+
+def arrow_schema(stmt):
+    """Arrow schema of a SELECT, so every chunk is written with the same column types."""
+    import pyarrow as pa
+
+    fields = []
+    for column in stmt.selected_columns:
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp('us')
+        elif isinstance(column.type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def write_parquet_dataset(stmt, path, chunk_size):
+    """
+    Stream a SELECT into a month-partitioned Parquet dataset.
+
+    Rows are fetched through a server-side cursor `chunk_size` at a time,
+    so memory is bounded by one chunk whatever the table size.
+
+    Returns:
+        int: Rows written
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(stmt)
+    engine = db.engines[REPLICA_BIND] if replica_available() else db.engine
+    rows = 0
+
+    with engine.connect() as connection:
+        connection = connection.execution_options(stream_results=True, max_row_buffer=chunk_size)
+        for index, frame in enumerate(pd.read_sql(stmt, connection, chunksize=chunk_size)):
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            pq.write_to_dataset(
+                table, root_path=path, partition_cols=['month'],
+                basename_template=f"part-{index:05d}-{{i}}.parquet"
+            )
+            rows += len(frame)
+    return rows
+
+
+def export_organization(organization_id, job_id=None, datasets=EXPORT_DATASETS, chunk_size=None):
+    """
+    Export an organization's page metrics, posts and comments to Parquet.
+
+    Args:
+        organization_id: Organization whose members' pages are exported
+        job_id: Output directory name (defaults to a timestamp)
+        datasets: Datasets to export
+        chunk_size: Rows per fetched and written chunk (defaults to EXPORT_CHUNK_SIZE)
+
+    Returns:
+        dict: Export root path, rows written per dataset and the written
+            files relative to the root
+    """
+    organization = Organization.query.get(organization_id)
+    if not organization:
+        raise ValueError(f"Organization {organization_id} not found")
+
+    chunk_size = chunk_size or current_app.config['EXPORT_CHUNK_SIZE']
+    job_id = job_id or datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+    root = export_root(organization_id, job_id)
+    user_ids = [user.id for user in organization.users]
+
+    rows = {}
+    for dataset in datasets:
+        rows[dataset] = write_parquet_dataset(dataset_query(dataset, user_ids), os.path.join(root, dataset), chunk_size)
+        logger.info(f"Exported {rows[dataset]} {dataset} rows of organization {organization_id} to {root}")
+    return {'path': root, 'rows': rows, 'files': _list_files(root)}
+
+
+def enqueue_export(organization_id, requested_by):
+    """
+    Queue a Parquet export of an organization.
+
+    Returns:
+        str: Job id
+    """
+    redis = current_app.redis
+    job_id = uuid.uuid4().hex
+    redis.hset(_job_key(job_id), mapping={
+        'status': 'queued',
+        'organization_id': organization_id,
+        'requested_by': requested_by,
+        'created_at': datetime.utcnow().isoformat(),
+    })
+    redis.expire(_job_key(job_id), current_app.config['EXPORT_JOB_TTL'])
+    redis.rpush(EXPORT_QUEUE, job_id)
+    return job_id
+
+
+def get_export_job(job_id):
+    """Status of an export job, or None if unknown or expired."""
+    job = current_app.redis.hgetall(_job_key(job_id))
+    if not job:
+        return None
+    job = {key.decode(): value.decode() for key, value in job.items()}
+    job['id'] = job_id
+    job['organization_id'] = int(job['organization_id'])
+    job['requested_by'] = int(job['requested_by'])
+    for key in ('rows', 'files'):
+        if key in job:
+            job[key] = json.loads(job[key])
+    return job
+
+
+def run_export_job(job_id):
+    """Execute a queued export job and record its outcome."""
+    redis = current_app.redis
+    job = get_export_job(job_id)
+    if not job:
+        logger.warning(f"Export job {job_id} expired before it ran")
+        return
+
+    redis.hset(_job_key(job_id), mapping={'status': 'running', 'started_at': datetime.utcnow().isoformat()})
+    try:
+        result = export_organization(job['organization_id'], job_id=job_id)
+        redis.hset(_job_key(job_id), mapping={
+            'status': 'done',
+            'rows': json.dumps(result['rows']),
+            'files': json.dumps(result['files']),
+            'finished_at': datetime.utcnow().isoformat(),
+        })
+    except Exception as e:
+        logger.error(f"Export job {job_id} failed: {str(e)}", exc_info=True)
+        redis.hset(_job_key(job_id), mapping={
+            'status': 'failed', 'error': str(e), 'finished_at': datetime.utcnow().isoformat()
+        })
+
+
+def run_export_worker(app, max_jobs=None, poll_timeout=5):
+    """
+    Process queued export jobs until stopped.
+
+    Intended for a dedicated worker process (see `flask export worker`).
+    Expired job directories are swept at start and every
+    EXPORT_CLEANUP_INTERVAL seconds.
+
+    Args:
+        app: Flask application
+        max_jobs: Stop after this many jobs (None runs forever)
+        poll_timeout: Seconds to block waiting for a job
+    """
+    jobs = 0
+    next_cleanup = 0
+    while max_jobs is None or jobs < max_jobs:
+        if time.monotonic() >= next_cleanup:
+            with app.app_context():
+                try:
+                    cleanup_exports()
+                except Exception as e:
+                    logger.error(f"Export cleanup failed: {str(e)}", exc_info=True)
+            next_cleanup = time.monotonic() + app.config['EXPORT_CLEANUP_INTERVAL']
+        item = app.redis.blpop(EXPORT_QUEUE, timeout=poll_timeout)
+        if item is None:
+            continue
+        job_id = item[1].decode()
+        started = time.monotonic()
+        with app.app_context():
+            try:
+                run_export_job(job_id)
+            finally:
+                db.session.remove()
+        logger.info(f"Export job {job_id} finished in {time.monotonic() - started:.1f}s")
+        jobs += 1
@@ -1,11 +1,12 @@
 """
 OAuth service for social media platform integrations.
 """
-import requests
+import json
 import logging
 from datetime import datetime, timedelta
 from flask import current_app
 from app.extensions import oauth
+from app.services.platform_http import get_platform_client
 
 logger = logging.getLogger(__name__)
 
@@ -89,64 +90,142 @@ def config_oauth(app):
     logger.info(f"Registered OAuth clients: {list(oauth._registry.keys())}")
 
 
-def save_token(user_id, platform, token_data):
+def _token_cache_key(user_id, platform):
+    """Redis key of a user's cached platform token."""
+    return f"social_token:{user_id}:{platform}"
+
+
+def cache_token(user_id, platform, encrypted_token, expires_at):
     """
-    Save OAuth tokens securely in the database.
+    Keep a token in Redis, shared by web workers and the refresh scheduler.
+    
+    The access token is stored encrypted, as in the database; readers only
+    skip the query. The entry never outlives the token itself, so a cached
+    value is always usable as-is by the caller.
+    """
+    timeout = current_app.config.get('SOCIAL_TOKEN_CACHE_TTL', 300)
+    if expires_at:
+        remaining = int((expires_at - datetime.utcnow()).total_seconds())
+        if remaining <= 0:
+            return
+        timeout = min(timeout, remaining)
+    
+    try:
+        current_app.redis.set(_token_cache_key(user_id, platform), json.dumps({
+            'access_token': encrypted_token,
+            'expires_at': expires_at.isoformat() if expires_at else None
+        }), ex=timeout)
+    except Exception as e:
+        logger.warning(f"Could not cache {platform} token of user {user_id}: {str(e)}")
+
+
+def _cached_token(user_id, platform):
+    from app.services.security_service import decrypt_token
+    
+    try:
+        raw = current_app.redis.get(_token_cache_key(user_id, platform))
+    except Exception as e:
+        logger.warning(f"Could not read cached {platform} token of user {user_id}: {str(e)}")
+        return None
+    if not raw:
+        return None
+    data = json.loads(raw)
+    return {
+        'access_token': decrypt_token(data['access_token']),
+        'expires_at': datetime.fromisoformat(data['expires_at']) if data['expires_at'] else None
+    }
+
+
+def invalidate_cached_token(user_id, platform):
+    """Drop a cached token, e.g. after the account is disconnected or a refresh failed."""
+    try:
+        current_app.redis.delete(_token_cache_key(user_id, platform))
+    except Exception as e:
+        logger.warning(f"Could not drop cached {platform} token of user {user_id}: {str(e)}")
+
+
+def delete_token(user_id, platform):
+    """
+    Disconnect a platform: delete the user's stored token and its cache entry.
+    
+    Returns:
+        bool: Whether a token was stored
+    """
+    from app.extensions import db
+    from app.models.social_media import SocialToken
+    
+    deleted = SocialToken.query.filter_by(user_id=user_id, platform=platform).delete()
+    db.session.commit()
+    invalidate_cached_token(user_id, platform)
+    return bool(deleted)
+
+
+def apply_token_data(token, token_data):
+    """
+    Copy OAuth token data onto a SocialToken row, encrypting secrets.
     
     Args:
-        user_id: User ID to associate the token with
-        platform: Platform name (instagram, facebook, tiktok)
+        token: SocialToken instance to update
         token_data: Token data from OAuth provider
     """
-    from app.extensions import db
-    from app.models import SocialToken
     from app.services.security_service import encrypt_token
     
-    # Encrypt sensitive token data before storing
-    encrypted_access_token = encrypt_token(token_data['access_token'])
+    token.access_token = encrypt_token(token_data['access_token'])
     
     # Handle refresh token if available
-    refresh_token = None
     if 'refresh_token' in token_data and token_data['refresh_token']:
-        refresh_token = encrypt_token(token_data['refresh_token'])
+        token.refresh_token = encrypt_token(token_data['refresh_token'])
     
     # Calculate expiration time if available
-    expires_at = None
     if 'expires_in' in token_data and token_data['expires_in']:
-        expires_at = datetime.utcnow() + timedelta(seconds=token_data['expires_in'])
+        token.expires_at = datetime.utcnow() + timedelta(seconds=int(token_data['expires_in']))
+    
+    token.updated_at = datetime.utcnow()
+
+
+def save_token(user_id, platform, token_data):
+    """
+    Save OAuth tokens securely in the database.
+    
+    Args:
+        user_id: User ID to associate the token with
+        platform: Platform name (instagram, facebook, tiktok)
+        token_data: Token data from OAuth provider
+        
+    Returns:
+        SocialToken: The stored token row
+    """
+    from app.extensions import db
+    from app.models.social_media import SocialToken
     
     # Check if token for this platform already exists
-    existing_token = SocialToken.query.filter_by(
+    token = SocialToken.query.filter_by(
         user_id=user_id,
         platform=platform
     ).first()
     
-    if existing_token:
-        # Update existing token
-        existing_token.access_token = encrypted_access_token
-        if refresh_token:
-            existing_token.refresh_token = refresh_token
-        if expires_at:
-            existing_token.expires_at = expires_at
-        existing_token.updated_at = datetime.utcnow()
-    else:
+    if not token:
         # Create new token record
-        new_token = SocialToken(
-            user_id=user_id,
-            platform=platform,
-            access_token=encrypted_access_token,
-            refresh_token=refresh_token,
-            expires_at=expires_at
-        )
-        db.session.add(new_token)
+        token = SocialToken(user_id=user_id, platform=platform)
+        db.session.add(token)
     
+    apply_token_data(token, token_data)
+    encrypted_token, expires_at = token.access_token, token.expires_at
     db.session.commit()
+    
+    cache_token(user_id, platform, encrypted_token, expires_at)
+    return token
 
 
 def get_token(user_id, platform):
     """
     Retrieve a user's token for a specific platform.
     
+    Tokens are served from a short-lived Redis cache. Tokens close
+    to expiry are refreshed ahead of time by the token refresh scheduler
+    (see token_refresh_service); refreshing inline here is only a fallback
+    for tokens that already expired.
+    
     Args:
         user_id: User ID
         platform: Platform name
@@ -154,9 +233,13 @@ def get_token(user_id, platform):
     Returns:
         dict: Token data or None if not found
     """
-    from app.models import SocialToken
+    from app.models.social_media import SocialToken
     from app.services.security_service import decrypt_token
     
+    cached = _cached_token(user_id, platform)
+    if cached:
+        return cached
+    
     token = SocialToken.query.filter_by(
         user_id=user_id,
         platform=platform
@@ -172,17 +255,26 @@ def get_token(user_id, platform):
             refreshed_token = refresh_social_token(platform, decrypt_token(token.refresh_token))
             if refreshed_token:
                 # Update with new token data
-                save_token(user_id, platform, refreshed_token)
+                token = save_token(user_id, platform, refreshed_token)
                 return {
                     'access_token': refreshed_token['access_token'],
                     'expires_at': token.expires_at
                 }
         except Exception as e:
             current_app.logger.error(f"Error refreshing {platform} token: {str(e)}")
+        # Expired and not refreshed: never serve it from the cache
+        invalidate_cached_token(user_id, platform)
+        return {
+            'access_token': decrypt_token(token.access_token),
+            'expires_at': token.expires_at
+        }
+    
+    access_token = decrypt_token(token.access_token)
+    cache_token(user_id, platform, token.access_token, token.expires_at)
     
     # Return decrypted token
     return {
-        'access_token': decrypt_token(token.access_token),
+        'access_token': access_token,
         'expires_at': token.expires_at
     }
 
@@ -200,8 +292,8 @@ def refresh_social_token(platform, refresh_token):
     """
     if platform == 'instagram' or platform == 'facebook':
         # Facebook and Instagram use the same token refresh mechanism
-        response = requests.get(
-            'https://graph.facebook.com/v16.0/oauth/access_token',
+        response = get_platform_client(platform).get(
+            '/v16.0/oauth/access_token',
             params={
                 'grant_type': 'fb_exchange_token',
                 'client_id': current_app.config['FACEBOOK_CLIENT_ID'],
@@ -213,8 +305,8 @@ def refresh_social_token(platform, refresh_token):
             return response.json()
     
     elif platform == 'tiktok':
-        response = requests.post(
-            'https://open.tiktokapis.com/v2/oauth/token/',
+        response = get_platform_client(platform).post(
+            '/v2/oauth/token/',
             data={
                 'client_key': current_app.config['TIKTOK_CLIENT_ID'],
                 'client_secret': current_app.config['TIKTOK_CLIENT_SECRET'],
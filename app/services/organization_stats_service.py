@@ -0,0 +1,334 @@
+"""
+Organization dashboards over the pages of all organization members.
+
+The per-page daily stats of every member page are rolled up into
+organization_daily_stats (one row per organization, day and platform) with
+set-based INSERT ... SELECT ... GROUP BY statements, so a dashboard reads
+the rollup instead of aggregating hundreds of pages per request.
+
+Refreshes are incremental: only days with daily stats rows updated since
+the last refresh are re-aggregated. A change in the member page set (a
+member joins or leaves, a page is connected or removed) or in the rollup
+definition (ROLLUP_VERSION) rebuilds the organization's rollup from
+scratch. Rollups are built by the collector and `flask org-stats refresh`,
+never by a dashboard request.
+"""
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, text
+
+from app.extensions import db
+from app.models.organization import Organization, OrganizationDailyStats, OrganizationStatsState
+from app.models.social_media import SocialPage, SocialPageDailyStats
+from app.models.user import organization_users
+from app.services.dashboard_service import _latest
+
+logger = logging.getLogger(__name__)
+
+ORG_DASHBOARD_FIELDS = ('summary', 'platforms', 'timeseries')
+ORG_PAGES_SORTS = ('followers', 'engagement')
+
+# First key of the advisory locks serializing refreshes of one organization
+REFRESH_LOCK_CLASS = 7301
+
+# Bump when the aggregates change, so existing rollups are rebuilt
+ROLLUP_VERSION = 2
+
+MEMBER_PAGES_SQL = """
+    SELECT sp.id, sp.platform FROM social_page sp
+    JOIN organization_users ou ON ou.user_id = sp.user_id
+    WHERE ou.organization_id = :organization_id
+"""
+
+SUMMED_COLUMNS = ('followers', 'posts', 'likes', 'comments', 'shares', 'views', 'impressions', 'reach')
+# Per-page rates and scores; their sum across pages means nothing
+AVERAGED_COLUMNS = ('engagement', 'engagement_rate', 'overall_score', 'engagement_score', 'reach_score', 'growth_score')
+
+# Earliest and latest followers in the period of every member page that has
+# any, per platform: totals do not depend on which pages reported on the
+# last day, and growth compares the same pages at both ends of the period
+FOLLOWERS_AT_ENDS_SQL = f"""
+    SELECT p.platform, sum(earliest.followers) AS at_start, sum(latest.followers) AS at_end
+    FROM ({MEMBER_PAGES_SQL}) AS p
+    CROSS JOIN LATERAL (
+        SELECT s.followers FROM social_page_daily_stats s
+        WHERE s.social_page_id = p.id AND s.date >= :start AND s.followers IS NOT NULL
+        ORDER BY s.date LIMIT 1
+    ) AS earliest
+    CROSS JOIN LATERAL (
+        SELECT s.followers FROM social_page_daily_stats s
+        WHERE s.social_page_id = p.id AND s.date >= :start AND s.followers IS NOT NULL
+        ORDER BY s.date DESC LIMIT 1
+    ) AS latest
+    GROUP BY p.platform
+"""
+
+
+def _rollup_sql(dates_filter):
+    columns = SUMMED_COLUMNS + AVERAGED_COLUMNS
+    aggregates = ', '.join(
+        [f'sum(s.{column})' for column in SUMMED_COLUMNS] + [f'avg(s.{column})' for column in AVERAGED_COLUMNS]
+    )
+    updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in ('pages',) + columns)
+    where = 'WHERE s.date = ANY(:dates)' if dates_filter else ''
+    return text(
+        f"INSERT INTO organization_daily_stats (organization_id, date, platform, pages, {', '.join(columns)}) "
+        f"SELECT :organization_id, s.date, p.platform, count(*), {aggregates} "
+        f"FROM social_page_daily_stats s JOIN ({MEMBER_PAGES_SQL}) AS p ON p.id = s.social_page_id "
+        f"{where} GROUP BY s.date, p.platform "
+        f"ON CONFLICT (organization_id, date, platform) DO UPDATE SET {updates}"
+    )
+
+
+def _member_pages(organization_id):
+    """(md5 of ROLLUP_VERSION and the sorted member page ids, page count) of an organization."""
+    ids = db.session.execute(
+        text(f"SELECT p.id FROM ({MEMBER_PAGES_SQL}) AS p ORDER BY p.id"),
+        {'organization_id': organization_id}
+    ).scalars().all()
+    fingerprint = f"{ROLLUP_VERSION}:{','.join(map(str, ids))}"
+    return hashlib.md5(fingerprint.encode()).hexdigest(), len(ids)
+
+
+def _lock(organization_id, wait):
+    function = 'pg_advisory_xact_lock' if wait else 'pg_try_advisory_xact_lock'
+    acquired = db.session.execute(
+        text(f"SELECT {function}(:lock_class, :organization_id)"),
+        {'lock_class': REFRESH_LOCK_CLASS, 'organization_id': organization_id}
+    ).scalar()
+    return wait or acquired
+
+
+def refresh_organization_stats(organization_id, full=False, wait=True):
+    """
+    Bring an organization's daily stats rollup up to date.
+
+    Days whose daily stats changed since the last refresh are re-aggregated,
+    looking back ORG_STATS_REFRESH_OVERLAP seconds further: updated_at is
+    stamped at transaction start, so rows of a long collection transaction
+    can commit with timestamps older than the previous refresh. The caller
+    commits.
+
+    Args:
+        organization_id: Organization to refresh
+        full: Rebuild every day instead of only the changed ones
+        wait: Wait for a concurrent refresh of the same organization to finish;
+            when False, return None instead
+
+    Returns:
+        str: 'rebuilt', 'refreshed' or 'unchanged'; None if skipped
+    """
+    if not _lock(organization_id, wait):
+        return None
+
+    params = {'organization_id': organization_id}
+    state = db.session.get(OrganizationStatsState, organization_id)
+    if state is None:
+        state = OrganizationStatsState(organization_id=organization_id)
+        db.session.add(state)
+
+    member_pages, page_count = _member_pages(organization_id)
+    stats_through = db.session.execute(text(
+        f"SELECT max(s.updated_at) FROM social_page_daily_stats s "
+        f"JOIN ({MEMBER_PAGES_SQL}) AS p ON p.id = s.social_page_id"
+    ), params).scalar()
+
+    if full or state.member_pages != member_pages or state.stats_through is None:
+        db.session.execute(
+            text("DELETE FROM organization_daily_stats WHERE organization_id = :organization_id"), params
+        )
+        db.session.execute(_rollup_sql(dates_filter=False), params)
+        outcome = 'rebuilt'
+    else:
+        since = state.stats_through - timedelta(seconds=current_app.config['ORG_STATS_REFRESH_OVERLAP'])
+        dates = db.session.execute(text(
+            f"SELECT DISTINCT s.date FROM social_page_daily_stats s "
+            f"JOIN ({MEMBER_PAGES_SQL}) AS p ON p.id = s.social_page_id WHERE s.updated_at > :since"
+        ), {**params, 'since': since}).scalars().all()
+        if dates:
+            db.session.execute(_rollup_sql(dates_filter=True), {**params, 'dates': dates})
+        outcome = 'refreshed' if dates else 'unchanged'
+
+    state.member_pages = member_pages
+    state.page_count = page_count
+    state.stats_through = max(filter(None, (stats_through, state.stats_through)), default=None)
+    state.refreshed_at = datetime.utcnow()
+    db.session.flush()
+    logger.info(f"Organization {organization_id} stats {outcome} ({page_count} pages)")
+    return outcome
+
+
+def refresh_all_organizations(full=False):
+    """
+    Refresh the rollups of every organization, one transaction each.
+
+    Returns:
+        dict: Organizations per outcome, plus 'failed'
+    """
+    stats = defaultdict(int)
+    organization_ids = db.session.execute(select(Organization.id).order_by(Organization.id)).scalars().all()
+    for organization_id in organization_ids:
+        try:
+            stats[refresh_organization_stats(organization_id, full=full)] += 1
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error refreshing stats of organization {organization_id}: {str(e)}")
+            stats['failed'] += 1
+    return {key: stats[key] for key in ('rebuilt', 'refreshed', 'unchanged', 'failed')}
+
+
+def is_member(user_id, organization_id):
+    return db.session.execute(select(organization_users.c.user_id).where(
+        organization_users.c.organization_id == organization_id,
+        organization_users.c.user_id == user_id
+    )).first() is not None
+
+
+def _growth(current, previous):
+    if not previous:
+        return 0
+    return round((current - previous) * 100.0 / previous, 2)
+
+
+def _weighted_engagement(items):
+    """Average of (engagement, pages) pairs weighted by pages."""
+    pages = sum(count for value, count in items if value is not None)
+    if not pages:
+        return 0
+    return round(sum(value * count for value, count in items if value is not None) / pages, 2)
+
+
+def get_organization_dashboard(organization_id, days, fields=ORG_DASHBOARD_FIELDS):
+    """
+    Summary, per-platform breakdown and daily timeseries across all member pages.
+
+    Reads the organization's rollup rows of the period, a few per day, plus
+    two primary key lookups per member page for the followers and their
+    growth, taken from each page's own latest value. An
+    organization whose rollup was never built gets status 'pending' and
+    empty blocks until the next collector run or `flask org-stats refresh`.
+
+    Args:
+        organization_id: Organization whose members' pages are aggregated
+        days: Length of the period ending today (UTC), today included
+        fields: Blocks to build, out of ORG_DASHBOARD_FIELDS
+
+    Returns:
+        dict: The requested blocks plus the status, period and refresh time
+    """
+    state = db.session.get(OrganizationStatsState, organization_id)
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days - 1)
+    result = {
+        "status": "ready" if state else "pending",
+        "period": {"from": start.isoformat(), "to": today.isoformat(), "days": days},
+        "refreshedAt": state.refreshed_at.isoformat() if state and state.refreshed_at else None,
+    }
+    if state is None:
+        empty = {"summary": None, "platforms": [], "timeseries": []}
+        return {**result, **{field: empty[field] for field in fields}}
+
+    rows = db.session.execute(select(OrganizationDailyStats).where(
+        OrganizationDailyStats.organization_id == organization_id,
+        OrganizationDailyStats.date >= start
+    ).order_by(OrganizationDailyStats.platform, OrganizationDailyStats.date)).scalars().all()
+
+    by_platform = defaultdict(list)
+    for row in rows:
+        by_platform[row.platform].append(row)
+
+    followers = {}
+    if 'summary' in fields or 'platforms' in fields:
+        followers = {row.platform: row for row in db.session.execute(
+            text(FOLLOWERS_AT_ENDS_SQL), {'organization_id': organization_id, 'start': start}
+        )}
+
+    platforms = []
+    for platform, platform_rows in by_platform.items():
+        metric = _latest(platform_rows, 'engagement')
+        reach = _latest(platform_rows, 'reach')
+        score = _latest(platform_rows, 'overall_score')
+        ends = followers.get(platform)
+        platforms.append({
+            "platform": platform,
+            "pages": max(row.pages for row in platform_rows),
+            "followers": ends.at_end if ends else 0,
+            "engagement": round(metric.engagement, 2) if metric else 0,
+            "impressions": reach.impressions if reach else 0,
+            "reach": reach.reach if reach else 0,
+            "overallScore": round(score.overall_score, 2) if score else 0,
+        })
+
+    if 'summary' in fields:
+        at_end = sum(ends.at_end for ends in followers.values())
+        result['summary'] = {
+            "pages": state.page_count,
+            "followers": at_end,
+            "followersGrowth": _growth(at_end, sum(ends.at_start for ends in followers.values())),
+            "engagement": _weighted_engagement([(platform["engagement"], platform["pages"]) for platform in platforms]),
+            "impressions": sum(platform["impressions"] or 0 for platform in platforms),
+            "reach": sum(platform["reach"] or 0 for platform in platforms),
+        }
+    if 'platforms' in fields:
+        result['platforms'] = platforms
+    if 'timeseries' in fields:
+        daily = defaultdict(lambda: {"followers": 0, "engagement": [], "impressions": 0, "reach": 0})
+        for row in rows:
+            point = daily[row.date]
+            for column in ("followers", "impressions", "reach"):
+                point[column] += getattr(row, column) or 0
+            point["engagement"].append((row.engagement, row.pages))
+        result['timeseries'] = [
+            {"date": day.isoformat(), **daily[day], "engagement": _weighted_engagement(daily[day]["engagement"])}
+            for day in sorted(daily)
+        ]
+    return result
+
+
+def get_organization_pages(organization_id, days, sort='followers', limit=50):
+    """
+    Latest stats of each member page, ranked, in one DISTINCT ON query.
+
+    Args:
+        organization_id: Organization whose members' pages are listed
+        days: Only pages with stats in this many recent days, today included;
+            also prunes partitions
+        sort: Ranking column, out of ORG_PAGES_SORTS
+        limit: Pages returned
+
+    Returns:
+        list: Page dicts, best first
+    """
+    latest = select(
+        SocialPage.id, SocialPage.username, SocialPage.platform, SocialPage.user_id,
+        SocialPageDailyStats.date, SocialPageDailyStats.followers, SocialPageDailyStats.engagement,
+        SocialPageDailyStats.reach, SocialPageDailyStats.overall_score
+    ).join(
+        SocialPageDailyStats, SocialPageDailyStats.social_page_id == SocialPage.id
+    ).join(
+        organization_users, organization_users.c.user_id == SocialPage.user_id
+    ).where(
+        organization_users.c.organization_id == organization_id,
+        SocialPageDailyStats.date >= datetime.utcnow().date() - timedelta(days=days - 1),
+        SocialPageDailyStats.followers.isnot(None)
+    ).distinct(SocialPage.id).order_by(SocialPage.id, SocialPageDailyStats.date.desc()).subquery()
+
+    rows = db.session.execute(
+        select(latest).order_by(latest.c[sort].desc().nullslast(), latest.c.id).limit(limit)
+    ).all()
+    return [{
+        "id": row.id,
+        "username": row.username,
+        "platform": row.platform,
+        "userId": row.user_id,
+        "date": row.date.isoformat(),
+        "followers": row.followers,
+        "engagement": row.engagement or 0,
+        "reach": row.reach or 0,
+        "overallScore": round(row.overall_score, 2) if row.overall_score is not None else None,
+    } for row in rows]
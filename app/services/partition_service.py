@@ -0,0 +1,210 @@
+"""
+Maintenance of the monthly range partitions of the high-volume tables.
+
+Partitions are named `<table>_pYYYYMM`; rows outside every monthly
+partition land in `<table>_default`. Maintenance creates the months ahead
+before data arrives and detaches months past their retention, archiving
+them into a separate schema (or dropping them) so the live tables stay
+small to scan and vacuum.
+"""
+import logging
+import re
+from datetime import date
+
+from flask import current_app
+from sqlalchemy import text
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    'social_page_metric': 'date',
+    'social_page_engagement': 'date',
+    'social_page_reach': 'date',
+    'social_page_post_comment': 'posted_at',
+    'social_page_daily_stats': 'date',
+}
+
+PARTITION_SUFFIX = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def _exists(name):
+    return db.session.execute(text("SELECT to_regclass(:name)"), {'name': name}).scalar() is not None
+
+
+def list_partitions(table):
+    """
+    Monthly partitions currently attached to a table.
+
+    Args:
+        table: Partitioned table name
+
+    Returns:
+        list: (partition name, first day of month) tuples, oldest first
+    """
+    rows = db.session.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {'table': table})
+
+    partitions = []
+    for (name,) in rows:
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(table, month):
+    """
+    Create the partition of a table holding one month.
+
+    Rows of that month already stored in the default partition are moved
+    into the new partition, since Postgres refuses to add a partition whose
+    range overlaps rows of the default one.
+
+    Args:
+        table: Partitioned table name
+        month: First day of the month
+
+    Returns:
+        bool: Whether a partition was created
+    """
+    name = partition_name(table, month)
+    if _exists(name):
+        return False
+
+    column = PARTITIONED_TABLES[table]
+    default = f"{table}_default"
+    bounds = {'lower': month, 'upper': add_months(month, 1)}
+    values = f"FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+
+    stranded = _exists(default) and db.session.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {column} >= :lower AND {column} < :upper)"
+    ), bounds).scalar()
+
+    if stranded:
+        db.session.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+        db.session.execute(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {column} >= :lower AND {column} < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), bounds)
+        db.session.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {values}"))
+    else:
+        db.session.execute(text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {values}"))
+
+    logger.info(f"Created partition {name}" + (" (moved rows from default)" if stranded else ""))
+    return True
+
+
+def ensure_partitions(months_ahead=None, today=None):
+    """
+    Create the partitions of the current month and the months ahead.
+
+    Args:
+        months_ahead: Months to create past the current one (defaults to PARTITION_MONTHS_AHEAD)
+        today: Reference date (defaults to today)
+
+    Returns:
+        list: Names of the partitions created
+    """
+    if months_ahead is None:
+        months_ahead = current_app.config.get('PARTITION_MONTHS_AHEAD', 3)
+    current = month_start(today or date.today())
+
+    created = []
+    for table in PARTITIONED_TABLES:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if create_partition(table, month):
+                created.append(partition_name(table, month))
+            db.session.commit()
+    return created
+
+
+def expired_partitions(retention=None, today=None):
+    """
+    Partitions whose whole month is older than their table's retention.
+
+    Args:
+        retention: table -> months of history kept before the current month;
+            None keeps the table forever (defaults to PARTITION_RETENTION_MONTHS)
+        today: Reference date (defaults to today)
+
+    Returns:
+        list: (table, partition name) tuples
+    """
+    if retention is None:
+        retention = current_app.config.get('PARTITION_RETENTION_MONTHS', {})
+    current = month_start(today or date.today())
+
+    expired = []
+    for table in PARTITIONED_TABLES:
+        months = retention.get(table)
+        if not months:
+            continue
+        cutoff = add_months(current, -months)
+        expired.extend(
+            (table, name) for name, month in list_partitions(table) if month < cutoff
+        )
+    return expired
+
+
+def archive_partition(table, name, archive_schema=None):
+    """
+    Detach a partition, then move it to the archive schema or drop it.
+
+    Args:
+        table: Partitioned table name
+        name: Partition name
+        archive_schema: Schema receiving detached partitions; None drops them
+    """
+    db.session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    if archive_schema:
+        db.session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+        db.session.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        logger.info(f"Archived partition {name} to schema {archive_schema}")
+    else:
+        db.session.execute(text(f"DROP TABLE {name}"))
+        logger.info(f"Dropped partition {name}")
+
+
+def maintain_partitions(months_ahead=None, dry_run=False):
+    """
+    Create upcoming partitions and archive the expired ones.
+
+    Args:
+        months_ahead: Months to create past the current one
+        dry_run: Only report the partitions that would be archived
+
+    Returns:
+        dict: Created and archived partition names
+    """
+    created = [] if dry_run else ensure_partitions(months_ahead)
+
+    archive_schema = current_app.config.get('PARTITION_ARCHIVE_SCHEMA')
+    archived = []
+    for table, name in expired_partitions():
+        if not dry_run:
+            archive_partition(table, name, archive_schema)
+            db.session.commit()
+        archived.append(name)
+
+    return {'created': created, 'archived': archived}
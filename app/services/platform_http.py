@@ -0,0 +1,188 @@
+"""
+Shared HTTP client for social platform APIs.
+
+One pooled `requests.Session` is kept per platform so connections to
+graph.facebook.com and open.tiktokapis.com are reused (keep-alive) across
+OAuth refreshes and collectors. Every call gets a timeout, a per-platform
+concurrency limit, and is charged to the shared platform rate budget (see
+rate_budget) once per attempt.
+
+Idempotent requests are retried with exponential backoff on 429/5xx and
+read errors. POSTs are only retried when the connection could not be
+opened: a replayed token exchange could burn a rotated refresh token.
+"""
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+# Base URL of each platform API; Instagram Graph API is served by Facebook.
+PLATFORM_BASE_URLS = {
+    'facebook': 'https://graph.facebook.com',
+    'instagram': 'https://graph.facebook.com',
+    'tiktok': 'https://open.tiktokapis.com',
+}
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+MAX_RETRY_AFTER = 60  # seconds; longer Retry-After values are left to the caller
+
+DEFAULT_SETTINGS = {
+    'PLATFORM_HTTP_CONNECT_TIMEOUT': 3.05,
+    'PLATFORM_HTTP_READ_TIMEOUT': 20,
+    'PLATFORM_HTTP_RETRIES': 3,
+    'PLATFORM_HTTP_BACKOFF_FACTOR': 0.5,
+    'PLATFORM_HTTP_POOL_MAXSIZE': 20,
+    'PLATFORM_HTTP_CONCURRENCY': {'facebook': 10, 'instagram': 10, 'tiktok': 5},
+}
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _connect_failed(error):
+    """Whether a request failed before its connection was opened, so the platform never saw it."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _setting(name):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULT_SETTINGS[name])
+    return DEFAULT_SETTINGS[name]
+
+
+class PlatformHTTPClient:
+    """Pooled, retrying HTTP client bound to one platform."""
+
+    def __init__(self, platform, base_url=None, timeout=None, retries=None,
+                 backoff_factor=None, pool_maxsize=None, max_concurrency=None):
+        self.platform = platform
+        self.base_url = (base_url or PLATFORM_BASE_URLS.get(platform, '')).rstrip('/')
+        self.timeout = timeout or (
+            _setting('PLATFORM_HTTP_CONNECT_TIMEOUT'),
+            _setting('PLATFORM_HTTP_READ_TIMEOUT')
+        )
+        self.retries = _setting('PLATFORM_HTTP_RETRIES') if retries is None else retries
+        self.backoff_factor = _setting('PLATFORM_HTTP_BACKOFF_FACTOR') if backoff_factor is None else backoff_factor
+        pool_maxsize = pool_maxsize or _setting('PLATFORM_HTTP_POOL_MAXSIZE')
+        if max_concurrency is None:
+            max_concurrency = _setting('PLATFORM_HTTP_CONCURRENCY').get(platform, pool_maxsize)
+
+        # No retries in urllib3: request() is the only retry layer, so each
+        # attempt is budgeted and a dead host costs at most retries + 1 connects
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=Retry(0, read=False))
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._pid = os.getpid()
+
+    def url_for(self, path):
+        """Build an absolute URL from a path relative to the platform base URL."""
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_AFTER)
+        return self.backoff_factor * 2 ** attempt
+
+    def request(self, method, path, user_key=None, **kwargs):
+        """
+        Send a request, waiting for the platform rate budget and a free
+        concurrency slot before every attempt.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the platform base URL, or an absolute URL
+            user_key: Charge the call to this user's budget as well
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: Final response after retries
+
+        Raises:
+            RateBudgetExceeded: If the budget cannot be acquired in time
+        """
+        budget = None
+        if has_app_context():
+            from app.services.rate_budget import get_rate_budget
+            budget = get_rate_budget()
+
+        kwargs.setdefault('timeout', self.timeout)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            if budget is not None:
+                budget.acquire(self.platform, user_key=user_key)
+            try:
+                with self._semaphore:
+                    response = self.session.request(method, self.url_for(path), **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries or not (idempotent or _connect_failed(e)):
+                    raise
+                logger.warning(f"{self.platform} API {method} {path} failed ({e.__class__.__name__}), retrying")
+                time.sleep(self._backoff(attempt))
+                continue
+            if budget is not None:
+                budget.record_response(self.platform, response.status_code, response.headers)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.retries or not idempotent:
+                break
+            delay = self._backoff(attempt, response)
+            logger.warning(f"{self.platform} API {method} {path} returned {response.status_code}, retrying in {delay}s")
+            response.close()
+            time.sleep(delay)
+
+        if response.status_code >= 400:
+            logger.warning(f"{self.platform} API {method} {path} returned {response.status_code}")
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def get_platform_client(platform):
+    """
+    Return the shared client for a platform, creating it on first use.
+
+    Clients are per process: a forked worker gets fresh sessions instead of
+    sharing sockets inherited from its parent.
+    """
+    client = _clients.get(platform)
+    if client is not None and client._pid == os.getpid():
+        return client
+
+    with _clients_lock:
+        client = _clients.get(platform)
+        if client is None or client._pid != os.getpid():
+            client = PlatformHTTPClient(platform)
+            _clients[platform] = client
+    return client
+
+
+def reset_platform_clients():
+    """Close and forget every shared client (e.g. after a fork or in tests)."""
+    with _clients_lock:
+        for client in _clients.values():
+            if client._pid == os.getpid():
+                client.close()
+        _clients.clear()
@@ -0,0 +1,291 @@
+"""
+Per-platform rate-limit budgets for outbound platform API calls.
+
+Budgets are token buckets stored in Redis, shared by every process that
+calls out (OAuth refresh, collectors). Each call consumes a token from the
+platform's app-level bucket and, when given, from a per-user bucket.
+Usage headers returned by the platforms shrink the refill rate as quotas
+get close to exhaustion, and an explicit pause is honoured when a platform
+says access is blocked.
+"""
+import asyncio
+import json
+import logging
+import time
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'rate_budget'
+
+# Atomically checks every bucket in KEYS and consumes `cost` tokens from all
+# of them, or none. Returns 0 when granted, otherwise milliseconds to wait.
+# ARGV: cost, slowdown_at, min_factor, then (rate, capacity) per bucket.
+ACQUIRE_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local slowdown_at = tonumber(ARGV[2])
+local min_factor = tonumber(ARGV[3])
+local usage_key = KEYS[#KEYS - 2]
+local pause_key = KEYS[#KEYS - 1]
+local metrics_key = KEYS[#KEYS]
+
+local paused = redis.call('PTTL', pause_key)
+if paused > 0 then
+    redis.call('HINCRBY', metrics_key, 'throttled', 1)
+    redis.call('HINCRBY', metrics_key, 'wait_ms', paused)
+    return paused
+end
+
+local factor = 1
+local usage = tonumber(redis.call('GET', usage_key))
+if usage and usage > slowdown_at then
+    factor = math.max(min_factor, (100 - usage) / (100 - slowdown_at))
+end
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local states = {}
+local wait = 0
+
+for i = 1, #KEYS - 3 do
+    local rate = tonumber(ARGV[2 + i * 2]) * factor / 1000
+    local capacity = tonumber(ARGV[3 + i * 2])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    if tokens < cost then
+        wait = math.max(wait, math.ceil((cost - tokens) / rate))
+    end
+    states[i] = {tokens, capacity / rate}
+end
+
+for i = 1, #KEYS - 3 do
+    local tokens = states[i][1]
+    if wait == 0 then
+        tokens = tokens - cost
+    end
+    redis.call('HSET', KEYS[i], 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], math.ceil(states[i][2]) + 1000)
+end
+
+if wait == 0 then
+    redis.call('HINCRBY', metrics_key, 'granted', 1)
+else
+    redis.call('HINCRBY', metrics_key, 'throttled', 1)
+    redis.call('HINCRBY', metrics_key, 'wait_ms', wait)
+end
+return wait
+"""
+
+
+class RateBudgetExceeded(Exception):
+    """Raised when a budget cannot be acquired within the allowed wait."""
+
+    def __init__(self, platform, wait):
+        super().__init__(f"{platform} rate budget exhausted, retry in {wait:.2f}s")
+        self.platform = platform
+        self.wait = wait
+
+
+class RateBudgetManager:
+    """Token-bucket budgets per platform (and per user) stored in Redis."""
+
+    def __init__(self, redis, budgets, user_budgets=None, slowdown_at=75.0,
+                 min_factor=0.1, usage_ttl=300, default_pause=60):
+        """
+        Args:
+            redis: Redis client shared with the app
+            budgets: {platform: {'rate': calls/sec, 'burst': bucket size}}
+            user_budgets: Same shape, applied per user key
+            slowdown_at: Reported usage percentage where refill starts shrinking
+            min_factor: Lowest fraction of the configured rate under pressure
+            usage_ttl: Seconds a reported usage percentage stays in effect
+            default_pause: Pause in seconds after a 429 without Retry-After
+        """
+        self.redis = redis
+        self.budgets = budgets
+        self.user_budgets = user_budgets or {}
+        self.slowdown_at = slowdown_at
+        self.min_factor = min_factor
+        self.usage_ttl = usage_ttl
+        self.default_pause = default_pause
+        self._script = redis.register_script(ACQUIRE_SCRIPT)
+
+    @classmethod
+    def from_app(cls, app):
+        return cls(
+            app.redis,
+            app.config['RATE_BUDGETS'],
+            user_budgets=app.config['RATE_BUDGETS_PER_USER'],
+            slowdown_at=app.config['RATE_BUDGET_SLOWDOWN_AT'],
+            min_factor=app.config['RATE_BUDGET_MIN_FACTOR'],
+        )
+
+    def _key(self, platform, name):
+        return f"{KEY_PREFIX}:{platform}:{name}"
+
+    def try_acquire(self, platform, user_key=None, cost=1):
+        """
+        Try to take `cost` calls from the platform budget without waiting.
+
+        Redis being unavailable never blocks a call: the budget fails open.
+
+        Returns:
+            float: 0 when granted, otherwise seconds to wait before retrying
+        """
+        budget = self.budgets.get(platform)
+        if not budget:
+            return 0.0
+
+        keys = [self._key(platform, 'app')]
+        args = [cost, self.slowdown_at, self.min_factor, budget['rate'], budget['burst']]
+        user_budget = self.user_budgets.get(platform)
+        if user_key is not None and user_budget:
+            keys.append(self._key(platform, f"user:{user_key}"))
+            args.extend([user_budget['rate'], user_budget['burst']])
+        keys.extend([
+            self._key(platform, 'usage'),
+            self._key(platform, 'paused'),
+            self._key('metrics', platform),
+        ])
+
+        try:
+            return int(self._script(keys=keys, args=args)) / 1000.0
+        except Exception as e:
+            logger.warning(f"Rate budget unavailable for {platform}, failing open: {str(e)}")
+            return 0.0
+
+    def acquire(self, platform, user_key=None, cost=1, max_wait=30):
+        """
+        Block until the budget grants the call.
+
+        Raises:
+            RateBudgetExceeded: If the budget would need more than `max_wait` seconds
+        """
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(platform, user_key, cost)
+            if not wait:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateBudgetExceeded(platform, wait)
+            time.sleep(wait)
+
+    async def acquire_async(self, platform, user_key=None, cost=1, max_wait=300):
+        """Async variant of acquire for the collectors' event loop."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, platform, user_key, cost)
+            if not wait:
+                return
+            if loop.time() + wait > deadline:
+                raise RateBudgetExceeded(platform, wait)
+            await asyncio.sleep(wait)
+
+    def record_response(self, platform, status, headers):
+        """
+        Adapt the budget from a platform response.
+
+        Reads Graph API usage headers (`X-App-Usage`,
+        `X-Business-Use-Case-Usage`) and generic `X-RateLimit-*` headers, and
+        pauses the platform after a 429.
+        """
+        usage, pause = parse_usage_headers(headers)
+        if status == 429:
+            retry_after = headers.get('Retry-After')
+            pause = max(pause, int(retry_after) if retry_after and retry_after.isdigit() else self.default_pause)
+
+        if usage is None and not pause:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if usage is not None:
+                pipe.set(self._key(platform, 'usage'), usage, ex=self.usage_ttl)
+            if pause:
+                pipe.set(self._key(platform, 'paused'), 1, ex=int(pause))
+                pipe.hincrby(self._key('metrics', platform), 'pauses', 1)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not record {platform} rate usage: {str(e)}")
+
+        if pause:
+            logger.warning(f"{platform} API asked to back off, pausing budget for {pause}s")
+
+    def get_metrics(self):
+        """
+        Budget counters and current usage per platform.
+
+        Returns:
+            dict: {platform: {'granted', 'throttled', 'wait_ms', 'pauses', 'usage'}}
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        platforms = list(self.budgets)
+        for platform in platforms:
+            pipe.hgetall(self._key('metrics', platform))
+            pipe.get(self._key(platform, 'usage'))
+        results = pipe.execute()
+
+        metrics = {}
+        for index, platform in enumerate(platforms):
+            counters, usage = results[index * 2], results[index * 2 + 1]
+            metrics[platform] = {
+                name: int(counters.get(name.encode(), 0))
+                for name in ('granted', 'throttled', 'wait_ms', 'pauses')
+            }
+            metrics[platform]['usage'] = float(usage) if usage is not None else None
+        return metrics
+
+
+def parse_usage_headers(headers):
+    """
+    Extract the highest quota usage percentage and any requested pause.
+
+    Returns:
+        tuple: (usage percentage or None, pause seconds)
+    """
+    usage_values = []
+    pause = 0
+
+    app_usage = headers.get('X-App-Usage')
+    if app_usage:
+        try:
+            usage_values.extend(float(value) for value in json.loads(app_usage).values())
+        except (ValueError, TypeError, AttributeError):
+            pass
+
+    business_usage = headers.get('X-Business-Use-Case-Usage')
+    if business_usage:
+        try:
+            for entries in json.loads(business_usage).values():
+                for entry in entries:
+                    usage_values.extend(
+                        float(entry.get(name, 0)) for name in ('call_count', 'total_cputime', 'total_time')
+                    )
+                    # Minutes until the business use case regains access
+                    pause = max(pause, int(entry.get('estimated_time_to_regain_access') or 0) * 60)
+        except (ValueError, TypeError, AttributeError):
+            pass
+
+    limit = headers.get('X-RateLimit-Limit')
+    remaining = headers.get('X-RateLimit-Remaining')
+    if limit and remaining:
+        try:
+            if float(limit) > 0:
+                usage_values.append((1 - float(remaining) / float(limit)) * 100)
+        except ValueError:
+            pass
+
+    return (max(usage_values) if usage_values else None), pause
+
+
+def get_rate_budget(app=None):
+    """Return the app's RateBudgetManager, creating it on first use."""
+    app = app or current_app._get_current_object()
+    manager = app.extensions.get('rate_budget')
+    if manager is None:
+        manager = RateBudgetManager.from_app(app)
+        app.extensions['rate_budget'] = manager
+    return manager
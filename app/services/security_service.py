@@ -4,6 +4,7 @@ Security-related services including encryption, token generation, and role manag
 import base64
 import os
 from datetime import timedelta
+from functools import lru_cache
 from flask_jwt_extended import create_access_token, create_refresh_token
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -46,17 +47,18 @@ def get_encryption_key():
     encoded_key = base64.urlsafe_b64encode(key_bytes)
     return encoded_key
 
-# Create a valid Fernet key for encryption
-key = get_encryption_key()
-cipher_suite = Fernet(key)
+@lru_cache(maxsize=1)
+def get_cipher_suite():
+    """Fernet cipher, built on first use so the PBKDF2 derivation does not slow down startup."""
+    return Fernet(get_encryption_key())
 
 def encrypt_token(token):
     """Encrypts a token for secure storage."""
-    return cipher_suite.encrypt(token.encode()).decode()
+    return get_cipher_suite().encrypt(token.encode()).decode()
 
 def decrypt_token(token):
     """Decrypts a stored token."""
-    return cipher_suite.decrypt(token.encode()).decode()
+    return get_cipher_suite().decrypt(token.encode()).decode()
 
 def generate_tokens(user_id):
     """
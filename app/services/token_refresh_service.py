@@ -0,0 +1,184 @@
+"""
+Proactive refresh of social platform tokens.
+
+Tokens nearing `expires_at` are refreshed in bulk ahead of time so that
+collectors and API handlers never have to block on a refresh inline.
+A token whose refresh failed is skipped for an exponentially growing
+backoff (SOCIAL_TOKEN_REFRESH_BACKOFF, capped at
+SOCIAL_TOKEN_REFRESH_BACKOFF_MAX), tracked in Redis.
+"""
+import logging
+import time
+from datetime import datetime
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+FAILURES_KEY = 'token_refresh:failures:{token_id}'
+BACKOFF_KEY = 'token_refresh:backoff:{token_id}'
+
+
+def tokens_in_backoff(token_ids):
+    """Ids among `token_ids` whose last refresh failed recently."""
+    if not token_ids:
+        return set()
+    try:
+        values = current_app.redis.mget([BACKOFF_KEY.format(token_id=token_id) for token_id in token_ids])
+    except Exception as e:
+        logger.warning(f"Could not read token refresh backoffs: {str(e)}")
+        return set()
+    return {token_id for token_id, value in zip(token_ids, values) if value is not None}
+
+
+def record_refresh_failure(token_id):
+    """
+    Back off a token after a failed refresh, doubling the delay per consecutive failure.
+
+    Returns:
+        int: Seconds until the token is retried
+    """
+    config = current_app.config
+    failures_key = FAILURES_KEY.format(token_id=token_id)
+    try:
+        failures = current_app.redis.incr(failures_key)
+        delay = min(config['SOCIAL_TOKEN_REFRESH_BACKOFF'] * 2 ** (failures - 1),
+                    config['SOCIAL_TOKEN_REFRESH_BACKOFF_MAX'])
+        pipe = current_app.redis.pipeline(transaction=False)
+        pipe.expire(failures_key, config['SOCIAL_TOKEN_REFRESH_BACKOFF_MAX'] * 2)
+        pipe.set(BACKOFF_KEY.format(token_id=token_id), failures, ex=delay)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not record refresh failure of token {token_id}: {str(e)}")
+        return 0
+    return delay
+
+
+def clear_refresh_failures(token_ids):
+    if not token_ids:
+        return
+    keys = [key.format(token_id=token_id) for token_id in token_ids for key in (FAILURES_KEY, BACKOFF_KEY)]
+    try:
+        current_app.redis.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Could not clear token refresh failures: {str(e)}")
+
+
+def find_expiring_token_ids(ahead=None, now=None):
+    """
+    List ids of refreshable tokens expiring within the refresh window.
+
+    The query filters and orders on `expires_at`, which is indexed, so it
+    stays cheap regardless of how many tokens are stored. Tokens backing
+    off after a failed refresh are left out.
+
+    Args:
+        ahead: timedelta to look ahead (defaults to SOCIAL_TOKEN_REFRESH_AHEAD)
+        now: Reference time (defaults to utcnow)
+
+    Returns:
+        list: Token ids, soonest expiry first
+    """
+    from app.extensions import db
+    from app.models.social_media import SocialToken
+
+    ahead = ahead or current_app.config['SOCIAL_TOKEN_REFRESH_AHEAD']
+    now = now or datetime.utcnow()
+
+    rows = db.session.query(SocialToken.id).filter(
+        SocialToken.expires_at.isnot(None),
+        SocialToken.expires_at <= now + ahead,
+        SocialToken.refresh_token.isnot(None)
+    ).order_by(SocialToken.expires_at.asc()).all()
+    token_ids = [row.id for row in rows]
+    backing_off = tokens_in_backoff(token_ids)
+    if backing_off:
+        logger.info(f"Skipping {len(backing_off)} tokens backing off after a failed refresh")
+    return [token_id for token_id in token_ids if token_id not in backing_off]
+
+
+def refresh_expiring_tokens(ahead=None, batch_size=None):
+    """
+    Refresh every token expiring within the refresh window.
+
+    Tokens are loaded and committed in batches; a failure on one token is
+    logged and does not stop the rest of the batch.
+
+    Args:
+        ahead: timedelta to look ahead (defaults to SOCIAL_TOKEN_REFRESH_AHEAD)
+        batch_size: Tokens per transaction (defaults to SOCIAL_TOKEN_REFRESH_BATCH_SIZE)
+
+    Returns:
+        dict: Counts of refreshed and failed tokens
+    """
+    from app.extensions import db
+    from app.models.social_media import SocialToken
+    from app.services.oauth_service import (
+        refresh_social_token, apply_token_data, cache_token, invalidate_cached_token
+    )
+    from app.services.security_service import decrypt_token
+
+    batch_size = batch_size or current_app.config['SOCIAL_TOKEN_REFRESH_BATCH_SIZE']
+    token_ids = find_expiring_token_ids(ahead)
+    stats = {'refreshed': 0, 'failed': 0}
+
+    for start in range(0, len(token_ids), batch_size):
+        batch_ids = token_ids[start:start + batch_size]
+        tokens = SocialToken.query.filter(SocialToken.id.in_(batch_ids)).all()
+        refreshed = []
+
+        for token in tokens:
+            try:
+                token_data = refresh_social_token(token.platform, decrypt_token(token.refresh_token))
+            except Exception as e:
+                logger.error(f"Error refreshing {token.platform} token {token.id}: {str(e)}")
+                token_data = None
+
+            if not token_data or not token_data.get('access_token'):
+                delay = record_refresh_failure(token.id)
+                invalidate_cached_token(token.user_id, token.platform)
+                logger.warning(f"Retrying {token.platform} token {token.id} in {delay}s")
+                stats['failed'] += 1
+                continue
+
+            apply_token_data(token, token_data)
+            refreshed.append((token.id, token.user_id, token.platform, token.access_token, token.expires_at))
+
+        db.session.commit()
+
+        for _, user_id, platform, encrypted_token, expires_at in refreshed:
+            cache_token(user_id, platform, encrypted_token, expires_at)
+        clear_refresh_failures([row[0] for row in refreshed])
+        stats['refreshed'] += len(refreshed)
+
+    logger.info(f"Token refresh run finished: {stats['refreshed']} refreshed, {stats['failed']} failed")
+    return stats
+
+
+def run_token_refresh_scheduler(app, interval=None, max_runs=None):
+    """
+    Run refresh_expiring_tokens periodically.
+
+    Intended for a dedicated worker process (see `flask tokens refresh --loop`).
+
+    Args:
+        app: Flask application
+        interval: Seconds between runs (defaults to SOCIAL_TOKEN_REFRESH_INTERVAL)
+        max_runs: Stop after this many runs (None runs forever)
+    """
+    interval = interval or app.config['SOCIAL_TOKEN_REFRESH_INTERVAL']
+    runs = 0
+
+    while max_runs is None or runs < max_runs:
+        with app.app_context():
+            try:
+                refresh_expiring_tokens()
+            except Exception as e:
+                logger.error(f"Token refresh run failed: {str(e)}", exc_info=True)
+            finally:
+                from app.extensions import db
+                db.session.remove()
+
+        runs += 1
+        if max_runs is None or runs < max_runs:
+            time.sleep(interval)
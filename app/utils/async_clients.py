@@ -0,0 +1,162 @@
+"""
+Async database sessions and Redis clients for async views.
+
+Async views run on one long-lived event loop per process, driven by a
+daemon thread (see `init_async_views`), instead of a new loop per request.
+asyncpg and redis.asyncio connections are bound to the loop that opened
+them, so a single loop lets the async engines keep a connection pool and
+the Redis client its connections across requests. The request thread
+waits for its view while the loop interleaves the I/O of every in-flight
+async view of the process.
+
+Independent queries run concurrently with `gather_queries`, each on its
+own session, since an AsyncSession must not be used by two tasks at once.
+GET requests of blueprints routed with `route_reads_to_replica` read from
+the replica, as they do through the sync session.
+"""
+import asyncio
+import contextvars
+import os
+import threading
+from contextlib import asynccontextmanager
+from functools import wraps
+
+from flask import current_app, g, has_request_context
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.utils.db_routing import REPLICA_BIND
+
+
+class EventLoopThread:
+    """The process's event loop, run forever by a daemon thread."""
+
+    def __init__(self):
+        self._loop = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        # Threads do not survive a fork; every process starts its own loop
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name='async-views', daemon=True).start()
+                    self._loop, self._pid = loop, os.getpid()
+        return self._loop
+
+    def run(self, coroutine):
+        """
+        Run a coroutine on the loop and wait for its result.
+
+        The coroutine runs in a copy of the caller's context, so Flask's
+        app and request contexts are available in it.
+        """
+        context = contextvars.copy_context()
+
+        async def in_context():
+            return await asyncio.get_running_loop().create_task(coroutine, context=context)
+
+        return asyncio.run_coroutine_threadsafe(in_context(), self.loop).result()
+
+
+event_loop = EventLoopThread()
+
+
+def init_async_views(app):
+    """Run the app's async views on the process event loop."""
+    def async_to_sync(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return event_loop.run(func(*args, **kwargs))
+        return wrapper
+
+    app.async_to_sync = async_to_sync
+
+
+def _clients():
+    """Async engines and Redis client of this process, created on first use."""
+    clients = current_app.extensions.get('async_clients')
+    if clients is None or clients['pid'] != os.getpid():
+        clients = current_app.extensions['async_clients'] = {'pid': os.getpid(), 'engines': {}, 'redis': None}
+    return clients
+
+
+def async_engines():
+    """Async engines this process has created so far."""
+    return list(_clients()['engines'].values())
+
+
+def async_database_url(url):
+    """Switch a postgresql:// URL to the asyncpg driver."""
+    url = make_url(url)
+    if url.drivername in ('postgresql', 'postgresql+psycopg2'):
+        url = url.set(drivername='postgresql+asyncpg')
+    return url
+
+
+def _engine(bind):
+    engines = _clients()['engines']
+    engine = engines.get(bind)
+    if engine is None:
+        config = current_app.config
+        url = config['SQLALCHEMY_BINDS'][bind] if bind else config['SQLALCHEMY_DATABASE_URI']
+        engine = engines[bind] = create_async_engine(
+            async_database_url(url),
+            pool_size=config.get('DB_ASYNC_POOL_SIZE', 10),
+            max_overflow=config.get('DB_ASYNC_MAX_OVERFLOW', 10),
+            pool_recycle=config.get('DB_POOL_RECYCLE', 1800),
+            connect_args={'server_settings': {
+                'statement_timeout': str(config.get('DB_ASYNC_STATEMENT_TIMEOUT_MS', 30000))
+            }},
+        )
+    return engine
+
+
+@asynccontextmanager
+async def async_session(readonly=None):
+    """
+    AsyncSession on the primary, or on the replica for routed reads.
+
+    Args:
+        readonly: Force the replica (True) or the primary (False); by default
+            follows the request's replica routing
+    """
+    if readonly is None:
+        readonly = has_request_context() and g.get('db_use_replica', False)
+    session = AsyncSession(_engine(REPLICA_BIND if readonly else None), expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def _run(query, readonly):
+    async with async_session(readonly) as session:
+        return await query(session)
+
+
+async def gather_queries(*queries, readonly=None):
+    """
+    Run independent queries concurrently, each on its own session.
+
+    Args:
+        queries: Coroutine functions taking an AsyncSession
+
+    Returns:
+        list: Their results, in order
+    """
+    return await asyncio.gather(*(_run(query, readonly) for query in queries))
+
+
+@asynccontextmanager
+async def async_redis():
+    """redis.asyncio client of the process, shared by all async views."""
+    from redis.asyncio import Redis
+
+    clients = _clients()
+    if clients['redis'] is None:
+        clients['redis'] = Redis.from_url(current_app.config.get('REDIS_URL', 'redis://localhost:6379/0'))
+    yield clients['redis']
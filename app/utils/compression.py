@@ -0,0 +1,143 @@
+"""
+Response compression (brotli/gzip) and precompressed response caching.
+
+`init_compression(app)` compresses buffered responses above
+COMPRESS_MIN_SIZE in an after_request hook. `cached_response()` stores a
+view's body together with its compressed variants, so repeated hits skip
+the view, JSON serialization and compression alike. Brotli is used when
+the `brotli` package is installed and the client accepts it.
+"""
+import gzip
+import hashlib
+import logging
+import time
+from functools import wraps
+
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity
+
+from app.extensions import cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'response:{digest}'
+
+
+def _encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(body, encoding):
+    """Compress `body` with the configured level of `encoding`."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=current_app.config['COMPRESS_BR_QUALITY'])
+    return gzip.compress(body, compresslevel=current_app.config['COMPRESS_GZIP_LEVEL'], mtime=0)
+
+
+def _accepted_encoding():
+    return request.accept_encodings.best_match(_encodings())
+
+
+def _compressible(response):
+    return (
+        response.status_code == 200
+        and not response.direct_passthrough
+        and not response.is_streamed
+        and 'Content-Encoding' not in response.headers
+        and response.mimetype in current_app.config['COMPRESS_MIMETYPES']
+    )
+
+
+def _set_encoded_body(response, body, encoding):
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    # ETags set by conditional() are weak, so they stay valid across encodings
+    response.vary.add('Accept-Encoding')
+
+
+def compress_response(response):
+    """after_request hook compressing large buffered responses."""
+    if not _compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.content_length is not None and response.content_length < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+    encoding = _accepted_encoding()
+    if not encoding:
+        return response
+    started = time.perf_counter()
+    _set_encoded_body(response, compress(response.get_data(), encoding), encoding)
+    stats = g.get('request_stats')
+    if stats is not None:
+        stats['compress_seconds'] += time.perf_counter() - started
+    return response
+
+
+def init_compression(app):
+    """Register response compression on the app."""
+    app.after_request(compress_response)
+
+
+def _cache_key():
+    # conditional() exposes the ETag of the current data version, which keeps
+    # entries from outliving the data; otherwise the timeout bounds staleness
+    payload = f"{get_jwt_identity()}|{request.full_path}|{g.get('data_etag', '')}"
+    return CACHE_KEY.format(digest=hashlib.sha1(payload.encode('utf-8')).hexdigest())
+
+
+def _cache_entry(response):
+    body = response.get_data()
+    entry = {
+        'body': body,
+        'mimetype': response.mimetype,
+        'encoded': {},
+    }
+    if len(body) >= current_app.config['COMPRESS_MIN_SIZE']:
+        entry['encoded'] = {encoding: compress(body, encoding) for encoding in _encodings()}
+    return entry
+
+
+def _response_from_entry(entry):
+    response = current_app.response_class(entry['body'], mimetype=entry['mimetype'])
+    response.vary.add('Accept-Encoding')
+    encoding = _accepted_encoding()
+    if encoding in entry['encoded']:
+        _set_encoded_body(response, entry['encoded'][encoding], encoding)
+    return response
+
+
+def cached_response(timeout=None):
+    """
+    Cache a GET view's 200 response per user and URL, with its compressed bytes.
+
+    Must be applied below `jwt_required()` (and below `conditional()` when
+    both are used); the view may be sync or async.
+
+    Args:
+        timeout: Seconds an entry is kept; defaults to COMPRESS_CACHE_TIMEOUT
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if request.method != 'GET':
+                return current_app.ensure_sync(f)(*args, **kwargs)
+
+            key = _cache_key()
+            entry = cache.get(key)
+            if entry is None:
+                response = current_app.make_response(current_app.ensure_sync(f)(*args, **kwargs))
+                if not _compressible(response):
+                    return response
+                entry = _cache_entry(response)
+                try:
+                    cache.set(key, entry, timeout=timeout or current_app.config['COMPRESS_CACHE_TIMEOUT'])
+                except Exception as e:
+                    logger.warning(f"Could not cache response for {request.full_path}: {str(e)}")
+            return _response_from_entry(entry)
+        return decorated
+    return decorator
@@ -0,0 +1,143 @@
+"""
+HTTP conditional requests (ETag / Last-Modified) for polled GET endpoints.
+
+A view decorated with `conditional(version)` first computes a cheap
+version of the data it would return (indexed MAX/COUNT queries and/or a
+table version counter). The ETag is derived from that version, the user
+and the full request path, so a client revalidating with If-None-Match
+gets a 304 before the view queries or serializes anything.
+"""
+import hashlib
+import logging
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, g, has_app_context, request
+from flask_jwt_extended import get_jwt_identity
+from redis import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'etag:version:{table}'
+
+# Tables whose ORM writes bump a version counter; rows that are edited in
+# place without an updated_at column are otherwise invisible to MAX queries
+VERSIONED_TABLES = {'content_idea', 'trend', 'optimization_tip'}
+
+# Version part that cannot be read; conditional() then serves the request
+# without validators rather than risk a stale 304
+UNKNOWN_VERSION = object()
+
+
+def table_version(table):
+    """Counter bumped on every committed ORM write to `table`, or UNKNOWN_VERSION if Redis fails."""
+    try:
+        value = current_app.redis.get(VERSION_KEY.format(table=table))
+    except RedisError as e:
+        logger.warning(f"Could not read the ETag version of {table}: {str(e)}")
+        return UNKNOWN_VERSION
+    return int(value) if value else 0
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_written_tables(session, flush_context):
+    written = session.info.setdefault('etag_written_tables', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, '__tablename__', None)
+        if table in VERSIONED_TABLES:
+            written.add(table)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_table_versions(session):
+    written = session.info.pop('etag_written_tables', None)
+    if not written or not has_app_context():
+        return
+    try:
+        pipeline = current_app.redis.pipeline()
+        for table in written:
+            pipeline.incr(VERSION_KEY.format(table=table))
+        pipeline.execute()
+    except Exception as e:
+        logger.warning(f"Could not bump ETag versions of {sorted(written)}: {str(e)}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_written_tables(session):
+    session.info.pop('etag_written_tables', None)
+
+
+def _unknown(version):
+    values = version if isinstance(version, tuple) else (version,)
+    return any(value is UNKNOWN_VERSION for value in values)
+
+
+def _etag(version, user_id):
+    payload = f"{version!r}|{user_id}|{request.full_path}"
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _utc(stamp):
+    # Naive columns hold UTC (datetime.utcnow and the daily stats triggers)
+    if stamp.tzinfo is None:
+        return stamp.replace(tzinfo=timezone.utc)
+    return stamp.astimezone(timezone.utc)
+
+
+def _last_modified(version):
+    """Latest datetime in the version as aware UTC, never later than now."""
+    values = version if isinstance(version, tuple) else (version,)
+    stamps = [_utc(value) for value in values if isinstance(value, datetime)]
+    if not stamps:
+        return None
+    return min(max(stamps), datetime.now(timezone.utc)).replace(microsecond=0)
+
+
+def conditional(version):
+    """
+    Answer GET requests with 304 Not Modified while the data version is unchanged.
+
+    Must be applied below `jwt_required()`; the view and `version` may be
+    sync or async.
+
+    Args:
+        version: Callable taking the user id and returning a cheap, hashable
+            snapshot of the data behind the response; datetimes in it also
+            set Last-Modified (naive ones are taken as UTC). A version
+            containing UNKNOWN_VERSION skips validation for that request
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if request.method != 'GET':
+                return current_app.ensure_sync(f)(*args, **kwargs)
+
+            user_id = get_jwt_identity()
+            current = current_app.ensure_sync(version)(int(user_id))
+            if _unknown(current):
+                response = current_app.make_response(current_app.ensure_sync(f)(*args, **kwargs))
+                response.headers['Cache-Control'] = 'private, no-cache'
+                return response
+            etag = _etag(current, user_id)
+            last_modified = _last_modified(current)
+            g.data_etag = etag
+
+            if request.if_none_match.contains_weak(etag) or (
+                not request.if_none_match and last_modified and request.if_modified_since
+                and last_modified <= _utc(request.if_modified_since)
+            ):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(current_app.ensure_sync(f)(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,91 @@
+"""
+Read/write routing between the primary database and a read replica.
+
+Requests opted in with `use_replica` (or blueprints registered with
+`route_reads_to_replica`) send their ORM reads to the `replica` bind.
+Anything that flushes, every read after a request's first write (so it
+sees that write despite replica lag), and every request when no healthy
+replica is configured, stays on the primary.
+"""
+import logging
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+
+_health = {'ok': True, 'checked_at': None}
+_health_lock = threading.Lock()
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica when the request allows it."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and g.get('db_use_replica'):
+            if isinstance(clause, UpdateBase):
+                g.db_use_replica = False
+            elif not self._flushing and not (self.new or self.dirty or self.deleted):
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def flush(self, objects=None):
+        # Pin the rest of the request to the primary once it has written
+        if has_app_context() and g.get('db_use_replica') and (self.new or self.dirty or self.deleted):
+            g.db_use_replica = False
+        super().flush(objects=objects)
+
+
+def replica_available():
+    """
+    Whether a replica is configured and answered its last health check.
+
+    The check runs at most once per DB_REPLICA_HEALTHCHECK_INTERVAL, so an
+    unreachable replica costs one failed connect per interval, not one per
+    request.
+    """
+    if REPLICA_BIND not in (current_app.config.get('SQLALCHEMY_BINDS') or {}):
+        return False
+
+    interval = current_app.config.get('DB_REPLICA_HEALTHCHECK_INTERVAL', 30)
+    now = time.monotonic()
+    if _health['checked_at'] is not None and now - _health['checked_at'] < interval:
+        return _health['ok']
+
+    with _health_lock:
+        if _health['checked_at'] is not None and now - _health['checked_at'] < interval:
+            return _health['ok']
+        from app.extensions import db
+        try:
+            with db.engines[REPLICA_BIND].connect() as connection:
+                connection.execute(text('SELECT 1'))
+            ok = True
+        except Exception as e:
+            logger.warning(f"Read replica unavailable, falling back to primary: {str(e)}")
+            ok = False
+        _health.update(ok=ok, checked_at=now)
+    return ok
+
+
+def use_replica(f):
+    """Route the ORM reads of a view to the read replica when it is healthy."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        g.db_use_replica = replica_available()
+        return f(*args, **kwargs)
+    return decorated
+
+
+def route_reads_to_replica(bp):
+    """Send the reads of every GET request handled by `bp` to the replica."""
+    @bp.before_request
+    def _route_reads():
+        if request.method == 'GET':
+            g.db_use_replica = replica_available()
@@ -0,0 +1,39 @@
+"""
+Sparse fieldsets (`fields=`) and include flags (`include=`) for GET endpoints.
+
+Both parameters take comma separated names. When a parameter is absent the
+endpoint's default applies, so existing clients keep the full response;
+`include=` with an empty value turns every optional block off.
+"""
+from flask import request
+
+
+def parse_fieldset(param, allowed, default=None):
+    """
+    Read a comma separated fieldset from the query string.
+
+    Args:
+        param: Query parameter name, e.g. 'fields' or 'include'
+        allowed: Names the endpoint knows about
+        default: Names used when the parameter is absent; defaults to `allowed`
+
+    Returns:
+        frozenset: Requested names
+
+    Raises:
+        ValueError: If an unknown name is requested
+    """
+    raw = request.args.get(param)
+    if raw is None:
+        return frozenset(allowed if default is None else default)
+
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = sorted(names - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown {param}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return frozenset(names)
+
+
+def select_fields(data, fields):
+    """Keep only the requested top-level keys of a response block."""
+    return {key: value for key, value in data.items() if key in fields}
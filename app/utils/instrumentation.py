@@ -0,0 +1,200 @@
+"""
+Request latency, SQL, cache and Redis instrumentation.
+
+Every request is timed per endpoint, and the SQL statements, cache lookups
+and Redis round trips it triggers are counted and timed through SQLAlchemy
+engine events, a cache backend proxy and an instrumented Redis client.
+Totals are exposed in Prometheus text format on `/metrics`; in debug mode
+(or with METRICS_SERVER_TIMING) each response also carries a
+`Server-Timing` header with the per-request breakdown.
+
+When PROMETHEUS_MULTIPROC_DIR is set (e.g. under gunicorn), `/metrics`
+aggregates the samples of all worker processes.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+from redis import Redis
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency', ['endpoint', 'method', 'status'],
+    buckets=LATENCY_BUCKETS
+)
+DB_STATEMENTS = Histogram(
+    'http_request_db_statements', 'SQL statements executed per request', ['endpoint'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250)
+)
+DB_TIME = Histogram(
+    'http_request_db_seconds', 'Time spent in SQL per request', ['endpoint'], buckets=LATENCY_BUCKETS
+)
+CACHE_LOOKUPS = Counter('cache_lookups_total', 'Cache lookups', ['endpoint', 'result'])
+REDIS_ROUND_TRIPS = Counter('redis_round_trips_total', 'Redis round trips', ['endpoint'])
+REDIS_TIME = Counter('redis_seconds_total', 'Time spent waiting on Redis', ['endpoint'])
+
+
+def _request_stats():
+    """Per-request counters, or None outside an instrumented request."""
+    if not has_request_context():
+        return None
+    return g.get('request_stats')
+
+
+def _endpoint():
+    return request.endpoint or 'unmatched'
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats() is not None:
+        conn.info.setdefault('request_stats_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats()
+    started = conn.info.get('request_stats_started')
+    if stats is None or not started:
+        return
+    stats['db_statements'] += 1
+    stats['db_seconds'] += time.perf_counter() - started.pop()
+
+
+@contextmanager
+def _redis_round_trip():
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _request_stats()
+        if stats is not None:
+            stats['redis_round_trips'] += 1
+            stats['redis_seconds'] += time.perf_counter() - started
+
+
+class InstrumentedRedis(Redis):
+    """Redis client counting and timing round trips of the current request."""
+
+    def execute_command(self, *args, **options):
+        with _redis_round_trip():
+            return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def timed_execute(raise_on_error=True):
+            with _redis_round_trip():
+                return execute(raise_on_error)
+
+        pipe.execute = timed_execute
+        return pipe
+
+
+class InstrumentedCache:
+    """Proxy of a Flask-Caching backend counting hits and misses of `get`."""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def get(self, key):
+        value = self._backend.get(key)
+        stats = _request_stats()
+        if stats is not None:
+            stats['cache_hits' if value is not None else 'cache_misses'] += 1
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+
+def _start_request():
+    g.request_stats = {
+        'started': time.perf_counter(),
+        'db_statements': 0,
+        'db_seconds': 0.0,
+        'cache_hits': 0,
+        'cache_misses': 0,
+        'redis_round_trips': 0,
+        'redis_seconds': 0.0,
+        'compress_seconds': 0.0,
+    }
+
+
+def _server_timing(stats, total):
+    return ', '.join([
+        f'db;dur={stats["db_seconds"] * 1000:.1f};desc="{stats["db_statements"]} queries"',
+        f'redis;dur={stats["redis_seconds"] * 1000:.1f};desc="{stats["redis_round_trips"]} round trips"',
+        f'cache;desc="{stats["cache_hits"]} hits, {stats["cache_misses"]} misses"',
+        f'compress;dur={stats["compress_seconds"] * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ])
+
+
+def _finish_request(response):
+    stats = g.pop('request_stats', None)
+    if stats is None or request.endpoint == 'metrics':
+        return response
+
+    total = time.perf_counter() - stats['started']
+    endpoint = _endpoint()
+    REQUEST_LATENCY.labels(endpoint, request.method, str(response.status_code)).observe(total)
+    DB_STATEMENTS.labels(endpoint).observe(stats['db_statements'])
+    DB_TIME.labels(endpoint).observe(stats['db_seconds'])
+    if stats['cache_hits']:
+        CACHE_LOOKUPS.labels(endpoint, 'hit').inc(stats['cache_hits'])
+    if stats['cache_misses']:
+        CACHE_LOOKUPS.labels(endpoint, 'miss').inc(stats['cache_misses'])
+    if stats['redis_round_trips']:
+        REDIS_ROUND_TRIPS.labels(endpoint).inc(stats['redis_round_trips'])
+        REDIS_TIME.labels(endpoint).inc(stats['redis_seconds'])
+
+    if current_app.debug or current_app.config.get('METRICS_SERVER_TIMING'):
+        response.headers['Server-Timing'] = _server_timing(stats, total)
+    return response
+
+
+def metrics():
+    """Prometheus scrape endpoint."""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return Response(status=401)
+
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_instrumentation(app, cache):
+    """Install request hooks, the cache proxy and the `/metrics` endpoint."""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    # First before_request hook, so requests rejected by the rate limiter's
+    # hooks (429) are timed and counted too
+    app.before_request_funcs.setdefault(None, []).insert(0, _start_request)
+    # after_request hooks run in reverse registration order; going first in
+    # the list makes this one run last, so the totals include compression
+    app.after_request_funcs.setdefault(None, []).insert(0, _finish_request)
+
+    backends = app.extensions.get('cache', {})
+    if cache in backends and not isinstance(backends[cache], InstrumentedCache):
+        backends[cache] = InstrumentedCache(backends[cache])
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
+    limiter = getattr(app, 'limiter', None)
+    if limiter is not None:
+        limiter.exempt(metrics)
@@ -0,0 +1,74 @@
+"""
+JSON provider backed by orjson.
+
+orjson serializes datetime, date, UUID and dataclasses natively and is
+several times faster than the stdlib encoder on large list responses.
+Dates are written as ISO 8601, the same as the `isoformat()` the routes
+used to call per field. When orjson is not installed the stdlib encoder
+is used with the same conversions.
+"""
+import decimal
+import json
+import uuid
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def json_default(value):
+    """Convert the values neither encoder handles natively."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_line(obj):
+    """Compact, single-line UTF-8 JSON of `obj`, encoded as the provider does (e.g. an NDJSON record)."""
+    if orjson is None:
+        return json.dumps(obj, default=json_default, ensure_ascii=False).encode()
+    return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson when available."""
+
+    default = staticmethod(json_default)
+
+    def _orjson_options(self):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=json_default, option=self._orjson_options()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # Hand orjson's bytes to the response as-is, skipping a decode/encode round trip
+        body = orjson.dumps(obj, default=json_default, option=self._orjson_options())
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,122 @@
+"""
+N+1 query detector for development and test runs.
+
+Counts the statements of each request by shape (see `query_shape`) and
+reports shapes executed more than NPLUSONE_THRESHOLD times, the signature
+of a per-row lazy load inside a loop. Reports are logged, or raised as
+`NPlusOneError` with NPLUSONE_RAISE so a test exercising the endpoint
+fails. Outside requests, wrap a code path in `detect_nplusone()`.
+
+Enabled with NPLUSONE_DETECT; it is on by default in the testing config.
+The engine listener is only installed once detection is enabled, so the
+statements of other processes pay nothing for it.
+"""
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.query_audit import query_shape
+
+logger = logging.getLogger(__name__)
+
+
+class NPlusOneError(Exception):
+    """Raised when a query shape repeats more often than the threshold allows."""
+
+    def __init__(self, where, offenders):
+        self.where = where
+        self.offenders = offenders
+        details = '; '.join(f"{count}x {shape}" for shape, count in offenders)
+        super().__init__(f"Repeated queries in {where}: {details}")
+
+
+# Counters of the enclosing detect_nplusone() blocks, innermost last; per
+# thread and per asyncio task, so concurrent requests do not share them
+_active_counters = ContextVar('nplusone_active_counters', default=())
+
+
+def _current_counter():
+    counters = _active_counters.get()
+    if counters:
+        return counters[-1]
+    if has_request_context():
+        return g.get('nplusone_shapes')
+    return None
+
+
+def _count_shape(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter()
+    if counter is not None:
+        counter[query_shape(statement)] += 1
+
+
+def _listen():
+    if not event.contains(Engine, 'before_cursor_execute', _count_shape):
+        event.listen(Engine, 'before_cursor_execute', _count_shape)
+
+
+def _offenders(counter, threshold):
+    return sorted(
+        ((shape, count) for shape, count in counter.items() if count > threshold),
+        key=lambda item: -item[1]
+    )
+
+
+def _report(where, counter, threshold, raise_error):
+    offenders = _offenders(counter, threshold)
+    if not offenders:
+        return
+    if raise_error:
+        raise NPlusOneError(where, offenders)
+    for shape, count in offenders:
+        logger.warning(f"[nplusone] {where} executed {count}x: {shape}")
+
+
+@contextmanager
+def detect_nplusone(threshold=None, raise_error=True, where='block'):
+    """
+    Detect repeated query shapes in the enclosed block.
+
+    Args:
+        threshold: Executions of one shape allowed; defaults to NPLUSONE_THRESHOLD
+        raise_error: Raise NPlusOneError instead of logging
+        where: Label used in the report
+    """
+    if threshold is None:
+        threshold = current_app.config.get('NPLUSONE_THRESHOLD', 5)
+    _listen()
+    counter = Counter()
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+    _report(where, counter, threshold, raise_error)
+
+
+def _start_request():
+    g.nplusone_shapes = Counter()
+
+
+def _check_request(response):
+    counter = g.pop('nplusone_shapes', None)
+    if counter:
+        _report(
+            f"{request.method} {request.path}", counter,
+            current_app.config['NPLUSONE_THRESHOLD'], current_app.config['NPLUSONE_RAISE']
+        )
+    return response
+
+
+def init_nplusone(app):
+    """Check every request for repeated query shapes when NPLUSONE_DETECT is on."""
+    if not app.config.get('NPLUSONE_DETECT'):
+        return
+    _listen()
+    app.before_request(_start_request)
+    app.after_request(_check_request)
@@ -0,0 +1,264 @@
+"""
+Sampling profiler for slow requests and background jobs.
+
+While profiling is enabled, a background thread samples the stack of every
+in-flight request every PROFILE_INTERVAL_MS. When the request finishes,
+its samples are kept only if it was slower than PROFILE_SLOW_MS or picked
+by PROFILE_SAMPLE_RATE. Kept samples are merged as collapsed stacks
+("frame;frame;frame count", the flame graph input format), keyed by
+endpoint, into a Redis hash or a `<endpoint>.folded` file under a
+directory.
+
+Async views run on an event loop thread shared by the requests of the
+process while the request thread waits. Samples of a loop thread go to
+the request whose task (or a task it spawned) is running at that moment.
+
+Settings come from the config and can be overridden at runtime through
+Redis (`flask profile enable`), so a running deployment can be profiled
+without a redeploy. Workers profile jobs with `profile_block()`.
+"""
+import asyncio
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, g, request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY = 'profile:stacks:{name}'
+SETTINGS_KEY = 'profile:settings'
+SETTINGS_REFRESH = 10  # seconds runtime overrides are cached per process
+
+_settings_cache = {'expires': 0.0, 'value': None}
+
+
+def _frame_label(frame):
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def collapse_stack(frame):
+    """Render a frame and its callers as 'outermost;...;innermost'."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """Samples the stacks of registered threads and asyncio tasks from a daemon thread."""
+
+    def __init__(self):
+        self._targets = {}
+        self._tasks = {}
+        self._loops = {}
+        self._lock = threading.Lock()
+        self._interval = 0.005
+        self._pid = None
+
+    def _ensure_running(self):
+        # The sampling thread does not survive a fork; start one per process
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        threading.Thread(target=self._run, name='stack-sampler', daemon=True).start()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            time.sleep(self._interval)
+            with self._lock:
+                targets = list(self._targets.items())
+                tasks = dict(self._tasks)
+                loops = list(self._loops.items()) if tasks else []
+            if not targets and not loops:
+                continue
+            frames = sys._current_frames()
+            for thread_id, counter in targets:
+                frame = frames.get(thread_id)
+                if frame is not None and thread_id != own_id:
+                    counter[collapse_stack(frame)] += 1
+            for thread_id, loop in loops:
+                counter = tasks.get(asyncio.current_task(loop))
+                frame = frames.get(thread_id)
+                if counter is not None and frame is not None:
+                    counter[collapse_stack(frame)] += 1
+
+    def add(self, interval_ms):
+        """Start sampling the calling thread; returns the Counter samples go to."""
+        counter = Counter()
+        with self._lock:
+            self._interval = max(interval_ms, 1) / 1000
+            self._ensure_running()
+            self._targets[threading.get_ident()] = counter
+        return counter
+
+    def remove(self):
+        """Stop sampling the calling thread."""
+        with self._lock:
+            return self._targets.pop(threading.get_ident(), None)
+
+    def add_task(self, task, counter):
+        """Send samples taken while `task` runs to `counter`; call from the task's loop."""
+        with self._lock:
+            self._tasks[task] = counter
+            self._loops[threading.get_ident()] = task.get_loop()
+
+    def remove_task(self, task):
+        with self._lock:
+            self._tasks.pop(task, None)
+
+    def task_counter(self, task):
+        return self._tasks.get(task)
+
+
+sampler = StackSampler()
+
+
+def profile_settings():
+    """Config settings merged with runtime overrides stored in Redis."""
+    now = time.monotonic()
+    if _settings_cache['value'] is not None and now < _settings_cache['expires']:
+        return _settings_cache['value']
+
+    config = current_app.config
+    settings = {
+        'enabled': config.get('PROFILE_ENABLED', False),
+        'sample_rate': config.get('PROFILE_SAMPLE_RATE', 0.0),
+        'slow_ms': config.get('PROFILE_SLOW_MS', 1000),
+        'interval_ms': config.get('PROFILE_INTERVAL_MS', 5),
+        'output': config.get('PROFILE_OUTPUT', 'redis'),
+        'ttl': config.get('PROFILE_TTL', 86400),
+    }
+    try:
+        overrides = current_app.redis.hgetall(SETTINGS_KEY)
+    except Exception as e:
+        logger.warning(f"Could not read profiler settings: {str(e)}")
+        overrides = {}
+    for key, value in overrides.items():
+        key = key.decode()
+        if key == 'enabled':
+            settings[key] = value == b'1'
+        elif key == 'output':
+            settings[key] = value.decode()
+        elif key in settings:
+            settings[key] = float(value)
+
+    _settings_cache.update(value=settings, expires=now + SETTINGS_REFRESH)
+    return settings
+
+
+def _file_name(name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name) + '.folded'
+
+
+def save_stacks(name, stacks, settings):
+    """Merge collapsed stacks into the profile of `name`."""
+    if not stacks:
+        return
+    output = settings['output']
+    try:
+        if output == 'redis':
+            key = PROFILE_KEY.format(name=name)
+            pipeline = current_app.redis.pipeline(transaction=False)
+            for stack, count in stacks.items():
+                pipeline.hincrby(key, stack, count)
+            pipeline.expire(key, int(settings['ttl']))
+            pipeline.execute()
+        else:
+            os.makedirs(output, exist_ok=True)
+            with open(os.path.join(output, _file_name(name)), 'a') as fh:
+                fh.writelines(f"{stack} {count}\n" for stack, count in stacks.items())
+    except Exception as e:
+        logger.warning(f"Could not save profile of {name}: {str(e)}")
+
+
+def load_stacks(name):
+    """Collapsed stacks recorded in Redis for `name`, most sampled first."""
+    stacks = current_app.redis.hgetall(PROFILE_KEY.format(name=name))
+    return sorted(((stack.decode(), int(count)) for stack, count in stacks.items()), key=lambda item: -item[1])
+
+
+def _keep(settings, elapsed):
+    return elapsed * 1000 >= settings['slow_ms'] or random.random() < settings['sample_rate']
+
+
+@contextmanager
+def profile_block(name):
+    """Profile the enclosed block under `name` when profiling is enabled."""
+    settings = profile_settings()
+    if not settings['enabled']:
+        yield
+        return
+
+    started = time.perf_counter()
+    sampler.add(settings['interval_ms'])
+    try:
+        yield
+    finally:
+        stacks = sampler.remove()
+        if _keep(settings, time.perf_counter() - started):
+            save_stacks(name, stacks, settings)
+
+
+def _start_request():
+    settings = profile_settings()
+    if settings['enabled']:
+        g.profile = (settings, time.perf_counter(), sampler.add(settings['interval_ms']))
+
+
+def _finish_request(exc):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return
+    sampler.remove()
+    settings, started, stacks = profile
+    if _keep(settings, time.perf_counter() - started):
+        save_stacks(request.endpoint or 'unmatched', stacks, settings)
+
+
+def _task_factory(loop, coro, **kwargs):
+    """Task factory attributing tasks spawned by a profiled task (e.g. gather) to its request."""
+    task = asyncio.Task(coro, loop=loop, **kwargs)
+    counter = sampler.task_counter(asyncio.current_task(loop))
+    if counter is not None:
+        sampler.add_task(task, counter)
+        task.add_done_callback(sampler.remove_task)
+    return task
+
+
+def _profiled_async_to_sync(async_to_sync):
+    """Wrap app.async_to_sync so an async view's task is sampled into its request."""
+    def wrapper(func):
+        @wraps(func)
+        async def profiled(*args, **kwargs):
+            # The view runs in a copy of the request's context
+            profile = g.get('profile')
+            if profile is None:
+                return await func(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            if loop.get_task_factory() is None:
+                loop.set_task_factory(_task_factory)
+            task = asyncio.current_task()
+            sampler.add_task(task, profile[2])
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                sampler.remove_task(task)
+        return async_to_sync(profiled)
+    return wrapper
+
+
+def init_profiling(app):
+    """Register the request hooks of the sampling profiler."""
+    app.before_request(_start_request)
+    app.teardown_request(_finish_request)
+    app.async_to_sync = _profiled_async_to_sync(app.async_to_sync)
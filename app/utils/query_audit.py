@@ -0,0 +1,111 @@
+"""
+Query-shape audit: capture the SQL an app code path executes.
+
+Statements are normalized into shapes (literals and bind values replaced,
+IN lists collapsed) and counted, so repeated per-row queries and filters
+missing a matching index stand out. Use `capture_queries()` around any
+code path, or `flask queries audit` to replay GET endpoints.
+"""
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+_IN_LIST = re.compile(r'\((?:\s*(?:%\([^)]+\)s|\?)\s*,?)+\)')
+_BIND = re.compile(r'%\([^)]+\)s|\?')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACE = re.compile(r'\s+')
+
+
+def query_shape(statement):
+    """Normalize a SQL statement so queries differing only in values compare equal."""
+    shape = _IN_LIST.sub('(?)', statement)
+    shape = _BIND.sub('?', shape)
+    shape = _STRING.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+class QueryAudit:
+    """Statements executed on a set of engines, grouped by shape."""
+
+    def __init__(self):
+        self.shapes = OrderedDict()
+
+    def record(self, statement, parameters, elapsed):
+        shape = query_shape(statement)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            entry = self.shapes[shape] = {
+                'shape': shape, 'count': 0, 'total_ms': 0.0,
+                'statement': statement, 'parameters': parameters,
+            }
+        entry['count'] += 1
+        entry['total_ms'] += elapsed * 1000
+
+    @property
+    def count(self):
+        return sum(entry['count'] for entry in self.shapes.values())
+
+    def report(self):
+        """Shapes ordered by execution count, then total time."""
+        return sorted(self.shapes.values(), key=lambda entry: (-entry['count'], -entry['total_ms']))
+
+    def explain(self, engine):
+        """
+        EXPLAIN one sample of each captured SELECT.
+
+        Args:
+            engine: Engine the samples are explained on
+
+        Returns:
+            dict: shape -> plan lines
+        """
+        plans = {}
+        with engine.connect() as connection:
+            for shape, entry in self.shapes.items():
+                if not shape.upper().startswith('SELECT'):
+                    continue
+                rows = connection.exec_driver_sql(f"EXPLAIN {entry['statement']}", entry['parameters'])
+                plans[shape] = [row[0] for row in rows]
+        return plans
+
+
+@contextmanager
+def capture_queries(engines=None):
+    """
+    Capture the statements executed inside the block.
+
+    Args:
+        engines: Engines to listen on (defaults to every configured bind,
+            sync and async)
+
+    Yields:
+        QueryAudit: Filled in as statements execute
+    """
+    if engines is None:
+        from app.extensions import db
+        from app.utils.async_clients import async_engines
+        engines = list(db.engines.values()) + [engine.sync_engine for engine in async_engines()]
+
+    audit = QueryAudit()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_audit_start', []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_audit_start'].pop()
+        audit.record(statement, parameters, time.perf_counter() - started)
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before)
+        event.listen(engine, 'after_cursor_execute', after)
+    try:
+        yield audit
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', before)
+            event.remove(engine, 'after_cursor_execute', after)
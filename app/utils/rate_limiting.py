@@ -0,0 +1,145 @@
+"""
+API rate limiting: per-user keys, plan-based limits and a local fast path.
+
+- Requests carrying a valid access token are limited per user (JWT
+  identity), anonymous ones per remote address.
+- The default limit depends on the user's subscription plan
+  (RATELIMIT_PLAN_LIMITS), falling back to RATELIMIT_DEFAULT, and to
+  RATELIMIT_ANONYMOUS without a token. The plan is stamped into access
+  tokens when they are issued, so limiting a request needs no query; a
+  plan change applies from the next token.
+- Counters use the moving-window strategy, which the Redis storage
+  evaluates atomically in one Lua script per limit.
+- When a key breaches a limit, this process remembers it until the window
+  frees up and rejects further requests of that key with 429 before
+  Flask-Limiter (and Redis) is consulted. At most BLOCKLIST_MAX_SIZE keys
+  are remembered; the ones unblocking soonest are dropped first.
+"""
+import logging
+import threading
+import time
+
+from flask import current_app, g, jsonify, request
+from flask_jwt_extended import decode_token
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+
+logger = logging.getLogger(__name__)
+
+PLAN_CLAIM = 'plan'
+BLOCKLIST_MAX_SIZE = 10000
+
+_blocked = {}
+_blocked_lock = threading.Lock()
+
+
+def _access_claims():
+    """Claims of the request's access token, decoded once; None for anonymous requests."""
+    if 'rate_limit_claims' not in g:
+        claims = None
+        header = request.headers.get('Authorization', '')
+        if header.startswith('Bearer '):
+            try:
+                token = decode_token(header[len('Bearer '):])
+                if token.get('type') == 'access':
+                    claims = token
+            except Exception:
+                claims = None
+        g.rate_limit_claims = claims
+    return g.rate_limit_claims
+
+
+def rate_limit_key():
+    """Limit authenticated requests per user and anonymous ones per address."""
+    claims = _access_claims()
+    return f"user:{claims['sub']}" if claims else f"ip:{get_remote_address()}"
+
+
+def user_plan(user_id):
+    """Name of the most expensive plan among the user's organizations."""
+    from app.extensions import db
+    from app.models.organization import Organization, Plan
+    from app.models.user import organization_users
+
+    try:
+        plan = db.session.query(Plan.name).join(
+            Organization, Organization.plan_id == Plan.id
+        ).join(
+            organization_users, organization_users.c.organization_id == Organization.id
+        ).filter(organization_users.c.user_id == user_id).order_by(Plan.price.desc()).limit(1).scalar()
+    except Exception as e:
+        logger.warning(f"Could not load the plan of user {user_id}: {str(e)}")
+        plan = None
+    return plan
+
+
+def plan_claims(identity):
+    """Claims added to every issued token: the plan the rate limiter reads."""
+    return {PLAN_CLAIM: user_plan(int(identity))}
+
+
+def plan_limit():
+    """Default limit of the current request, from the plan claim of its token."""
+    config = current_app.config
+    claims = _access_claims()
+    if not claims:
+        return config['RATELIMIT_ANONYMOUS']
+    plan = claims.get(PLAN_CLAIM)
+    return config['RATELIMIT_PLAN_LIMITS'].get((plan or '').lower(), config['RATELIMIT_DEFAULT'])
+
+
+def config_limit(name):
+    """Limit read from the config on each request, for `limiter.limit()`."""
+    return lambda: current_app.config[name]
+
+
+def _remember_breach(request_limit):
+    with _blocked_lock:
+        if len(_blocked) >= BLOCKLIST_MAX_SIZE:
+            now = time.time()
+            for key in [key for key, until in _blocked.items() if until <= now]:
+                del _blocked[key]
+        if len(_blocked) >= BLOCKLIST_MAX_SIZE:
+            # Still full: forget the keys unblocking soonest; Redis keeps limiting them
+            excess = len(_blocked) - BLOCKLIST_MAX_SIZE + 1
+            for key in sorted(_blocked, key=_blocked.get)[:excess]:
+                del _blocked[key]
+        _blocked[(rate_limit_key(), request.endpoint)] = request_limit.reset_at
+
+
+def _reject_blocked():
+    """Answer 429 locally while a key is known to be over its limit."""
+    limiter = getattr(current_app, 'limiter', None)
+    if limiter is None or not limiter.enabled:
+        return None
+    key = (rate_limit_key(), request.endpoint)
+    until = _blocked.get(key)
+    if until is None:
+        return None
+    retry_after = until - time.time()
+    if retry_after <= 0:
+        _blocked.pop(key, None)
+        return None
+    response = jsonify({"error": "Rate limit exceeded"})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(int(retry_after) + 1)
+    return response
+
+
+def init_rate_limiting(app):
+    """Create the app's Limiter (stored as app.limiter), its local fast path and the plan claim."""
+    from app.extensions import jwt
+    jwt.additional_claims_loader(plan_claims)
+
+    # Registered before the limiter's own hook so blocked keys never reach Redis
+    app.before_request(_reject_blocked)
+    limiter = Limiter(
+        rate_limit_key,
+        app=app,
+        storage_uri=app.config.get('RATELIMIT_STORAGE_URI') or app.config.get('REDIS_URL', 'redis://localhost:6379/0'),
+        strategy=app.config.get('RATELIMIT_STRATEGY', 'moving-window'),
+        default_limits=[plan_limit],
+        on_breach=_remember_breach,
+    )
+    app.limiter = limiter
+    return limiter
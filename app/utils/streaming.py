@@ -0,0 +1,71 @@
+"""
+Streaming CSV / NDJSON responses over server-side database cursors.
+
+Rows are pulled from the cursor `batch_size` at a time and each batch is
+encoded and sent before the next is fetched, so memory stays flat no matter
+how many rows the query returns.
+"""
+import csv
+import io
+from datetime import date, datetime
+
+from flask import Response, stream_with_context
+
+from app.extensions import db
+from app.utils.json_provider import dumps_line
+
+STREAM_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def iter_batches(stmt, batch_size):
+    """Execute `stmt` on a server-side cursor and yield lists of row mappings."""
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.mappings().partitions():
+        yield partition
+
+
+def encode_csv(batches, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [row[column].isoformat() if isinstance(row[column], (datetime, date)) else row[column]
+             for column in columns]
+            for row in batch
+        )
+        yield buffer.getvalue()
+
+
+def encode_ndjson(batches, columns):
+    for batch in batches:
+        yield b''.join(dumps_line({column: row[column] for column in columns}) + b'\n' for row in batch)
+
+
+def stream_rows(stmt, fmt, filename, batch_size=1000):
+    """
+    Stream the rows of a SELECT as a CSV or NDJSON attachment.
+
+    Args:
+        stmt: Core SELECT whose columns become the exported fields
+        fmt: 'csv' or 'ndjson'
+        filename: Download name, without extension
+        batch_size: Rows fetched from the cursor per chunk
+
+    Returns:
+        Response: Streaming response
+    """
+    columns = [column.name for column in stmt.selected_columns]
+    encode = encode_csv if fmt == 'csv' else encode_ndjson
+    body = encode(iter_batches(stmt, batch_size), columns)
+    return Response(
+        stream_with_context(body),
+        mimetype=STREAM_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}.{fmt}"'}
+    )
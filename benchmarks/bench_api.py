@@ -0,0 +1,172 @@
+"""
+Benchmark latency and queries-per-request of the API hot paths.
+
+Replays the analytics, social-accounts metrics, recommendations and auth
+endpoints in-process against the dataset from `datagen.py`, and reports
+p50/p95 latency and SQL statements per request. Results are written as
+JSON; pass an earlier result with --compare to flag regressions:
+
+    python benchmarks/datagen.py --users 10 --days 365 --posts-per-page 100 --comments-per-post 5
+    python benchmarks/bench_api.py --compare benchmarks/baselines/api.json
+
+benchmarks/baselines/api.json was recorded on that dataset (Postgres 16,
+Redis, development config); record a new baseline with --output when
+the dataset or machine changes.
+
+Response caches are cleared before every request unless --warm is given,
+so the numbers reflect the work behind each endpoint.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.extensions import cache  # noqa: E402
+from app.utils.query_audit import capture_queries  # noqa: E402
+from datagen import EMAIL, PASSWORD  # noqa: E402
+
+ENDPOINTS = (
+    ('auth.login', 'POST', '/api/auth/login'),
+    ('analytics.overview', 'GET', '/api/analytics/'),
+    ('analytics.score', 'GET', '/api/analytics/score'),
+    ('social_accounts.list', 'GET', '/api/social-accounts/'),
+    ('social_accounts.metrics_basic', 'GET', '/api/social-accounts/metrics/basic'),
+    ('social_accounts.metrics_summary', 'GET', '/api/social-accounts/metrics/basic?fields=platforms'),
+    ('recommendations.content_ideas', 'GET', '/api/recommendations/content-ideas?per_page=50'),
+    ('recommendations.saved_ideas', 'GET', '/api/recommendations/content-ideas/saved'),
+    ('recommendations.calendar', 'GET', '/api/recommendations/calendar?per_page=50'),
+    ('recommendations.optimization', 'GET', '/api/recommendations/optimization'),
+    ('recommendations.trends', 'GET', '/api/recommendations/trends?per_page=50'),
+)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def login(client, index):
+    response = client.post('/api/auth/login', json={'email': EMAIL.format(index=index), 'password': PASSWORD})
+    if response.status_code != 200:
+        sys.exit(f"Login as {EMAIL.format(index=index)} failed ({response.status_code}); run datagen.py first")
+    return {'Authorization': f"Bearer {response.get_json()['tokens']['access_token']}"}
+
+
+def run_endpoint(client, method, path, users, requests, warmup, warm):
+    timings, queries, statuses = [], [], set()
+    for number in range(warmup + requests):
+        index = number % len(users)
+        if not warm:
+            cache.clear()
+        with capture_queries() as audit:
+            started = time.perf_counter()
+            if method == 'POST':
+                response = client.post(path, json={'email': EMAIL.format(index=index), 'password': PASSWORD})
+            else:
+                response = client.get(path, headers=users[index])
+            elapsed = time.perf_counter() - started
+        if number < warmup:
+            continue
+        timings.append(elapsed * 1000)
+        queries.append(audit.count)
+        statuses.add(response.status_code)
+    return {
+        'p50_ms': round(percentile(timings, 0.50), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'queries': round(statistics.fmean(queries), 1),
+        'max_queries': max(queries),
+        'statuses': sorted(statuses),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_regression):
+    """Print deltas against a baseline; returns the endpoints that regressed."""
+    regressed = []
+    for name, current in results['endpoints'].items():
+        previous = baseline['endpoints'].get(name)
+        if not previous:
+            continue
+        change = (current['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] if previous['p95_ms'] else 0
+        more_queries = current['max_queries'] > previous['max_queries']
+        flag = ''
+        if change > max_regression or more_queries:
+            regressed.append(name)
+            flag = '  REGRESSION'
+        print(f"  {name:36} p95 {previous['p95_ms']:8.1f} -> {current['p95_ms']:8.1f} ms ({change:+.0%}), "
+              f"queries {previous['queries']} -> {current['queries']}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default=os.getenv('FLASK_ENV', 'development'))
+    parser.add_argument('--requests', type=int, default=50, help='Measured requests per endpoint.')
+    parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per endpoint.')
+    parser.add_argument('--users', type=int, default=5, help='Benchmark users requests rotate through.')
+    parser.add_argument('--endpoint', action='append', help='Only run endpoints whose name starts with this.')
+    parser.add_argument('--warm', action='store_true', help='Keep response caches between requests.')
+    parser.add_argument('--output', default=None, help='Result file (default benchmarks/results/api-<time>.json).')
+    parser.add_argument('--compare', default=None, help='Earlier result file to compare against.')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='Allowed p95 increase before failing.')
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    app.limiter.enabled = False
+    app.app_context().push()
+    client = app.test_client()
+    endpoints = [
+        endpoint for endpoint in ENDPOINTS
+        if not args.endpoint or any(endpoint[0].startswith(prefix) for prefix in args.endpoint)
+    ]
+
+    users = [login(client, index) for index in range(args.users)]
+    results = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'config': args.config,
+            'requests': args.requests,
+            'warm': args.warm,
+        },
+        'endpoints': {},
+    }
+    for name, method, path in endpoints:
+        stats = run_endpoint(client, method, path, users, args.requests, args.warmup, args.warm)
+        results['endpoints'][name] = stats
+        print(f"{name:36} p50 {stats['p50_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms  "
+              f"{stats['queries']:5} queries  {stats['statuses']}")
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results', f"api-{datetime.utcnow():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as fh:
+        json.dump(results, fh, indent=2)
+    print(f"Saved {output}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        print(f"Compared with {args.compare} ({baseline['meta'].get('revision')})")
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""
+Micro-benchmarks for the collector and rollup computations: throughput and peak memory.
+
+In-process cases time the per-row work of a collection run on generated
+API payloads, outside Flask and the database. SQL cases time the
+set-based aggregates against the dataset from `datagen.py` and roll
+back after every run, so they can be repeated:
+
+    python benchmarks/bench_compute.py --sizes 10000 100000 1000000
+    python benchmarks/bench_compute.py --case normalize --sizes 1000000 --repeat 1
+    python benchmarks/bench_compute.py --compare benchmarks/baselines/compute.json
+
+Cases:
+
+    normalize        instagram._normalize_media + content hash of raw media items
+    engagement_rate  storage._engagement_rate of normalized posts
+    changed_posts    base.changed_posts against stored content hashes (half changed)
+    daily_metrics    storage.upsert_daily_metrics of the first N pages (SQL)
+    org_rollup       full organization_stats_service rebuild of an organization
+                     whose members own the first N pages (SQL)
+
+For the SQL cases, the size is the page count, capped at the pages in the
+dataset. Peak memory is the tracemalloc peak of one measured run.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.collectors.base import POST_HASH_FIELDS, changed_posts, hashed  # noqa: E402
+from app.collectors.instagram import _normalize_media  # noqa: E402
+from app.collectors.storage import _engagement_rate  # noqa: E402
+
+WORDS = (
+    'amei', 'ótimo', 'incrível', 'péssimo', 'horrível', 'bom', 'ruim', 'produto', 'entrega', 'atendimento',
+    'great', 'love', 'terrible', 'worst', 'nice', 'post', 'video', 'price', 'quality', 'thanks',
+)
+MEDIA_TYPES = ('IMAGE', 'VIDEO', 'CAROUSEL_ALBUM')
+SQL_CASES = ('daily_metrics', 'org_rollup')
+
+
+def media_items(rows, rng):
+    started = datetime(2024, 1, 1)
+    return [{
+        'id': str(10 ** 15 + index),
+        'caption': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 30))),
+        'media_type': rng.choice(MEDIA_TYPES),
+        'media_url': f"https://cdn.example.com/media/{index}.jpg",
+        'permalink': f"https://instagram.com/p/{index}",
+        'timestamp': (started + timedelta(minutes=index)).strftime('%Y-%m-%dT%H:%M:%S+0000'),
+        'like_count': rng.randint(0, 5000),
+        'comments_count': rng.randint(0, 300),
+    } for index in range(rows)]
+
+
+def normalized_posts(rows, rng):
+    return [hashed(_normalize_media(item), POST_HASH_FIELDS) for item in media_items(rows, rng)]
+
+
+def normalize_case(rows, rng):
+    items = media_items(rows, rng)
+    return lambda: [hashed(_normalize_media(item), POST_HASH_FIELDS) for item in items]
+
+
+def engagement_rate_case(rows, rng):
+    posts = normalized_posts(rows, rng)
+    followers = rng.randint(1000, 500000)
+    return lambda: [_engagement_rate(post, followers) for post in posts]
+
+
+def changed_posts_case(rows, rng):
+    posts = normalized_posts(rows, rng)
+    state = {'post_hashes': {
+        post['post_id']: post['content_hash'] if index % 2 else 'stale'
+        for index, post in enumerate(posts)
+    }}
+    return lambda: changed_posts(posts, state)
+
+
+def _page_ids(rows):
+    from sqlalchemy import select
+
+    from app.extensions import db
+    from app.models.social_media import SocialPage
+
+    return db.session.execute(select(SocialPage.id).order_by(SocialPage.id).limit(rows)).scalars().all()
+
+
+def daily_metrics_case(rows, rng):
+    from app.collectors.storage import upsert_daily_metrics
+
+    page_ids = _page_ids(rows)
+    return lambda: upsert_daily_metrics(page_ids, date.today())
+
+
+def org_rollup_case(rows, rng):
+    from sqlalchemy import select
+
+    from app.extensions import db
+    from app.models.organization import Organization
+    from app.models.social_media import SocialPage
+    from app.models.user import User
+    from app.services.organization_stats_service import refresh_organization_stats
+
+    page_ids = _page_ids(rows)
+    user_ids = db.session.execute(
+        select(SocialPage.user_id).where(SocialPage.id.in_(page_ids)).distinct()
+    ).scalars().all()
+
+    def run():
+        organization = Organization(name='Benchmark agency')
+        organization.users.extend(User.query.filter(User.id.in_(user_ids)).all())
+        db.session.add(organization)
+        db.session.flush()
+        refresh_organization_stats(organization.id, full=True)
+    return run
+
+
+CASES = {
+    'normalize': normalize_case,
+    'engagement_rate': engagement_rate_case,
+    'changed_posts': changed_posts_case,
+    'daily_metrics': daily_metrics_case,
+    'org_rollup': org_rollup_case,
+}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(run, rows, repeat, reset=None):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+        if reset:
+            reset()
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if reset:
+        reset()
+
+    seconds = statistics.median(timings)
+    return {
+        'rows': rows,
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(rows / seconds) if seconds else None,
+        'peak_mb': round(peak / 2 ** 20, 1),
+    }
+
+
+def compare(results, baseline, max_regression):
+    """Print throughput deltas against a baseline; returns the cases that regressed."""
+    regressed = []
+    for name, current in results['cases'].items():
+        previous = baseline['cases'].get(name)
+        if not previous or not previous['rows_per_sec'] or not current['rows_per_sec']:
+            continue
+        change = current['rows_per_sec'] / previous['rows_per_sec'] - 1
+        flag = ''
+        if change < -max_regression:
+            regressed.append(name)
+            flag = '  REGRESSION'
+        print(f"  {name:28} {previous['rows_per_sec']:>12,} -> {current['rows_per_sec']:>12,} rows/s "
+              f"({change:+.0%}), peak {previous['peak_mb']} -> {current['peak_mb']} MB{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--case', action='append', choices=sorted(CASES), help='Limit to these cases.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--sql-sizes', type=int, nargs='+', default=[10, 100, 1000], help='Pages for SQL cases.')
+    parser.add_argument('--no-sql', action='store_true', help='Skip the cases that need the database.')
+    parser.add_argument('--config', default=os.getenv('FLASK_ENV', 'development'))
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per size; the median is reported.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help='Result file (default benchmarks/results/compute-<time>.json).')
+    parser.add_argument('--compare', default=None, help='Earlier result file to compare against.')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='Allowed throughput drop before failing.')
+    args = parser.parse_args()
+
+    names = [name for name in args.case or CASES if not (args.no_sql and name in SQL_CASES)]
+    reset = None
+    if any(name in SQL_CASES for name in names):
+        from app import create_app
+        from app.extensions import db
+
+        create_app(args.config).app_context().push()
+        reset = db.session.rollback
+
+    results = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'repeat': args.repeat,
+        },
+        'cases': {},
+    }
+    for name in names:
+        sql = name in SQL_CASES
+        for size in args.sql_sizes if sql else args.sizes:
+            run = CASES[name](size, random.Random(args.seed))
+            rows = len(_page_ids(size)) if sql else size
+            stats = measure(run, rows, args.repeat, reset=reset if sql else None)
+            results['cases'][f"{name}/{rows}"] = stats
+            print(f"{name:16} {rows:>10,} rows  {stats['rows_per_sec']:>12,} rows/s  "
+                  f"{stats['seconds']:8.3f}s  peak {stats['peak_mb']:8.1f} MB")
+            if sql and rows < size:
+                break
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results', f"compute-{datetime.utcnow():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as fh:
+        json.dump(results, fh, indent=2)
+    print(f"Saved {output}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        print(f"Compared with {args.compare} ({baseline['meta'].get('revision')})")
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark JSON encoding of large list responses.
+
+Compares the previous route style (per-field isoformat() and Flask's stdlib
+provider) with the shared serializers and FastJSONProvider:
+
+    python benchmarks/bench_json.py --rows 10000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app.serializers import serialize_content_idea  # noqa: E402
+from app.utils.json_provider import FastJSONProvider, orjson  # noqa: E402
+
+
+def make_ideas(count):
+    start = datetime(2024, 1, 1, 12, 30, 15, 123456)
+    return [
+        SimpleNamespace(
+            id=index,
+            title=f"Content idea {index}",
+            description="Short behind-the-scenes video showing how the product is made. " * 3,
+            platforms='instagram,facebook,tiktok',
+            content_type='video',
+            tags='engajamento,dicas,bastidores',
+            estimated_engagement='high',
+            created_at=start + timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def legacy_rows(ideas):
+    return [{
+        "id": idea.id,
+        "title": idea.title,
+        "description": idea.description,
+        "platforms": idea.platforms.split(',') if idea.platforms else [],
+        "contentType": idea.content_type,
+        "tags": idea.tags.split(',') if idea.tags else [],
+        "estimatedEngagement": idea.estimated_engagement,
+        "createdAt": idea.created_at.isoformat() if idea.created_at else None,
+        "isSaved": False
+    } for idea in ideas]
+
+
+def serialized_rows(ideas):
+    return [serialize_content_idea(idea) for idea in ideas]
+
+
+def measure(app, build_rows, ideas, repeat):
+    timings = []
+    with app.app_context():
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = app.json.response({"success": True, "data": build_rows(ideas)})
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, len(response.get_data())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if orjson is None:
+        sys.exit('orjson is not installed; FastJSONProvider would fall back to the stdlib encoder')
+
+    ideas = make_ideas(args.rows)
+
+    stdlib_app = Flask('bench_stdlib')
+    stdlib_app.json = DefaultJSONProvider(stdlib_app)
+    fast_app = Flask('bench_fast')
+    fast_app.json = FastJSONProvider(fast_app)
+
+    baseline_ms, baseline_size = measure(stdlib_app, legacy_rows, ideas, args.repeat)
+    fast_ms, fast_size = measure(fast_app, serialized_rows, ideas, args.repeat)
+
+    print(f"{args.rows} rows, median of {args.repeat} runs")
+    print(f"  stdlib + isoformat : {baseline_ms:8.1f} ms  ({baseline_size} bytes)")
+    print(f"  orjson provider    : {fast_ms:8.1f} ms  ({fast_size} bytes)")
+    print(f"  speedup            : {baseline_ms / fast_ms:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
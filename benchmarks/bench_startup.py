@@ -0,0 +1,109 @@
+"""
+Measure cold-start time of the web app and worker processes.
+
+Each target is started in a fresh interpreter with `python -X importtime`,
+several times, and reports the median wall time, the slowest top-level
+imports and any heavy module (pandas, pyarrow, scikit-learn, ...) that got
+imported at startup although it is only needed on first use:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --target web --budget-ms 1500
+
+Exits non-zero when a target exceeds --budget-ms or imports a heavy module.
+benchmarks/baselines/startup.json holds the last recorded run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CREATE_APP = "from app import create_app; create_app(); "
+TARGETS = {
+    'web': "import run",
+    'token-refresh': CREATE_APP + "import app.services.token_refresh_service",
+    'collector': CREATE_APP + "import app.collectors",
+    'export-worker': CREATE_APP + "import app.services.export_service",
+}
+
+# Only allowed once the code path that needs them runs
+HEAVY_MODULES = ('pandas', 'pyarrow', 'numpy', 'scipy', 'sklearn', 'nltk', 'transformers', 'torch')
+
+REPORT_HEAVY = (
+    "import sys, json; "
+    "print('__HEAVY__' + json.dumps(sorted(name for name in {heavy!r} if name in sys.modules)))"
+)
+
+
+def run_target(code, env):
+    """Start one interpreter; returns (wall seconds, importtime lines, heavy modules)."""
+    script = f"{code}; {REPORT_HEAVY.format(heavy=HEAVY_MODULES)}"
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        sys.exit(f"Target failed:\n{result.stderr[-2000:]}")
+    heavy = []
+    for line in result.stdout.splitlines():
+        if line.startswith('__HEAVY__'):
+            heavy = json.loads(line[len('__HEAVY__'):])
+    return elapsed, result.stderr.splitlines(), heavy
+
+
+def top_level_imports(lines, limit):
+    """Slowest top-level imports by cumulative microseconds."""
+    imports = []
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or fields[2].startswith('  '):
+            continue
+        imports.append((int(fields[1]), fields[2].strip()))
+    return sorted(imports, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', action='append', choices=sorted(TARGETS), help='Limit to these targets.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports shown.')
+    parser.add_argument('--budget-ms', type=float, default=None, help='Fail when a target starts slower than this.')
+    parser.add_argument('--config', default=os.getenv('FLASK_ENV', 'production'))
+    parser.add_argument('--output', default=None, help='Write results as JSON to this file.')
+    args = parser.parse_args()
+
+    env = dict(os.environ, FLASK_ENV=args.config)
+    failed = False
+    results = {}
+    for name in args.target or TARGETS:
+        runs = [run_target(TARGETS[name], env) for _ in range(args.runs)]
+        wall_ms = statistics.median(run[0] for run in runs) * 1000
+        _, lines, heavy = runs[-1]
+        slowest = top_level_imports(lines, args.top)
+        results[name] = {'wall_ms': round(wall_ms, 1), 'heavy_modules': heavy, 'slowest_imports': slowest}
+
+        over_budget = args.budget_ms is not None and wall_ms > args.budget_ms
+        failed = failed or over_budget or bool(heavy)
+        print(f"{name:14} {wall_ms:8.1f} ms{'  OVER BUDGET' if over_budget else ''}")
+        if heavy:
+            print(f"  heavy modules imported at startup: {', '.join(heavy)}")
+        for cumulative_us, module in slowest:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
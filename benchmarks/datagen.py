@@ -0,0 +1,232 @@
+"""
+Generate a synthetic dataset for the API benchmarks.
+
+Creates users, social pages with years of daily metrics, engagement, reach
+and scores, posts, comments and the recommendation catalogs, at a
+configurable scale. The daily stats table is filled by its triggers, the
+same as in production. Needs a Postgres database with the migrations
+applied (`flask db upgrade`); the partitioned tables rule out SQLite.
+
+    FLASK_ENV=development python benchmarks/datagen.py --users 50 --days 730
+
+Benchmark users log in as bench-user-<n>@example.com / benchmark.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text  # noqa: E402
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.recommendations import CalendarPost, ContentIdea, OptimizationTip, Trend  # noqa: E402
+from app.models.social_media import (  # noqa: E402
+    SocialPage, SocialPageEngagement, SocialPageMetric, SocialPagePost, SocialPagePostComment,
+    SocialPageReach, SocialPageScore
+)
+from app.models.user import User  # noqa: E402
+from app.services.partition_service import PARTITIONED_TABLES, add_months, create_partition, month_start  # noqa: E402
+
+PLATFORMS = ('instagram', 'facebook', 'tiktok')
+CONTENT_TYPES = ('image', 'video', 'carousel', 'text')
+PASSWORD = 'benchmark'
+EMAIL = 'bench-user-{index}@example.com'
+CHUNK = 5000
+
+
+def bulk_insert(model, rows):
+    """Insert dict rows in chunks; returns the number inserted."""
+    for start in range(0, len(rows), CHUNK):
+        db.session.execute(insert(model), rows[start:start + CHUNK])
+    return len(rows)
+
+
+def ensure_history_partitions(first_day):
+    """Create monthly partitions back to `first_day` so history does not pile up in the defaults."""
+    month = month_start(first_day)
+    current = month_start(date.today())
+    while month <= current:
+        for table in PARTITIONED_TABLES:
+            create_partition(table, month)
+        month = add_months(month, 1)
+    db.session.commit()
+
+
+def generate_users(rng, count):
+    password_hash = generate_password_hash(PASSWORD)
+    existing = {
+        row[0] for row in db.session.execute(
+            text("SELECT email FROM \"user\" WHERE email LIKE 'bench-user-%'")
+        )
+    }
+    rows = [{
+        'username': f"bench_user_{index}",
+        'email': EMAIL.format(index=index),
+        'password_hash': password_hash,
+        'is_active': True,
+    } for index in range(count) if EMAIL.format(index=index) not in existing]
+    bulk_insert(User, rows)
+    db.session.commit()
+    return [
+        row[0] for row in db.session.execute(
+            text("SELECT id FROM \"user\" WHERE email LIKE 'bench-user-%' ORDER BY id")
+        )
+    ][:count]
+
+
+def generate_pages(rng, user_ids, pages_per_user):
+    rows = []
+    for user_id in user_ids:
+        for platform in rng.sample(PLATFORMS, min(pages_per_user, len(PLATFORMS))):
+            rows.append({
+                'user_id': user_id,
+                'username': f"bench_{user_id}_{platform}_{rng.randrange(10 ** 9)}",
+                'platform': platform,
+                'followers_count': rng.randint(100, 500000),
+                'following_count': rng.randint(10, 2000),
+                'posts_count': rng.randint(10, 3000),
+            })
+    return [row[0] for row in db.session.execute(insert(SocialPage).returning(SocialPage.id), rows)]
+
+
+def generate_daily(rng, page_ids, first_day, days):
+    """Metric, engagement, reach and score rows for every page and day."""
+    totals = {'metrics': 0, 'engagement': 0, 'reach': 0, 'scores': 0}
+    for page_id in page_ids:
+        followers = rng.randint(100, 50000)
+        metrics, engagements, reaches, scores = [], [], [], []
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            followers = max(0, followers + rng.randint(-20, 80))
+            engagement = round(rng.uniform(0.5, 8.0), 2)
+            impressions = rng.randint(followers // 2 + 1, followers * 3 + 10)
+            metrics.append({
+                'social_page_id': page_id, 'date': day, 'followers': followers, 'engagement': engagement,
+                'posts': rng.randint(0, 3), 'likes': rng.randint(0, 5000), 'comments': rng.randint(0, 500),
+                'shares': rng.randint(0, 200), 'views': rng.randint(0, 20000),
+            })
+            engagements.append({
+                'social_page_id': page_id, 'date': day, 'engagement_rate': engagement,
+                'growth_rate': round(rng.uniform(-1, 3), 2), 'impressions': impressions,
+                'reach': impressions // 2,
+            })
+            reaches.append({
+                'social_page_id': page_id, 'date': day, 'timestamp': datetime.combine(day, datetime.min.time()),
+                'impressions': impressions, 'reach': impressions // 2, 'profile_views': rng.randint(0, 1000),
+            })
+            scores.append({
+                'social_page_id': page_id, 'date': day, 'overall_score': round(rng.uniform(20, 95), 1),
+                'engagement_score': round(rng.uniform(20, 95), 1), 'reach_score': round(rng.uniform(20, 95), 1),
+                'growth_score': round(rng.uniform(20, 95), 1),
+            })
+        totals['metrics'] += bulk_insert(SocialPageMetric, metrics)
+        totals['engagement'] += bulk_insert(SocialPageEngagement, engagements)
+        totals['reach'] += bulk_insert(SocialPageReach, reaches)
+        totals['scores'] += bulk_insert(SocialPageScore, scores)
+        db.session.commit()
+    return totals
+
+
+def generate_posts(rng, page_ids, first_day, days, posts_per_page, comments_per_post):
+    totals = {'posts': 0, 'comments': 0}
+    for page_id in page_ids:
+        platform = db.session.get(SocialPage, page_id).platform
+        posts = [{
+            'social_page_id': page_id,
+            'platform': platform,
+            'post_id': f"bench-{page_id}-{index}-{rng.randrange(10 ** 9)}",
+            'content': f"Benchmark post {index} of page {page_id}",
+            'posted_at': datetime.combine(first_day, datetime.min.time()) + timedelta(
+                minutes=rng.randrange(days * 24 * 60)
+            ),
+            'content_type': rng.choice(CONTENT_TYPES),
+            'likes_count': rng.randint(0, 5000),
+            'comments_count': comments_per_post,
+            'shares_count': rng.randint(0, 300),
+            'views_count': rng.randint(0, 50000),
+            'engagement_rate': round(rng.uniform(0.5, 8.0), 2),
+        } for index in range(posts_per_page)]
+        inserted = db.session.execute(
+            insert(SocialPagePost).returning(SocialPagePost.id, SocialPagePost.posted_at), posts
+        ).all()
+        comments = [{
+            'post_id': post_id,
+            'platform': platform,
+            'comment_id': f"bench-{post_id}-{index}",
+            'author_username': f"fan_{rng.randrange(100000)}",
+            'content': 'Great post!' if index % 3 else 'Not a fan of this one.',
+            'posted_at': posted_at + timedelta(minutes=rng.randrange(1, 7 * 24 * 60)),
+            'likes_count': rng.randint(0, 100),
+            'sentiment': 'positive' if index % 3 else 'negative',
+            'is_critical': index % 50 == 0,
+        } for post_id, posted_at in inserted for index in range(comments_per_post)]
+        totals['posts'] += len(inserted)
+        totals['comments'] += bulk_insert(SocialPagePostComment, comments)
+        db.session.commit()
+    return totals
+
+
+def generate_catalogs(rng, user_ids, ideas, trends, tips, calendar_per_user):
+    bulk_insert(ContentIdea, [{
+        'title': f"Content idea {index}", 'description': 'Behind the scenes of the product. ' * 4,
+        'platforms': ','.join(rng.sample(PLATFORMS, 2)), 'content_type': rng.choice(CONTENT_TYPES),
+        'tags': 'engajamento,dicas', 'estimated_engagement': rng.choice(('low', 'medium', 'high')),
+    } for index in range(ideas)])
+    bulk_insert(Trend, [{
+        'title': f"Trend {index}", 'description': 'A trending topic.', 'popularity': rng.randint(1, 100),
+        'platforms': ','.join(rng.sample(PLATFORMS, 2)), 'hashtags': '#bench,#trend', 'related_topics': 'a,b',
+    } for index in range(trends)])
+    bulk_insert(OptimizationTip, [{
+        'platform': rng.choice(PLATFORMS), 'title': f"Tip {index}", 'description': 'Post consistently.',
+        'impact': rng.choice(('low', 'medium', 'high')), 'best_practices': 'one;two;three',
+    } for index in range(tips)])
+    bulk_insert(CalendarPost, [{
+        'user_id': user_id, 'platform': rng.choice(PLATFORMS), 'content_title': f"Scheduled {index}",
+        'content_type': rng.choice(CONTENT_TYPES), 'date': date.today() + timedelta(days=index),
+    } for user_id in user_ids for index in range(calendar_per_user)])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default=os.getenv('FLASK_ENV', 'development'))
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--pages-per-user', type=int, default=3)
+    parser.add_argument('--days', type=int, default=730, help='Days of daily history per page.')
+    parser.add_argument('--posts-per-page', type=int, default=200)
+    parser.add_argument('--comments-per-post', type=int, default=10)
+    parser.add_argument('--ideas', type=int, default=500)
+    parser.add_argument('--trends', type=int, default=200)
+    parser.add_argument('--tips', type=int, default=100)
+    parser.add_argument('--calendar-per-user', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    first_day = date.today() - timedelta(days=args.days)
+    app = create_app(args.config)
+    started = time.perf_counter()
+
+    with app.app_context():
+        ensure_history_partitions(first_day)
+        user_ids = generate_users(rng, args.users)
+        page_ids = generate_pages(rng, user_ids, args.pages_per_user)
+        db.session.commit()
+        daily = generate_daily(rng, page_ids, first_day, args.days)
+        posts = generate_posts(rng, page_ids, first_day, args.days, args.posts_per_page, args.comments_per_post)
+        generate_catalogs(rng, user_ids, args.ideas, args.trends, args.tips, args.calendar_per_user)
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+    print(f"{len(user_ids)} users, {len(page_ids)} pages, {daily['metrics']} daily rows per table, "
+          f"{posts['posts']} posts, {posts['comments']} comments in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
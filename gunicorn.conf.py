@@ -0,0 +1,75 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c gunicorn.conf.py run:app
+
+With preload_app the application is imported once in the master and
+forked into the workers, which share its memory copy-on-write. Every
+worker then drops the DB pool, Redis and platform HTTP connections it
+inherited (see `reset_connections`), so no socket is shared across
+processes.
+
+Worker classes:
+    sync     one request at a time per worker
+    gthread  GUNICORN_THREADS requests per worker (default)
+    gevent   cooperative, for I/O-bound load; needs gevent and psycogreen
+             installed and is not preloaded, since gevent must patch the
+             standard library before the app is imported
+
+Each worker holds its own DB pool (DB_POOL_SIZE + DB_MAX_OVERFLOW), plus
+an async pool for async views (DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW),
+so size workers * pools against the database's max_connections.
+"""
+import multiprocessing
+import os
+import shutil
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4)) if worker_class == 'gthread' else 1
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))  # gevent only
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', 5000)}")
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false' if worker_class == 'gevent' else 'true').lower() == 'true'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+# Heartbeat files on tmpfs, so a slow disk never makes workers look dead
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    # Samples left over from a previous run would be aggregated into /metrics
+    multiproc_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            server.log.warning('psycogreen is not installed; database calls will block the gevent loop')
+
+    if preload_app:
+        from app.extensions import reset_connections
+        reset_connections(server.app.wsgi())
+        server.log.info(f"Worker {worker.pid}: reset inherited DB, Redis and HTTP connections")
+
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -38,10 +38,10 @@ from app.extensions import db
 
 # Import models explicitamente para garantir que todas as tabelas estejam no MetaData
 def import_all_models():
-    from common.user import User, Role, organization_users
-    from common.organization import Organization,Plan,PlanFeature
-    from common.recommendations import CalendarPost,OptimizationTip,Trend,ContentIdea,SavedContentIdea
-    from common.social_media import SocialPage,SocialPageMetric,SocialPageEngagement,SocialPageGrowth,SocialPageReach,SocialPageScore,SocialPagePost,SocialPagePostComment,SocialPageCategory,social_page_categories
+    from app.models.user import User, Role, organization_users
+    from app.models.organization import Organization,Plan,PlanFeature,OrganizationDailyStats,OrganizationStatsState
+    from app.models.recommendations import CalendarPost,OptimizationTip,Trend,ContentIdea,SavedContentIdea
+    from app.models.social_media import SocialPage,SocialPageMetric,SocialPageEngagement,SocialPageGrowth,SocialPageReach,SocialPageScore,SocialPagePost,SocialPagePostComment,SocialPageCategory,social_page_categories,SocialPageDailyStats,SocialPageSyncState
 import_all_models()
 
 target_metadata = db.metadata
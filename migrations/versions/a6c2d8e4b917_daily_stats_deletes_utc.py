@@ -0,0 +1,135 @@
+"""Daily stats triggers follow deletes and key changes, in UTC
+
+Revision ID: a6c2d8e4b917
+Revises: f3a7c1d9e264
+Create Date: 2026-10-19 19:12:40.305871
+
+The social_page_daily_stats triggers only upserted the NEW row: a deleted
+source row, or one whose social_page_id or date changed (including an
+UPDATE moving a row to another partition, which Postgres runs as DELETE
+plus INSERT), left its old values behind. The triggers now also fire on
+DELETE and clear the source's columns at the OLD key, dropping the daily
+row once no source contributes to it.
+
+updated_at was stamped with now(), the server's local time, while the
+column and every reader are naive UTC. Triggers and the backfill now use
+timezone('utc', now()). The table is rebuilt from the sources, which also
+drops rows left by earlier deletes, and the organization rollups are
+marked for a full rebuild since their refresh watermark was local time.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c2d8e4b917'
+down_revision = 'f3a7c1d9e264'
+branch_labels = None
+depends_on = None
+
+# source table -> {daily stats column: source column}, as in e8b4f1a6c302
+SOURCES = {
+    'social_page_metric': {
+        'followers': 'followers', 'engagement': 'engagement', 'posts': 'posts', 'likes': 'likes',
+        'comments': 'comments', 'shares': 'shares', 'views': 'views',
+    },
+    'social_page_engagement': {
+        'engagement_rate': 'engagement_rate', 'growth_rate': 'growth_rate',
+    },
+    'social_page_reach': {
+        'impressions': 'impressions', 'reach': 'reach', 'profile_views': 'profile_views',
+    },
+    'social_page_score': {
+        'overall_score': 'overall_score', 'engagement_score': 'engagement_score',
+        'reach_score': 'reach_score', 'growth_score': 'growth_score',
+    },
+}
+STATS_COLUMNS = [column for columns in SOURCES.values() for column in columns]
+
+
+def _upsert_sql(columns, values):
+    targets = ', '.join(columns)
+    updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in columns)
+    return (
+        f'INSERT INTO social_page_daily_stats (social_page_id, date, {targets}, updated_at) {values} '
+        f'ON CONFLICT (social_page_id, date) DO UPDATE SET {updates}, updated_at = EXCLUDED.updated_at'
+    )
+
+
+def _clear_old_sql(columns):
+    cleared = ', '.join(f'{column} = NULL' for column in columns)
+    empty = ' AND '.join(f'{column} IS NULL' for column in STATS_COLUMNS)
+    return (
+        f"UPDATE social_page_daily_stats SET {cleared}, updated_at = timezone('utc', now()) "
+        f"WHERE social_page_id = OLD.social_page_id AND date = OLD.date; "
+        f"DELETE FROM social_page_daily_stats "
+        f"WHERE social_page_id = OLD.social_page_id AND date = OLD.date AND {empty}"
+    )
+
+
+def upgrade():
+    for table, columns in SOURCES.items():
+        targets = list(columns)
+        new_values = ', '.join(f'NEW.{columns[column]}' for column in targets)
+        # NEW is only read outside DELETE: PL/pgSQL does not short-circuit conditions
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_sync_daily_stats() RETURNS trigger AS $$
+            DECLARE
+                key_changed boolean := TG_OP = 'DELETE';
+            BEGIN
+                IF TG_OP = 'UPDATE' THEN
+                    key_changed := OLD.social_page_id IS DISTINCT FROM NEW.social_page_id
+                        OR OLD.date IS DISTINCT FROM NEW.date;
+                END IF;
+                IF key_changed AND OLD.social_page_id IS NOT NULL THEN
+                    {_clear_old_sql(targets)};
+                END IF;
+                IF TG_OP = 'DELETE' THEN
+                    RETURN NULL;
+                END IF;
+                IF NEW.social_page_id IS NULL THEN
+                    RETURN NULL;
+                END IF;
+                {_upsert_sql(targets, f"VALUES (NEW.social_page_id, NEW.date, {new_values}, timezone('utc', now()))")};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f'DROP TRIGGER {table}_sync_daily_stats ON {table}')
+        op.execute(
+            f'CREATE TRIGGER {table}_sync_daily_stats AFTER INSERT OR UPDATE OR DELETE ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION {table}_sync_daily_stats()'
+        )
+
+    op.execute('TRUNCATE social_page_daily_stats')
+    for table, columns in SOURCES.items():
+        targets = list(columns)
+        selected = ', '.join(columns[column] for column in targets)
+        op.execute(_upsert_sql(
+            targets,
+            f"SELECT social_page_id, date, {selected}, timezone('utc', now()) FROM {table} "
+            f"WHERE social_page_id IS NOT NULL"
+        ))
+    op.execute('UPDATE organization_stats_state SET stats_through = NULL')
+    op.execute('ANALYZE social_page_daily_stats')
+
+
+def downgrade():
+    for table, columns in SOURCES.items():
+        targets = list(columns)
+        new_values = ', '.join(f'NEW.{columns[column]}' for column in targets)
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_sync_daily_stats() RETURNS trigger AS $$
+            BEGIN
+                IF NEW.social_page_id IS NULL THEN
+                    RETURN NULL;
+                END IF;
+                {_upsert_sql(targets, f'VALUES (NEW.social_page_id, NEW.date, {new_values}, now())')};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f'DROP TRIGGER {table}_sync_daily_stats ON {table}')
+        op.execute(
+            f'CREATE TRIGGER {table}_sync_daily_stats AFTER INSERT OR UPDATE ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION {table}_sync_daily_stats()'
+        )
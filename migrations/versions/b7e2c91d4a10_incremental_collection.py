@@ -0,0 +1,47 @@
+"""Incremental collection high-water marks
+
+Revision ID: b7e2c91d4a10
+Revises: 4030f6de6f41
+Create Date: 2026-10-19 09:12:41.503118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c91d4a10'
+down_revision = '4030f6de6f41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('social_page_sync_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('social_page_id', sa.Integer(), nullable=False),
+    sa.Column('last_posted_at', sa.DateTime(), nullable=True),
+    sa.Column('last_comment_at', sa.DateTime(), nullable=True),
+    sa.Column('last_metrics_date', sa.Date(), nullable=True),
+    sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['social_page_id'], ['social_page.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('social_page_id')
+    )
+    with op.batch_alter_table('social_page_post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=40), nullable=True))
+
+    with op.batch_alter_table('social_page_post_comment', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=40), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('social_page_post_comment', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
+
+    with op.batch_alter_table('social_page_post', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
+
+    op.drop_table('social_page_sync_state')
@@ -0,0 +1,140 @@
+"""Range-partition metric, reach, engagement and comment tables by month
+
+Revision ID: c3f8a2e6d915
+Revises: b7e2c91d4a10
+Create Date: 2026-10-19 11:02:17.284930
+
+Each table is rebuilt as a partitioned parent with one partition per month
+holding existing rows, the next few months ahead and a DEFAULT partition.
+Later months are created, and old ones archived, by `flask partitions
+maintain`. Primary keys and unique constraints gain the partition key, as
+Postgres requires.
+
+Downgrading folds the attached partitions back into plain tables; partitions
+already detached into the archive schema are left where they are.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a2e6d915'
+down_revision = 'b7e2c91d4a10'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+# table -> (partition key, foreign keys, unique constraint before, unique constraint after, indexes)
+TABLES = {
+    'social_page_metric': (
+        'date',
+        [('social_page_id', 'social_page')],
+        ('uix_social_page_metric_page_date', 'social_page_id, date'),
+        ('uix_social_page_metric_page_date', 'social_page_id, date'),
+        [('idx_social_page_metrics_date', 'social_page_id, date'),
+         ('ix_social_page_metric_date', 'date'),
+         ('ix_social_page_metric_social_page_id', 'social_page_id')],
+    ),
+    'social_page_engagement': (
+        'date',
+        [('social_page_id', 'social_page')],
+        ('uix_social_page_engagement_page_date', 'social_page_id, date'),
+        ('uix_social_page_engagement_page_date', 'social_page_id, date'),
+        [('ix_social_page_engagement_date', 'date'),
+         ('ix_social_page_engagement_social_page_id', 'social_page_id')],
+    ),
+    'social_page_reach': (
+        'date',
+        [('social_page_id', 'social_page')],
+        ('uix_social_page_reach_page_date', 'social_page_id, date'),
+        ('uix_social_page_reach_page_date', 'social_page_id, date'),
+        [('ix_social_page_reach_date', 'date'),
+         ('ix_social_page_reach_social_page_id', 'social_page_id')],
+    ),
+    'social_page_post_comment': (
+        'posted_at',
+        [('post_id', 'social_page_post')],
+        None,
+        ('uix_social_page_post_comment_comment_posted', 'comment_id, posted_at'),
+        [('ix_social_page_post_comment_author_username', 'author_username'),
+         ('ix_social_page_post_comment_comment_id', 'comment_id'),
+         ('ix_social_page_post_comment_is_critical', 'is_critical'),
+         ('ix_social_page_post_comment_platform', 'platform'),
+         ('ix_social_page_post_comment_post_id', 'post_id'),
+         ('ix_social_page_post_comment_posted_at', 'posted_at'),
+         ('ix_social_page_post_comment_replied_to_id', 'replied_to_id'),
+         ('ix_social_page_post_comment_sentiment', 'sentiment')],
+    ),
+}
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rebuild(table, partition_by=None):
+    """Copy `table` into a fresh table with the same columns, optionally partitioned."""
+    old = f'{table}_old'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)'
+        + (f' PARTITION BY RANGE ({partition_by})' if partition_by else '')
+    )
+    if partition_by:
+        _create_partitions(table, old, partition_by)
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {old} CASCADE')
+
+
+def _create_partitions(table, source, column):
+    first = op.get_bind().execute(sa.text(f'SELECT min({column}) FROM {source}')).scalar()
+    today = date.today()
+    current = date(today.year, today.month, 1)
+    month = min(date(first.year, first.month, 1), current) if first else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+        )
+        month = upper
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+
+def _add_constraints(table, primary_key, foreign_keys, unique, indexes):
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})')
+    if unique:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {unique[0]} UNIQUE ({unique[1]})')
+    for column, target in foreign_keys:
+        op.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey '
+            f'FOREIGN KEY ({column}) REFERENCES {target} (id) ON DELETE CASCADE'
+        )
+    for name, columns in indexes:
+        op.execute(f'CREATE INDEX {name} ON {table} ({columns})')
+
+
+def upgrade():
+    # Every comment needs a partition key value
+    op.execute('UPDATE social_page_post_comment SET posted_at = COALESCE(created_at, now()) WHERE posted_at IS NULL')
+
+    for table, (column, foreign_keys, _, unique, indexes) in TABLES.items():
+        _rebuild(table, partition_by=column)
+        _add_constraints(table, f'id, {column}', foreign_keys, unique, indexes)
+        op.execute(f'ANALYZE {table}')
+
+
+def downgrade():
+    for table, (column, foreign_keys, unique, _, indexes) in TABLES.items():
+        _rebuild(table)
+        _add_constraints(table, 'id', foreign_keys, unique, indexes)
+
+    op.execute('ALTER TABLE social_page_post_comment ALTER COLUMN posted_at DROP NOT NULL')
+    op.execute('DROP INDEX ix_social_page_post_comment_comment_id')
+    op.execute('CREATE UNIQUE INDEX ix_social_page_post_comment_comment_id ON social_page_post_comment (comment_id)')
@@ -0,0 +1,83 @@
+"""Composite, covering and partial indexes matching query shapes
+
+Revision ID: d5a91c3e7f28
+Revises: c3f8a2e6d915
+Create Date: 2026-10-19 13:40:05.917362
+
+Single-column indexes that are the leading column of a unique constraint
+or of a composite index are dropped: they answer no query the wider index
+cannot, and every write pays for them. Indexes on plain tables are built
+and dropped CONCURRENTLY so the migration does not block writes;
+partitioned parents do not support that and are changed in place.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a91c3e7f28'
+down_revision = 'c3f8a2e6d915'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns) made redundant by a wider index
+REDUNDANT = [
+    ('ix_social_token_user_id', 'social_token', ['user_id']),
+    ('idx_social_token_user_platform', 'social_token', ['user_id', 'platform']),
+    ('ix_social_page_user_id', 'social_page', ['user_id']),
+    ('ix_social_page_username', 'social_page', ['username']),
+    ('ix_social_page_score_social_page_id', 'social_page_score', ['social_page_id']),
+    ('ix_social_page_growth_social_page_id', 'social_page_growth', ['social_page_id']),
+    ('ix_social_page_growth_is_goal', 'social_page_growth', ['is_goal']),
+    ('ix_social_page_post_social_page_id', 'social_page_post', ['social_page_id']),
+    ('idx_social_page_post_page_date', 'social_page_post', ['social_page_id', 'posted_at']),
+    ('ix_saved_content_idea_user_id', 'saved_content_idea', ['user_id']),
+    ('ix_calendar_post_user_id', 'calendar_post', ['user_id']),
+]
+REDUNDANT_PARTITIONED = [
+    ('idx_social_page_metrics_date', 'social_page_metric', ['social_page_id', 'date']),
+    ('ix_social_page_metric_social_page_id', 'social_page_metric', ['social_page_id']),
+    ('ix_social_page_engagement_social_page_id', 'social_page_engagement', ['social_page_id']),
+    ('ix_social_page_reach_social_page_id', 'social_page_reach', ['social_page_id']),
+    ('ix_social_page_post_comment_is_critical', 'social_page_post_comment', ['is_critical']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_social_page_post_page_date_covering', 'social_page_post',
+            ['social_page_id', sa.text('posted_at DESC')],
+            postgresql_include=['likes_count', 'comments_count', 'shares_count', 'views_count', 'engagement_rate'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_social_page_growth_user_goals', 'social_page_growth', ['user_id'],
+            postgresql_where=sa.text('is_goal'), postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_calendar_post_user_date', 'calendar_post', ['user_id', 'date'],
+            postgresql_concurrently=True
+        )
+        for name, table, _ in REDUNDANT:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.create_index(
+        'idx_social_page_post_comment_critical', 'social_page_post_comment',
+        ['post_id', sa.text('posted_at DESC')], postgresql_where=sa.text('is_critical')
+    )
+    for name, table, _ in REDUNDANT_PARTITIONED:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    for name, table, columns in REDUNDANT_PARTITIONED:
+        op.create_index(name, table, columns)
+    op.drop_index('idx_social_page_post_comment_critical', table_name='social_page_post_comment')
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        op.drop_index('idx_calendar_post_user_date', table_name='calendar_post', postgresql_concurrently=True)
+        op.drop_index('idx_social_page_growth_user_goals', table_name='social_page_growth', postgresql_concurrently=True)
+        op.drop_index('idx_social_page_post_page_date_covering', table_name='social_page_post', postgresql_concurrently=True)
@@ -0,0 +1,133 @@
+"""Consolidated daily stats table maintained by triggers
+
+Revision ID: e8b4f1a6c302
+Revises: d5a91c3e7f28
+Create Date: 2026-10-19 15:26:48.120554
+
+social_page_daily_stats holds one row per (social_page_id, date) with the
+dashboard columns of social_page_metric, social_page_engagement,
+social_page_reach and social_page_score. An AFTER INSERT OR UPDATE trigger
+on each source table upserts its own columns, so the set-based collector
+writes keep the table current as well as ORM writes.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b4f1a6c302'
+down_revision = 'd5a91c3e7f28'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+# source table -> {daily stats column: source column}
+SOURCES = {
+    'social_page_metric': {
+        'followers': 'followers', 'engagement': 'engagement', 'posts': 'posts', 'likes': 'likes',
+        'comments': 'comments', 'shares': 'shares', 'views': 'views',
+    },
+    'social_page_engagement': {
+        'engagement_rate': 'engagement_rate', 'growth_rate': 'growth_rate',
+    },
+    'social_page_reach': {
+        'impressions': 'impressions', 'reach': 'reach', 'profile_views': 'profile_views',
+    },
+    'social_page_score': {
+        'overall_score': 'overall_score', 'engagement_score': 'engagement_score',
+        'reach_score': 'reach_score', 'growth_score': 'growth_score',
+    },
+}
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _upsert_sql(columns, values):
+    targets = ', '.join(columns)
+    updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in columns)
+    return (
+        f'INSERT INTO social_page_daily_stats (social_page_id, date, {targets}, updated_at) {values} '
+        f'ON CONFLICT (social_page_id, date) DO UPDATE SET {updates}, updated_at = EXCLUDED.updated_at'
+    )
+
+
+def upgrade():
+    op.create_table('social_page_daily_stats',
+    sa.Column('social_page_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('followers', sa.Integer(), nullable=True),
+    sa.Column('engagement', sa.Float(), nullable=True),
+    sa.Column('posts', sa.Integer(), nullable=True),
+    sa.Column('likes', sa.Integer(), nullable=True),
+    sa.Column('comments', sa.Integer(), nullable=True),
+    sa.Column('shares', sa.Integer(), nullable=True),
+    sa.Column('views', sa.Integer(), nullable=True),
+    sa.Column('engagement_rate', sa.Float(), nullable=True),
+    sa.Column('growth_rate', sa.Float(), nullable=True),
+    sa.Column('impressions', sa.Integer(), nullable=True),
+    sa.Column('reach', sa.Integer(), nullable=True),
+    sa.Column('profile_views', sa.Integer(), nullable=True),
+    sa.Column('overall_score', sa.Float(), nullable=True),
+    sa.Column('engagement_score', sa.Float(), nullable=True),
+    sa.Column('reach_score', sa.Float(), nullable=True),
+    sa.Column('growth_score', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['social_page_id'], ['social_page.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('social_page_id', 'date'),
+    postgresql_partition_by='RANGE (date)'
+    )
+
+    first = op.get_bind().execute(sa.text(
+        'SELECT min(date) FROM (' + ' UNION ALL '.join(f'SELECT min(date) AS date FROM {table}' for table in SOURCES) + ') AS firsts'
+    )).scalar()
+    today = date.today()
+    current = date(today.year, today.month, 1)
+    month = min(date(first.year, first.month, 1), current) if first else current
+    while month <= _add_months(current, MONTHS_AHEAD):
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE social_page_daily_stats_p{month:%Y%m} PARTITION OF social_page_daily_stats "
+            f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+        )
+        month = upper
+    op.execute('CREATE TABLE social_page_daily_stats_default PARTITION OF social_page_daily_stats DEFAULT')
+
+    for table, columns in SOURCES.items():
+        targets = list(columns)
+        selected = ', '.join(columns[column] for column in targets)
+        op.execute(_upsert_sql(
+            targets,
+            f'SELECT social_page_id, date, {selected}, now() FROM {table} WHERE social_page_id IS NOT NULL'
+        ))
+
+        new_values = ', '.join(f'NEW.{columns[column]}' for column in targets)
+        op.execute(f"""
+            CREATE FUNCTION {table}_sync_daily_stats() RETURNS trigger AS $$
+            BEGIN
+                IF NEW.social_page_id IS NULL THEN
+                    RETURN NULL;
+                END IF;
+                {_upsert_sql(targets, f'VALUES (NEW.social_page_id, NEW.date, {new_values}, now())')};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(
+            f'CREATE TRIGGER {table}_sync_daily_stats AFTER INSERT OR UPDATE ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION {table}_sync_daily_stats()'
+        )
+
+    op.execute('ANALYZE social_page_daily_stats')
+
+
+def downgrade():
+    for table in SOURCES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_sync_daily_stats ON {table}')
+        op.execute(f'DROP FUNCTION IF EXISTS {table}_sync_daily_stats()')
+    op.execute('DROP TABLE social_page_daily_stats CASCADE')
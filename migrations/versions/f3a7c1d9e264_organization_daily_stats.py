@@ -0,0 +1,60 @@
+"""Materialized organization rollup of the daily stats
+
+Revision ID: f3a7c1d9e264
+Revises: e8b4f1a6c302
+Create Date: 2026-10-19 17:02:31.448190
+
+organization_daily_stats holds one row per (organization_id, date, platform)
+aggregated over the social_page_daily_stats rows of every page owned by the
+organization's members. It is filled and refreshed by
+app.services.organization_stats_service; organization_stats_state records
+what each rollup was built from.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7c1d9e264'
+down_revision = 'e8b4f1a6c302'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('organization_daily_stats',
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('platform', sa.String(length=20), nullable=False),
+    sa.Column('pages', sa.Integer(), nullable=False),
+    sa.Column('followers', sa.BigInteger(), nullable=True),
+    sa.Column('engagement', sa.Float(), nullable=True),
+    sa.Column('posts', sa.BigInteger(), nullable=True),
+    sa.Column('likes', sa.BigInteger(), nullable=True),
+    sa.Column('comments', sa.BigInteger(), nullable=True),
+    sa.Column('shares', sa.BigInteger(), nullable=True),
+    sa.Column('views', sa.BigInteger(), nullable=True),
+    sa.Column('impressions', sa.BigInteger(), nullable=True),
+    sa.Column('reach', sa.BigInteger(), nullable=True),
+    sa.Column('engagement_rate', sa.Float(), nullable=True),
+    sa.Column('overall_score', sa.Float(), nullable=True),
+    sa.Column('engagement_score', sa.Float(), nullable=True),
+    sa.Column('reach_score', sa.Float(), nullable=True),
+    sa.Column('growth_score', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organization.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id', 'date', 'platform')
+    )
+    op.create_table('organization_stats_state',
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('member_pages', sa.String(length=32), nullable=True),
+    sa.Column('page_count', sa.Integer(), nullable=True),
+    sa.Column('stats_through', sa.DateTime(), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organization.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id')
+    )
+
+
+def downgrade():
+    op.drop_table('organization_stats_state')
+    op.drop_table('organization_daily_stats')
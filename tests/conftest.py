@@ -0,0 +1,28 @@
+"""Fixtures shared by the test modules."""
+from contextlib import contextmanager
+
+import pytest
+
+from app.utils.query_audit import capture_queries
+
+
+@pytest.fixture
+def assert_queries():
+    """
+    Capture the statements a block executes and check their count and shapes.
+
+        with assert_queries(engine, count=1, shapes=['SELECT ? FROM page WHERE id IN (?)']):
+            ...
+
+    Shapes are compared in first-execution order; the audit is yielded for
+    finer checks. Nothing is asserted when the block raises.
+    """
+    @contextmanager
+    def check(*engines, count=None, shapes=None):
+        with capture_queries(list(engines)) as audit:
+            yield audit
+        if count is not None:
+            assert audit.count == count, audit.report()
+        if shapes is not None:
+            assert list(audit.shapes) == shapes, audit.report()
+    return check
@@ -0,0 +1,64 @@
+"""conditional() validators, with table versions read from a stub Redis."""
+import pytest
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required
+from redis import RedisError
+
+from app.utils.conditional import conditional, table_version
+
+
+class StubRedis:
+    def __init__(self):
+        self.values = {}
+        self.down = False
+
+    def get(self, key):
+        if self.down:
+            raise RedisError('Connection refused')
+        return self.values.get(key)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(JWT_SECRET_KEY='test-secret-key-of-at-least-32-bytes')
+    JWTManager(app)
+    app.redis = StubRedis()
+    app.view_calls = 0
+
+    @app.route('/ideas')
+    @jwt_required()
+    @conditional(lambda user_id: (table_version('content_idea'), user_id))
+    def ideas():
+        app.view_calls += 1
+        return jsonify([])
+
+    return app
+
+
+@pytest.fixture
+def headers(app):
+    with app.app_context():
+        return {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+
+
+def test_unchanged_version_is_not_modified(app, headers):
+    client = app.test_client()
+    etag = client.get('/ideas', headers=headers).headers['ETag']
+
+    response = client.get('/ideas', headers={**headers, 'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert app.view_calls == 1
+
+
+def test_redis_outage_serves_without_validators(app, headers):
+    client = app.test_client()
+    etag = client.get('/ideas', headers=headers).headers['ETag']
+    app.redis.down = True
+
+    response = client.get('/ideas', headers={**headers, 'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+    assert app.view_calls == 2
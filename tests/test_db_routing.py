@@ -0,0 +1,141 @@
+"""
+RoutingSession against two SQLite stand-ins for the primary and replica.
+
+Both databases hold the same table with different rows, so the rows a
+view returns show which database served the read.
+"""
+import pytest
+from flask import Blueprint, Flask, jsonify
+from sqlalchemy import select
+
+from app.extensions import db
+from app.utils import db_routing
+from app.utils.db_routing import REPLICA_BIND, route_reads_to_replica, use_replica
+
+
+class RoutedItem(db.Model):
+    __tablename__ = 'routing_test_item'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)
+
+
+def _names():
+    return db.session.execute(select(RoutedItem.name).order_by(RoutedItem.id)).scalars().all()
+
+
+def _create_app(primary_url, replica_url):
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=primary_url,
+        SQLALCHEMY_BINDS={REPLICA_BIND: replica_url},
+        DB_REPLICA_HEALTHCHECK_INTERVAL=30,
+    )
+    db.init_app(app)
+
+    routed = Blueprint('routed', __name__)
+    route_reads_to_replica(routed)
+
+    @routed.route('/items', methods=['GET'])
+    def list_items():
+        return jsonify(_names())
+
+    @routed.route('/items', methods=['POST'])
+    def create_item():
+        db.session.add(RoutedItem(name='created'))
+        db.session.commit()
+        return jsonify(_names()), 201
+
+    @routed.route('/items/touch', methods=['GET'])
+    def touch_items():
+        db.session.add(RoutedItem(name='touched'))
+        db.session.commit()
+        return jsonify(_names())
+
+    @routed.route('/items/rename', methods=['GET'])
+    def rename_items():
+        db.session.execute(db.update(RoutedItem).values(name='renamed'))
+        db.session.commit()
+        return jsonify(_names())
+
+    plain = Blueprint('plain', __name__)
+
+    @plain.route('/plain/items')
+    def plain_items():
+        return jsonify(_names())
+
+    @plain.route('/plain/replica-items')
+    @use_replica
+    def replica_items():
+        return jsonify(_names())
+
+    app.register_blueprint(routed)
+    app.register_blueprint(plain)
+    return app
+
+
+@pytest.fixture(autouse=True)
+def fresh_health(monkeypatch):
+    monkeypatch.setattr(db_routing, '_health', {'ok': True, 'checked_at': None})
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = _create_app(f"sqlite:///{tmp_path / 'primary.db'}", f"sqlite:///{tmp_path / 'replica.db'}")
+    with app.app_context():
+        for bind, name in ((None, 'primary'), (REPLICA_BIND, 'replica')):
+            engine = db.engines[bind]
+            RoutedItem.__table__.create(engine)
+            with engine.begin() as connection:
+                connection.execute(RoutedItem.__table__.insert().values(name=name))
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def _rows(app, bind):
+    with app.app_context():
+        with db.engines[bind].connect() as connection:
+            return connection.execute(select(RoutedItem.name).order_by(RoutedItem.id)).scalars().all()
+
+
+def test_get_reads_from_replica(app):
+    assert app.test_client().get('/items').get_json() == ['replica']
+
+
+def test_use_replica_decorator_reads_from_replica(app):
+    assert app.test_client().get('/plain/replica-items').get_json() == ['replica']
+
+
+def test_views_not_opted_in_read_from_primary(app):
+    assert app.test_client().get('/plain/items').get_json() == ['primary']
+
+
+def test_writes_and_reads_after_them_go_to_primary(app):
+    response = app.test_client().post('/items')
+
+    assert response.status_code == 201
+    assert response.get_json() == ['primary', 'created']
+    assert _rows(app, None) == ['primary', 'created']
+    assert _rows(app, REPLICA_BIND) == ['replica']
+
+
+def test_read_after_write_in_routed_get_stays_on_primary(app):
+    assert app.test_client().get('/items/touch').get_json() == ['primary', 'touched']
+    assert _rows(app, REPLICA_BIND) == ['replica']
+
+
+def test_bulk_statements_go_to_primary(app):
+    assert app.test_client().get('/items/rename').get_json() == ['renamed']
+    assert _rows(app, REPLICA_BIND) == ['replica']
+
+
+def test_unreachable_replica_falls_back_to_primary(tmp_path):
+    app = _create_app(f"sqlite:///{tmp_path / 'primary.db'}", f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    with app.app_context():
+        RoutedItem.__table__.create(db.engine)
+        with db.engine.begin() as connection:
+            connection.execute(RoutedItem.__table__.insert().values(name='primary'))
+
+    assert app.test_client().get('/items').get_json() == ['primary']
@@ -0,0 +1,63 @@
+"""N+1 detection against an in-memory SQLite engine."""
+import threading
+
+import pytest
+from flask import Flask
+from sqlalchemy import Engine, create_engine, event, text
+
+from app.utils import nplusone
+from app.utils.nplusone import NPlusOneError, detect_nplusone, init_nplusone
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    yield engine
+    engine.dispose()
+    if event.contains(Engine, 'before_cursor_execute', nplusone._count_shape):
+        event.remove(Engine, 'before_cursor_execute', nplusone._count_shape)
+
+
+def _select(engine, times):
+    with engine.connect() as connection:
+        for value in range(times):
+            connection.execute(text('SELECT :value'), {'value': value})
+
+
+def test_listener_is_not_installed_when_disabled(engine):
+    init_nplusone(Flask(__name__))
+
+    assert not event.contains(Engine, 'before_cursor_execute', nplusone._count_shape)
+
+
+def test_listener_is_installed_when_enabled(engine):
+    app = Flask(__name__)
+    app.config.update(NPLUSONE_DETECT=True, NPLUSONE_THRESHOLD=5, NPLUSONE_RAISE=True)
+    init_nplusone(app)
+
+    assert event.contains(Engine, 'before_cursor_execute', nplusone._count_shape)
+
+
+def test_repeated_shapes_raise(engine):
+    with pytest.raises(NPlusOneError):
+        with detect_nplusone(threshold=2):
+            _select(engine, 3)
+
+
+def test_blocks_in_other_threads_are_not_counted(engine):
+    started, finished = threading.Event(), threading.Event()
+
+    def other_thread():
+        started.wait()
+        _select(engine, 10)
+        finished.set()
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    with detect_nplusone(threshold=2) as counter:
+        started.set()
+        finished.wait()
+        _select(engine, 1)
+    thread.join()
+
+    assert sum(counter.values()) == 1
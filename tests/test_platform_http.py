@@ -0,0 +1,146 @@
+"""
+PlatformHTTPClient against a local stub server.
+
+The stub answers each request with the next queued status for its path
+and records every request and the client port it arrived on, so retries
+and connection reuse are observable without reaching the platforms.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from flask import Flask
+from urllib3.util import connection
+
+from app.services import rate_budget
+from app.services.platform_http import PlatformHTTPClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.requests.append((self.command, self.path, self.client_address[1]))
+        statuses = self.server.statuses.get(self.path) or [200]
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.requests = []
+    server.statuses = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub):
+    client = PlatformHTTPClient(
+        'tiktok', base_url=f"http://127.0.0.1:{stub.server_port}",
+        timeout=(1, 2), retries=2, backoff_factor=0, max_concurrency=2
+    )
+    yield client
+    client.close()
+
+
+class RecordingBudget:
+    def __init__(self):
+        self.acquired = 0
+        self.statuses = []
+
+    def acquire(self, platform, user_key=None, cost=1, max_wait=30):
+        self.acquired += 1
+
+    def record_response(self, platform, status, headers):
+        self.statuses.append(status)
+
+
+def test_get_is_retried_on_server_errors(stub, client):
+    stub.statuses['/v2/user/info/'] = [503, 502, 200]
+
+    response = client.get('/v2/user/info/')
+
+    assert response.status_code == 200
+    assert [path for _, path, _ in stub.requests] == ['/v2/user/info/'] * 3
+
+
+def test_get_returns_last_response_when_retries_run_out(stub, client):
+    stub.statuses['/v2/user/info/'] = [503]
+
+    response = client.get('/v2/user/info/')
+
+    assert response.status_code == 503
+    assert len(stub.requests) == 3
+
+
+def test_post_is_not_retried(stub, client):
+    stub.statuses['/v2/oauth/token/'] = [503, 200]
+
+    response = client.post('/v2/oauth/token/', data={'grant_type': 'refresh_token'})
+
+    assert response.status_code == 503
+    assert stub.requests == [('POST', '/v2/oauth/token/', stub.requests[0][2])]
+
+
+def test_budget_is_charged_per_attempt(stub, client, monkeypatch):
+    budget = RecordingBudget()
+    monkeypatch.setattr(rate_budget, 'get_rate_budget', lambda app=None: budget)
+    stub.statuses['/v2/video/list/'] = [429, 200]
+
+    with Flask(__name__).app_context():
+        response = client.get('/v2/video/list/', user_key='1')
+
+    assert response.status_code == 200
+    assert budget.acquired == 2
+    assert budget.statuses == [429, 200]
+
+
+def test_connections_are_kept_alive(stub, client):
+    for _ in range(3):
+        client.get('/v2/user/info/')
+
+    ports = {port for _, _, port in stub.requests}
+    assert len(stub.requests) == 3
+    assert len(ports) == 1
+
+
+def test_dead_host_is_connected_once_per_attempt(monkeypatch):
+    budget = RecordingBudget()
+    monkeypatch.setattr(rate_budget, 'get_rate_budget', lambda app=None: budget)
+    # Bind then close a socket so its port refuses connections
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    port = server.server_port
+    server.server_close()
+    connects = []
+    create_connection = connection.create_connection
+    monkeypatch.setattr(connection, 'create_connection', lambda *a, **kw: connects.append(a) or create_connection(*a, **kw))
+    client = PlatformHTTPClient(
+        'tiktok', base_url=f"http://127.0.0.1:{port}", timeout=(1, 2), retries=2, backoff_factor=0
+    )
+
+    with Flask(__name__).app_context(), pytest.raises(requests.ConnectionError):
+        client.post('/v2/oauth/token/', data={'grant_type': 'refresh_token'})
+
+    assert len(connects) == 3
+    assert budget.acquired == 3
+    client.close()
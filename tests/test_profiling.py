@@ -0,0 +1,67 @@
+"""Sampling profiler on sync and async views, saving to .folded files."""
+import asyncio
+import time
+
+import pytest
+from flask import Flask
+
+from app.utils import profiling
+from app.utils.async_clients import init_async_views
+from app.utils.profiling import init_profiling
+
+
+def busy_work(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, '_settings_cache', {'expires': 0.0, 'value': None})
+    app = Flask(__name__)
+    app.config.update(
+        PROFILE_ENABLED=True, PROFILE_SLOW_MS=0, PROFILE_INTERVAL_MS=1, PROFILE_OUTPUT=str(tmp_path)
+    )
+    init_async_views(app)
+    init_profiling(app)
+
+    @app.route('/sync')
+    def sync_view():
+        busy_work(0.1)
+        return 'ok'
+
+    @app.route('/async')
+    async def async_view():
+        busy_work(0.1)
+        return 'ok'
+
+    async def child_work():
+        busy_work(0.1)
+
+    @app.route('/async/gather')
+    async def gathering_view():
+        await asyncio.gather(child_work(), asyncio.sleep(0))
+        return 'ok'
+
+    return app
+
+
+def _folded(tmp_path, endpoint):
+    return (tmp_path / f"{endpoint}.folded").read_text()
+
+
+def test_sync_view_is_sampled(app, tmp_path):
+    assert app.test_client().get('/sync').status_code == 200
+    assert 'busy_work' in _folded(tmp_path, 'sync_view')
+
+
+def test_async_view_is_sampled_on_the_event_loop(app, tmp_path):
+    assert app.test_client().get('/async').status_code == 200
+    assert 'async_view' in _folded(tmp_path, 'async_view')
+    assert 'busy_work' in _folded(tmp_path, 'async_view')
+
+
+def test_tasks_spawned_by_an_async_view_are_sampled(app, tmp_path):
+    assert app.test_client().get('/async/gather').status_code == 200
+    assert 'child_work' in _folded(tmp_path, 'gathering_view')
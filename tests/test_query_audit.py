@@ -0,0 +1,58 @@
+"""Query shapes and the assert_queries fixture against an in-memory SQLite engine."""
+import pytest
+from sqlalchemy import bindparam, create_engine, text
+
+from app.utils.query_audit import query_shape
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    with engine.begin() as connection:
+        connection.execute(text('CREATE TABLE page (id INTEGER PRIMARY KEY, username TEXT)'))
+        connection.execute(text("INSERT INTO page VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize('statement, shape', [
+    ('SELECT page.id FROM page WHERE page.id = %(id_1)s', 'SELECT page.id FROM page WHERE page.id = ?'),
+    ('SELECT id FROM page WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)', 'SELECT id FROM page WHERE id IN (?)'),
+    ('SELECT id FROM page WHERE id IN (?, ?)', 'SELECT id FROM page WHERE id IN (?)'),
+    ("SELECT id FROM page WHERE username = 'o''brien' LIMIT 50", 'SELECT id FROM page WHERE username = ? LIMIT ?'),
+    ('SELECT id\n    FROM page\n    WHERE score > 1.5', 'SELECT id FROM page WHERE score > ?'),
+])
+def test_query_shape(statement, shape):
+    assert query_shape(statement) == shape
+
+
+def test_statements_differing_in_values_share_a_shape(engine, assert_queries):
+    select_in = text('SELECT username FROM page WHERE id IN :ids').bindparams(bindparam('ids', expanding=True))
+
+    with assert_queries(engine, count=3, shapes=['SELECT username FROM page WHERE id IN (?)']) as audit:
+        with engine.connect() as connection:
+            for ids in ([1], [1, 2], [1, 2, 3]):
+                connection.execute(select_in, {'ids': ids})
+
+    assert audit.report()[0]['count'] == 3
+
+
+def test_per_row_queries_are_counted(engine, assert_queries):
+    with assert_queries(engine) as audit:
+        with engine.connect() as connection:
+            for page_id in connection.execute(text('SELECT id FROM page')).scalars().all():
+                connection.execute(text('SELECT username FROM page WHERE id = :id'), {'id': page_id})
+
+    assert audit.count == 4
+    assert [(entry['shape'], entry['count']) for entry in audit.report()] == [
+        ('SELECT username FROM page WHERE id = ?', 3),
+        ('SELECT id FROM page', 1),
+    ]
+
+
+def test_mismatched_count_fails(engine, assert_queries):
+    with pytest.raises(AssertionError):
+        with assert_queries(engine, count=1):
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+                connection.execute(text('SELECT 2'))